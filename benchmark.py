@@ -0,0 +1,296 @@
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import random
+import sqlite3
+import sys
+import time
+import tracemalloc
+from typing import Callable, Optional
+
+# The results can be written to stdout, where the pygame greeting would end up in the JSON
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+import pygame
+
+from src.main.config import Config
+from src.main.language_manager import LanguageManager
+from src.main.settings import Settings
+from src.models.calendar_model import CalendarModel, CalendarEvent, EventRecurrence
+from src.models.connection_manager import ConnectionManager
+from src.models.dataset_generator import DatasetGenerator, DatasetSpec
+from src.models.mirror_manager import MirrorManager
+from src.models.month_cache import MonthCache
+from src.utils.assets import Assets
+
+
+def setup(data_path: str) -> None:
+    # Benchmark databases and settings are kept apart from the ones the app uses
+    Assets.DATA_PATH = os.path.join(data_path, "data")
+    Assets.SETTINGS_PATH = os.path.join(data_path, "settings")
+    for path in (Assets.SETTINGS_PATH, os.path.join(Assets.DATA_PATH, "calendars"),
+                 os.path.join(Assets.DATA_PATH, "todo_lists")):
+        os.makedirs(path, exist_ok=True)
+
+    pygame.init()
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+
+    Settings(Assets().settings_database_path)
+    LanguageManager()
+
+
+def get_percentile(samples: list[float], percentile: float) -> float:
+    samples = sorted(samples)
+    return samples[min(int(percentile * len(samples)), len(samples) - 1)]
+
+
+class Benchmark:
+
+    def __init__(self, model: CalendarModel, spec: DatasetSpec, repeat: int, time_budget: float) -> None:
+        self.model = model
+        self.spec = spec
+        self.repeat = repeat
+        self.time_budget = time_budget
+
+        self.rng = random.Random(spec.seed)
+        self.center = DatasetGenerator(spec).center
+        self.written: list[CalendarEvent] = []
+
+    def get_cases(self) -> dict[str, tuple[Optional[Callable[[], None]], Callable[[], object]]]:
+        # Every case is a setup that isn't timed and the call that is
+        return {
+            "get_events_for_month": (self.clear_cache, lambda: self.model.get_events_for_month(*self.random_month())),
+            "get_events_for_month_cached": (None, lambda: self.model.get_events_for_month(
+                self.center.year, self.center.month
+            )),
+            "get_events_for_date": (self.clear_cache, lambda: self.model.get_events_for_date(self.random_date())),
+            "search_events": (None, lambda: self.model.search_events(self.random_query())),
+            "get_upcoming_events": (None, lambda: self.model.get_upcoming_events(
+                datetime.datetime.combine(self.random_date(), datetime.time(12))
+            )),
+            "add_events": (self.discard_written, self.add_events),
+            "update_events": (self.ensure_written, self.update_events),
+            "remove_events": (self.ensure_written, self.remove_events)
+        }
+
+    def clear_cache(self) -> None:
+        MonthCache().invalidate_database(self.model.database_name)
+
+    def random_date(self) -> datetime.date:
+        return datetime.date.fromordinal(
+            self.center.toordinal() + self.rng.randint(-self.spec.days, self.spec.days)
+        )
+
+    def random_month(self) -> tuple[int, int]:
+        date = self.random_date()
+        return date.year, date.month
+
+    def random_query(self) -> str:
+        words = self.rng.sample(DatasetGenerator.WORDS, self.rng.randint(1, 2))
+        return " ".join(word[:self.rng.randint(3, len(word))] for word in words)
+
+    def create_batch(self) -> list[CalendarEvent]:
+        spec = DatasetSpec(
+            events=Config.import_batch_size, seed=self.rng.randrange(1 << 30), recurrence_mix=self.spec.recurrence_mix,
+            description_length=self.spec.description_length, days=self.spec.days, center=self.center
+        )
+        return list(DatasetGenerator(spec).iter_events())
+
+    def add_events(self) -> None:
+        events = self.create_batch()
+        for event, id_ in zip(events, self.model.add_events(events)):
+            event.id = id_
+        self.written = events
+
+    def ensure_written(self) -> None:
+        if not self.written:
+            self.add_events()
+
+    def discard_written(self) -> None:
+        # Written batches are removed again, so the database keeps the size it was generated with
+        self.model.remove_events(self.written)
+        self.written = []
+
+    def update_events(self) -> None:
+        updated = [
+            CalendarEvent(
+                event.id, event.date + datetime.timedelta(days=1), event.time, event.description, event.color,
+                event.recurrence, duration=event.duration
+            ) for event in self.written
+        ]
+        self.model.update_events(list(zip(self.written, updated)))
+        self.written = updated
+
+    def remove_events(self) -> None:
+        self.model.remove_events(self.written)
+        self.written = []
+
+    def measure(self, setup: Optional[Callable[[], None]], call: Callable[[], object]) -> list[float]:
+        samples = []
+        started = time.perf_counter()
+        while len(samples) < self.repeat:
+            if setup is not None:
+                setup()
+
+            start = time.perf_counter()
+            call()
+            samples.append(time.perf_counter() - start)
+
+            # Slow cases stop early, but always get enough samples for a median
+            if len(samples) >= 5 and time.perf_counter() - started > self.time_budget:
+                break
+
+        return samples
+
+    def measure_memory(self, setup: Optional[Callable[[], None]], call: Callable[[], object]) -> int:
+        # Tracing slows every allocation down, so memory gets its own untimed pass
+        gc.collect()
+        tracemalloc.start()
+        try:
+            peak = 0
+            for _ in range(3):
+                if setup is not None:
+                    setup()
+                baseline = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                call()
+                peak = max(peak, tracemalloc.get_traced_memory()[1] - baseline)
+        finally:
+            tracemalloc.stop()
+
+        return peak
+
+    def run(self, cases: list[str] = None) -> dict[str, dict]:
+        results = {}
+        for name, (setup, call) in self.get_cases().items():
+            if cases and name not in cases:
+                continue
+
+            # The first call pays for the page cache and the holidays of the year
+            if setup is not None:
+                setup()
+            call()
+
+            samples = self.measure(setup, call)
+            memory = self.measure_memory(setup, call)
+            results[name] = {
+                "samples": len(samples),
+                "p50_ms": get_percentile(samples, 0.5) * 1000,
+                "p95_ms": get_percentile(samples, 0.95) * 1000,
+                "p99_ms": get_percentile(samples, 0.99) * 1000,
+                "mean_ms": sum(samples) / len(samples) * 1000,
+                "max_ms": max(samples) * 1000,
+                "peak_memory_kb": memory / 1024
+            }
+
+        self.discard_written()
+
+        return results
+
+
+def compare(results: dict, previous: dict) -> dict[str, dict[str, float]]:
+    # Ratios above 1 mean the current run is slower or uses more memory
+    ratios = {}
+    for size, cases in results["datasets"].items():
+        for name, result in cases["cases"].items():
+            old = previous.get("datasets", {}).get(size, {}).get("cases", {}).get(name)
+            if old is None:
+                continue
+
+            ratios[f"{size}/{name}"] = {
+                key: round(result[key] / old[key], 3) for key in ("p50_ms", "p95_ms", "p99_ms", "peak_memory_kb")
+                if old.get(key)
+            }
+
+    return ratios
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate calendars and benchmark the calendar model.")
+    parser.add_argument("--events", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="dataset sizes, from 1000 up to 1000000 events")
+    parser.add_argument("--weekly", type=float, default=0.02, help="share of weekly events")
+    parser.add_argument("--monthly", type=float, default=0.01, help="share of monthly events")
+    parser.add_argument("--yearly", type=float, default=0.01, help="share of yearly events")
+    parser.add_argument("--description-length", type=int, nargs=2, default=[8, 60], metavar=("MIN", "MAX"))
+    parser.add_argument("--days", type=int, default=3 * 365, help="days before and after today events spread over")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=200, help="samples per case")
+    parser.add_argument("--time-budget", type=float, default=10, help="seconds after which a case stops sampling")
+    parser.add_argument("--cases", nargs="+", help="only run these cases")
+    parser.add_argument("--data", default=os.path.join("benchmark", "data"), help="where the databases are kept")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON file of an earlier run to compare with")
+    args = parser.parse_args()
+
+    setup(args.data)
+
+    results = {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "config": {
+            "calendar_memory_mirror": Config.calendar_memory_mirror,
+            "month_cache_size": Config.month_cache_size,
+            "import_batch_size": Config.import_batch_size
+        },
+        "datasets": {}
+    }
+
+    for size in args.events:
+        spec = DatasetSpec(
+            events=size, seed=args.seed, description_length=tuple(args.description_length), days=args.days,
+            recurrence_mix={
+                EventRecurrence.WEEKLY: args.weekly,
+                EventRecurrence.MONTHLY: args.monthly,
+                EventRecurrence.YEARLY: args.yearly
+            }
+        )
+
+        # Databases are generated once per spec and reused by later runs
+        database_name = (
+            f"benchmark_{size}_{args.seed}_{args.weekly}_{args.monthly}_{args.yearly}_"
+            f"{args.description_length[0]}_{args.description_length[1]}_{args.days}"
+        )
+        database_path = os.path.join(Assets().calendar_database_path, database_name + ".db")
+
+        generate_time = None
+        if not os.path.exists(database_path):
+            print(f"Generating {size} events...", file=sys.stderr)
+            start = time.perf_counter()
+            model = DatasetGenerator(spec).generate(database_name)
+            generate_time = time.perf_counter() - start
+        else:
+            model = CalendarModel(database_name=database_name)
+
+        print(f"Benchmarking {size} events...", file=sys.stderr)
+        cases = Benchmark(model, spec, args.repeat, args.time_budget).run(args.cases)
+
+        results["datasets"][str(size)] = {
+            "database": database_name,
+            "generate_s": generate_time,
+            "database_kb": os.path.getsize(database_path) / 1024,
+            "cases": cases
+        }
+
+        MirrorManager().close_all()
+        ConnectionManager().close_all()
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            results["comparison"] = compare(results, json.load(file))
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
+import datetime
 import time
-from typing import Callable
+from typing import Callable, Optional
 
 from src.events.event import CloseViewEvent, AddCalendarEventEvent, EditCalendarEventEvent
 from src.events.event_loop import EventLoop
+from src.models.calendar_model import CalendarModel
 from src.ui.colors import Colors, Color
 from src.utils.assets import Assets
 from src.utils.ui_utils import adjust_dropdown_font_size
@@ -11,9 +13,12 @@ from src.views.add_event_view import AddEventView
 
 class AddEventController:
 
-    def __init__(self, view: AddEventView, event_loop: EventLoop) -> None:
+    def __init__(self, view: AddEventView, event_loop: EventLoop, model: Optional[CalendarModel] = None,
+                 date: Optional[datetime.date] = None) -> None:
         self.view = view
         self.event_loop = event_loop
+        self.model = model
+        self.date = date
 
         self.view.close_button.bind_on_click(self.on_close)
         self.view.bind_on_add_button_click(self.add_event)
@@ -22,6 +27,11 @@ class AddEventController:
         self.view.dropdown.bind_on_release(lambda: adjust_dropdown_font_size(self.view.dropdown))
         self.view.dropdown.bind_on_select(self.on_dropdown_select)
 
+        for text_field in (self.view.hours_input, self.view.minutes_input, self.view.end_hours_input,
+                           self.view.end_minutes_input):
+            text_field.bind_on_key(self.check_overlaps)
+        self.check_overlaps()
+
     def on_color_button_click(self, color: Color) -> Callable:
         def apply_color() -> None:
             for btn in self.view.color_buttons:
@@ -43,6 +53,7 @@ class AddEventController:
 
         try:
             event_time = self.view.get_time()
+            duration = self.view.get_duration()
         except ValueError:
             self.view.show_error(self.view.invalid_time_error)
             return
@@ -51,17 +62,33 @@ class AddEventController:
             self.event_loop.enqueue_event(
                 EditCalendarEventEvent(
                     time.time(), self.view.event_to_edit, event_time, self.view.description_text_field.text,
-                    color, self.view.get_event_recurring()
+                    color, self.view.get_event_recurring(), duration
                 )
             )
         else:
             self.event_loop.enqueue_event(
                 AddCalendarEventEvent(
                     time.time(), event_time, self.view.description_text_field.text, color,
-                    self.view.get_event_recurring()
+                    self.view.get_event_recurring(), duration
                 )
             )
 
+    def check_overlaps(self) -> None:
+        if self.model is None or self.date is None:
+            return
+
+        try:
+            start = datetime.datetime.combine(self.date, self.view.get_time())
+            end = start + self.view.get_duration()
+        except ValueError:
+            self.view.show_warning("")
+            return
+
+        # The event being edited doesn't overlap itself
+        exclude_id = self.view.event_to_edit.id if self.view.editing_state else None
+        overlapping = self.model.get_overlapping_events(start, end, exclude_id)
+        self.view.show_warning(self.view.overlap_warning if overlapping else "")
+
     def on_dropdown_select(self) -> None:
         self.view.dropdown.label.font = Assets().font20
         adjust_dropdown_font_size(self.view.dropdown)
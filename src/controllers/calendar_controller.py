@@ -29,7 +29,8 @@ class CalendarController:
 
     def on_month_button_click(self) -> None:
         view = ChooseMonthView(
-            self.view.display, self.event_loop, self.view.month, *Config.choose_month_view_size,
+            self.view.display, self.model, self.event_loop, self.view.year, self.view.month,
+            *Config.choose_month_view_size,
             self.view.x + self.view.width // 2 - Config.choose_month_view_size[0] // 2,
             self.view.y + self.view.month_button.y + Config.appbar_height
         )
@@ -129,7 +129,7 @@ class EventListController:
             self.view.display.get_height() // 2 - Config.top_view_size[1] // 2 + Config.appbar_height // 2
         )
         self.add_event_view.set_edit_state(event)
-        AddEventController(self.add_event_view, self.event_loop)
+        AddEventController(self.add_event_view, self.event_loop, self.model, event.date)
 
         self.event_loop.enqueue_event(
             OpenViewEvent(time.time(), self.add_event_view, True)
@@ -141,14 +141,14 @@ class EventListController:
             self.view.display.get_width() // 2 - Config.top_view_size[0] // 2,
             self.view.display.get_height() // 2 - Config.top_view_size[1] // 2 + Config.appbar_height // 2
         )
-        AddEventController(self.add_event_view, self.event_loop)
+        AddEventController(self.add_event_view, self.event_loop, self.model, self.view.date)
 
         self.event_loop.enqueue_event(
             OpenViewEvent(time.time(), self.add_event_view, True)
         )
 
     def add_event(self, ev: AddCalendarEventEvent) -> None:
-        event = CalendarEvent(0, self.view.date, ev.time, ev.description, ev.color, ev.recurrence)
+        event = CalendarEvent(0, self.view.date, ev.time, ev.description, ev.color, ev.recurrence, duration=ev.duration)
         self.model.add_event(event)
         self.view.create_time_table()
         self.bind_view_methods()
@@ -158,7 +158,7 @@ class EventListController:
     def edit_event(self, event: EditCalendarEventEvent) -> None:
         self.model.update_event(
             event.event, d=event.event.date, t=event.time,
-            description=event.description, color=event.color, recurrence=event.recurrence
+            description=event.description, color=event.color, recurrence=event.recurrence, duration=event.duration
         )
         self.event_loop.enqueue_event(CloseViewEvent(time.time(), self.add_event_view))
         self.event_loop.enqueue_event(UpdateCalendarEvent(time.time()))
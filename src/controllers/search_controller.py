@@ -8,6 +8,7 @@ from src.events.event import MouseMotionEvent, MouseClickEvent, MouseReleaseEven
     MouseWheelUpEvent, MouseWheelDownEvent
 from src.events.event_loop import EventLoop
 from src.main.config import Config
+from src.main.search_manager import SearchManager
 from src.models.calendar_model import CalendarModel, CalendarEvent
 from src.views.event_list_view import EventListView
 from src.views.search_view import SearchView
@@ -23,10 +24,13 @@ class SearchController:
         self.pressed = False
         self.last_frame_interacted = False
 
+        self.search_manager = SearchManager(self.model.database_name, self.event_loop)
+
         self.view.bind_on_click(self.on_click)
         self.view.bind_on_release(self.on_release)
         self.view.bind_on_mouse_motion(self.on_mouse_motion)
         self.view.bind_on_scroll(self.on_scroll)
+        self.view.bind_on_delete(self.search_manager.stop)
 
         self.view.search_bar.bind_on_key(self.on_search_bar_typed)
         self.view.bind_on_search_event_release(self.on_search_event_release)
@@ -91,12 +95,11 @@ class SearchController:
     def on_search_bar_typed(self) -> None:
         query = self.view.search_bar.text
 
-        search_results = []
-        if query:
-            search_results = self.model.search_events(query)
+        self.search_manager.search(query)
 
-        self.view.create_search_events(search_results)
-        self.view.bind_search_event_methods()
+        if not query:
+            self.view.create_search_events([])
+            self.view.bind_search_event_methods()
 
     def on_search_event_release(self, event: CalendarEvent) -> None:
         view = EventListView(
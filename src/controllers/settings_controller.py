@@ -1,15 +1,19 @@
+import os
 import time
-from typing import Union
+from typing import Optional, Union
 
 import pygame
 
 from src.events.event import MouseMotionEvent, MouseClickEvent, MouseReleaseEvent, ResizeViewEvent, OpenViewEvent, \
-    MouseWheelUpEvent, MouseWheelDownEvent, UpdateCalendarEvent, LanguageChangedEvent
+    MouseWheelUpEvent, MouseWheelDownEvent, UpdateCalendarEvent, LanguageChangedEvent, SettingsChangedEvent
 from src.events.event_loop import EventLoop
 from src.main.account_manager import AccountManager
 from src.main.calendar_sync_manager import CalendarSyncManager
 from src.main.config import Config
+from src.main.export_manager import ExportManager
+from src.main.import_manager import ImportManager
 from src.main.settings import Settings
+from src.utils.file_dialogs import ask_open_path, ask_save_path
 from src.views.settings_view import SettingsView
 
 
@@ -22,6 +26,10 @@ class SettingsController:
         self.pressed = False
         self.last_frame_interacted = False
 
+        # The running transfers are kept so the cancel button can reach them
+        self.import_manager: Optional[ImportManager] = None
+        self.export_manager: Optional[ExportManager] = None
+
         self.view.bind_on_click(self.on_click)
         self.view.bind_on_release(self.on_release)
         self.view.bind_on_mouse_motion(self.on_mouse_motion)
@@ -32,8 +40,12 @@ class SettingsController:
         self.view.fill_events_checkbox.bind_on_click(self.on_fill_events_checkbox_clicked)
         self.view.graphics_checkbox.bind_on_click(self.on_graphics_checkbox_clicked)
         self.view.auto_sync_checkbox.bind_on_click(self.on_autosync_checkbox_clicked)
+        self.view.all_calendars_checkbox.bind_on_click(self.on_all_calendars_checkbox_clicked)
         self.view.sync_button.bind_on_click(self.on_sync_button_clicked)
         self.view.sign_out_button.bind_on_click(self.on_sign_out_button_clicked)
+        self.view.import_button.bind_on_click(self.on_import_button_clicked)
+        self.view.export_button.bind_on_click(self.on_export_button_clicked)
+        self.view.cancel_button.bind_on_click(self.on_cancel_button_clicked)
 
     def on_click(self, event: MouseClickEvent) -> None:
         if self.view.width - 5 < event.x < self.view.width and 0 < event.y < self.view.height:
@@ -72,7 +84,7 @@ class SettingsController:
 
         scroll_value = Config.scroll_value * event.scroll
         min_y = self.view.general_label.get_rect().top
-        max_y = self.view.sign_out_button.get_rect().bottom
+        max_y = self.view.data_status_label.get_rect().bottom
 
         if (
             (isinstance(event, MouseWheelUpEvent) and min_y < 120) or
@@ -98,16 +110,24 @@ class SettingsController:
 
     def on_catholic_events_checkbox_clicked(self) -> None:
         Settings().update_settings(["show_catholic_events"], self.view.catholic_events_checkbox.checked)
+        self.event_loop.enqueue_event(SettingsChangedEvent(time.time(), "show_catholic_events"))
         self.event_loop.enqueue_event(UpdateCalendarEvent(time.time()))
 
     def on_fill_events_checkbox_clicked(self) -> None:
         Settings().update_settings(["render_filled_events"], self.view.fill_events_checkbox.checked)
+        self.event_loop.enqueue_event(SettingsChangedEvent(time.time(), "render_filled_events"))
 
     def on_graphics_checkbox_clicked(self) -> None:
         Settings().update_settings(["high_quality_graphics"], self.view.graphics_checkbox.checked)
+        self.event_loop.enqueue_event(SettingsChangedEvent(time.time(), "high_quality_graphics"))
 
     def on_autosync_checkbox_clicked(self) -> None:
         Settings().update_settings(["autosync"], self.view.auto_sync_checkbox.checked)
+        self.event_loop.enqueue_event(SettingsChangedEvent(time.time(), "autosync"))
+
+    def on_all_calendars_checkbox_clicked(self) -> None:
+        Settings().update_settings(["show_all_calendars"], self.view.all_calendars_checkbox.checked)
+        self.event_loop.enqueue_event(SettingsChangedEvent(time.time(), "show_all_calendars"))
 
     def on_sync_button_clicked(self) -> None:
         CalendarSyncManager().sync_calendars_threaded(send_event=True)
@@ -117,3 +137,36 @@ class SettingsController:
         for user in users:
             AccountManager().sign_out_user(user)
         AccountManager().users.clear()
+
+    def on_import_button_clicked(self) -> None:
+        path = ask_open_path(
+            self.view.language_manager.get_string("import_calendar"),
+            [(self.view.language_manager.get_string("calendar_files"), "*.ics")]
+        )
+        if path is None:
+            return
+
+        # Progress reaches the view through ImportProgressEvents, the calendar is reloaded when it finishes
+        self.import_manager = ImportManager(AccountManager().get_current_database_name(), self.event_loop)
+        self.import_manager.import_file_threaded(path)
+
+    def on_export_button_clicked(self) -> None:
+        path = ask_save_path(
+            self.view.language_manager.get_string("export_calendar"),
+            [(self.view.language_manager.get_string("calendar_files"), "*.ics"), ("CSV", "*.csv")],
+            ".ics", "calendar.ics"
+        )
+        if path is None:
+            return
+
+        # The exporter picks the format by the extension, names typed without a known one get the default
+        if os.path.splitext(path)[1].lower() not in (".ics", ".csv"):
+            path += ".ics"
+
+        self.export_manager = ExportManager(AccountManager().get_current_database_name(), self.event_loop)
+        self.export_manager.export_file_threaded(path)
+
+    def on_cancel_button_clicked(self) -> None:
+        for manager in (self.import_manager, self.export_manager):
+            if manager is not None and manager.thread is not None and manager.thread.is_alive():
+                manager.cancel()
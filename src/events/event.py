@@ -198,6 +198,7 @@ class AddCalendarEventEvent(Event):
     description: str
     color: Color
     recurrence: EventRecurrence
+    duration: datetime.timedelta
 
 
 @dataclass
@@ -214,6 +215,7 @@ class EditCalendarEventEvent(Event):
     description: str
     color: Color
     recurrence: EventRecurrence
+    duration: datetime.timedelta
 
 
 @dataclass
@@ -246,6 +248,12 @@ class LanguageChangedEvent(Event):
     pass
 
 
+@dataclass
+class SettingsChangedEvent(Event):
+
+    key: str
+
+
 @dataclass
 class TimerEvent(Event):
 
@@ -278,6 +286,48 @@ class CalendarSyncEvent(ThreadedEvent):
         self.registered = registered
 
 
+@dataclass
+class SearchResultsEvent(ThreadedEvent):
+
+    def __init__(self, exec_time: float, query: str, events: list[CalendarEvent], registered: bool = False):
+        super().__init__(registered)
+        self.exec_time = exec_time
+        self.query = query
+        self.events = events
+        self.registered = registered
+
+
+@dataclass
+class ImportProgressEvent(ThreadedEvent):
+
+    def __init__(self, exec_time: float, path: str, imported: int, skipped: int, progress: float,
+                 finished: bool = False, cancelled: bool = False, registered: bool = False):
+        super().__init__(registered)
+        self.exec_time = exec_time
+        self.path = path
+        self.imported = imported
+        self.skipped = skipped
+        self.progress = progress
+        self.finished = finished
+        self.cancelled = cancelled
+        self.registered = registered
+
+
+@dataclass
+class ExportProgressEvent(ThreadedEvent):
+
+    def __init__(self, exec_time: float, path: str, exported: int, total: int, finished: bool = False,
+                 cancelled: bool = False, registered: bool = False):
+        super().__init__(registered)
+        self.exec_time = exec_time
+        self.path = path
+        self.exported = exported
+        self.total = total
+        self.finished = finished
+        self.cancelled = cancelled
+        self.registered = registered
+
+
 class EventFactory:
 
     @staticmethod
@@ -13,6 +13,7 @@ from src.events.event import Event, UserSignInEvent, OpenViewEvent, UserSignOutE
 from src.events.event_loop import EventLoop
 from src.main.settings import Settings
 from src.models.calendar_model import CalendarModel
+from src.models.merged_calendar_model import MergedCalendarModel
 from src.utils.assets import Assets
 from src.utils.authentication import User, GoogleAuthentication
 from src.utils.singleton import Singleton
@@ -29,6 +30,8 @@ class AccountManager(metaclass=Singleton):
         self.current_user: Optional[User] = None
         self.users: list[User] = []
 
+        self.merged_calendar_model: Optional[MergedCalendarModel] = None
+
         self.load_users()
         self.load_current_user()
 
@@ -37,6 +40,7 @@ class AccountManager(metaclass=Singleton):
             self.current_user = event.user
             if event.user not in self.users:
                 self.users.append(event.user)
+                self.update_merged_calendar_model()
 
             Assets().user_profile_pictures[self.current_user.email] = download_image(event.user.uri) or Assets().profile_picture_icon_400x400
 
@@ -104,6 +108,7 @@ class AccountManager(metaclass=Singleton):
             return
 
         self.users.remove(user)
+        self.update_merged_calendar_model()
 
         token_path = os.path.join(Assets().GOOGLE_TOKENS_PATH, f"token_{user.email}.json")
         calendar_path = os.path.join(Assets().calendar_database_path, f"calendar_{user.email}.db")
@@ -112,10 +117,6 @@ class AccountManager(metaclass=Singleton):
         if os.path.exists(token_path):
             os.remove(token_path)
 
-        settings = Settings().get_settings()
-        settings["current_id"].pop(f"calendar_{user.email}")
-        Settings().save_settings(settings)
-
         self.event_loop.enqueue_event(UserSignOutEvent(time.time(), user))
 
         if user.email in Assets().user_profile_pictures:
@@ -134,7 +135,7 @@ class AccountManager(metaclass=Singleton):
     def open_calendar_view(self, database_name: str) -> None:
         model = CalendarModel(database_name=database_name)
         view = CalendarView(self.display, model, self.display.get_width() - 60,
-                            self.display.get_height() - 30, 60, 30)
+                            self.display.get_height() - 30, 60, 30, self.get_merged_calendar_model())
         CalendarController(model, view, self.event_loop)
         self.event_loop.enqueue_event(OpenViewEvent(time.time(), view, False))
 
@@ -147,7 +148,24 @@ class AccountManager(metaclass=Singleton):
     def get_current_profile_picture(self) -> pygame.Surface:
         return self.get_user_profile_picture(self.current_user.email if self.current_user else None)
 
+    def get_merged_calendar_model(self) -> MergedCalendarModel:
+        # One model is shared by all calendar views, it keeps its connection until the accounts change
+        if self.merged_calendar_model is None:
+            self.merged_calendar_model = MergedCalendarModel(self.get_accounts())
+        return self.merged_calendar_model
+
+    def update_merged_calendar_model(self) -> None:
+        if self.merged_calendar_model is not None:
+            self.merged_calendar_model.set_accounts(self.get_accounts())
+
+    def get_accounts(self) -> list[Optional[str]]:
+        return [None] + [user.email for user in self.users]
+
     def get_current_database_name(self) -> str:
         if self.current_user is None:
             return "calendar"
         return f"calendar_{self.current_user.email}"
+
+    def get_database_names(self) -> list[str]:
+        # The calendar used while nobody is signed in is kept next to the ones of the accounts
+        return ["calendar"] + [f"calendar_{user.email}" for user in self.users]
@@ -0,0 +1,70 @@
+import datetime
+import time
+from threading import Thread
+from typing import Optional
+
+from src.events.event import Event, MouseClickEvent, MouseReleaseEvent, MouseWheelUpEvent, MouseWheelDownEvent, \
+    MouseMotionEvent, KeyPressEvent, KeyReleaseEvent
+from src.main.account_manager import AccountManager
+from src.main.config import Config
+from src.models.calendar_model import CalendarModel
+from src.models.connection_manager import ConnectionManager
+from src.utils.logging import Log
+from src.utils.singleton import Singleton
+
+
+class ArchiveManager(metaclass=Singleton):
+
+    INPUT_EVENTS = (
+        MouseClickEvent, MouseReleaseEvent, MouseWheelUpEvent, MouseWheelDownEvent, MouseMotionEvent, KeyPressEvent,
+        KeyReleaseEvent
+    )
+
+    def __init__(self) -> None:
+        self.last_input = time.time()
+        self.last_archived = 0
+
+        self.thread: Optional[Thread] = None
+        self.idle = False
+
+    def register_event(self, event: Event) -> None:
+        if isinstance(event, self.INPUT_EVENTS):
+            self.last_input = time.time()
+            # A running pass stops after its current batch
+            self.idle = False
+            return
+
+        # Repeating events keep this check running while there is no input
+        if time.time() - self.last_input < Config.archive_idle_time:
+            return
+        if time.time() - self.last_archived < Config.archive_interval:
+            return
+        if self.thread is not None and self.thread.is_alive():
+            return
+
+        self.idle = True
+        self.last_archived = time.time()
+        self.thread = Thread(target=self.archive_all_calendars, daemon=True)
+        self.thread.start()
+
+    def archive_all_calendars(self) -> int:
+        before = datetime.date.today() - datetime.timedelta(days=Config.archive_horizon)
+        compact_before = datetime.datetime.now() - datetime.timedelta(days=Config.change_journal_horizon)
+        archived = 0
+
+        try:
+            for database_name in AccountManager().get_database_names():
+                model = CalendarModel(database_name=database_name)
+                while self.idle:
+                    count = model.archive_events(before)
+                    archived += count
+                    if count < Config.archive_batch_size:
+                        break
+
+                if self.idle:
+                    model.compact_changes(compact_before)
+        finally:
+            ConnectionManager().close_thread_connections()
+
+        Log.i(f"Archive Manager: Archived {archived} events")
+        return archived
@@ -15,6 +15,7 @@ from src.main.account_manager import AccountManager
 from src.main.config import Config
 from src.main.settings import Settings
 from src.models.calendar_model import CalendarModel, CalendarEvent, EventRecurrence
+from src.models.connection_manager import ConnectionManager
 from src.ui.colors import Colors, Color
 from src.utils.authentication import GoogleAuthentication
 from src.utils.logging import Log
@@ -40,6 +41,9 @@ class CalendarSyncManager(metaclass=Singleton):
         self.last_synced = 0
         self.sync_time = 6
 
+        # The journal position every database was last synced at
+        self.synced_seqs: dict[str, int] = {}
+
     def register_event(self, event: Event) -> None:
         if isinstance(event, UserSignInEvent):
             if event.user.email not in self.events_to_delete:
@@ -54,7 +58,7 @@ class CalendarSyncManager(metaclass=Singleton):
         elif isinstance(event, EditCalendarEventEvent):
             self.update_event(
                 event.event, d=event.event.date, t=event.time, description=event.description,
-                color=event.color, recurrence=event.recurrence
+                color=event.color, recurrence=event.recurrence, duration=event.duration
             )
         elif isinstance(event, DeleteCalendarEventEvent):
             self.remove_event(event.event)
@@ -109,36 +113,35 @@ class CalendarSyncManager(metaclass=Singleton):
             model = self.model
 
         google_calendar_events = self.get_google_event_list(google_events)
-        local_calendar_events = model.get_upcoming_events(now, threaded=True)
 
-        local_synced = {}
-        local_not_synced = []
-        for event in local_calendar_events:
-            if event.google_id:
-                local_synced[event.google_id] = event
-            else:
-                local_not_synced.append(event)
+        # After the first sync only the events changed since then can still be missing from Google
+        seq = self.synced_seqs.get(model.database_name)
+        changed = model.get_changed_events(seq) if seq is not None else None
+        if changed is None:
+            seq = model.get_change_seq()
+            local_events = model.iter_upcoming(now)
+        else:
+            seq, local_events, _ = changed
+            local_events = [
+                event for event in local_events if event.recurrence is not EventRecurrence.NEVER or event.start > now
+            ]
 
-        google_synced = {}
-        google_not_synced = []
-        for event in google_calendar_events:
-            if event.google_id in local_synced.keys():
-                google_synced[event.google_id] = event
-            else:
-                google_not_synced.append(event)
+        local_not_synced = [event for event in local_events if not event.google_id]
+        linked_events = [(event, self.add_event_to_google(service, event)) for event in local_not_synced]
 
-        for event in local_not_synced:
-            google_id = self.add_event_to_google(service, event)
-            model.update_event(event, google_id=google_id, threaded=True)
+        # Events another sync linked first would otherwise come back as copies on the next sync
+        for google_id in model.claim_google_ids(linked_events):
+            try:
+                service.events().delete(calendarId="primary", eventId=google_id).execute()
+            except HttpError as e:
+                print(e)
 
-        for event in google_not_synced:
-            model.add_event(event, threaded=True)
+        model.upsert_google_events(google_calendar_events)
+        model.remove_missing_google_events(now, [event.google_id for event in google_calendar_events] + [
+            google_id for _, google_id in linked_events
+        ])
 
-        for g_id, event in local_synced.items():
-            if g_id not in google_synced.keys():
-                model.remove_event(event, threaded=True)
-            elif not model.compare_events(event, google_synced[g_id]):
-                model.update_event(event, updated_event=google_synced[g_id], threaded=True)
+        self.synced_seqs[model.database_name] = seq
 
         if send_event:
             self.event_loop.enqueue_threaded_event(CalendarSyncEvent(time.time()))
@@ -166,7 +169,7 @@ class CalendarSyncManager(metaclass=Singleton):
                     "timeZone": Config.time_zone
                 }
                 google_event["end"] = {
-                    "dateTime": event.date.strftime("%Y-%m-%d") + "T" + event.time.strftime("%H:%M") + ":00",
+                    "dateTime": event.end.strftime("%Y-%m-%dT%H:%M:%S"),
                     "timeZone": Config.time_zone
                 }
 
@@ -204,6 +207,12 @@ class CalendarSyncManager(metaclass=Singleton):
                 date = datetime.datetime.fromisoformat(event["start"]["date"])
             else:
                 date = datetime.datetime.fromisoformat(event["start"]["dateTime"].rstrip("Z"))
+
+            duration = datetime.timedelta(seconds=Config.event_duration)
+            if "date" in event.get("end", {}):
+                duration = datetime.datetime.fromisoformat(event["end"]["date"]) - date
+            elif "dateTime" in event.get("end", {}):
+                duration = datetime.datetime.fromisoformat(event["end"]["dateTime"].rstrip("Z")) - date
                 # time_zone = event["start"]["timeZone"]
                 #
                 # if time_zone.upper() != "UTC":
@@ -219,13 +228,19 @@ class CalendarSyncManager(metaclass=Singleton):
                 elif "RRULE:FREQ=WEEKLY;BYDAY" in event["recurrence"][0]:
                     recurrence = EventRecurrence.WEEKLY
 
-            calendar_event = CalendarEvent(0, date.date(), date.time(), description, color, recurrence, google_id=gid)
+            calendar_event = CalendarEvent(
+                0, date.date(), date.time(), description, color, recurrence, google_id=gid,
+                duration=max(duration, datetime.timedelta(0))
+            )
             ret.append(calendar_event)
         return ret
 
     def sync_calendars_threaded(self, email: str = None, send_event: bool = True) -> None:
         def sync(on_complete):
-            CalendarSyncManager().sync_calendars(email, send_event=False)
+            try:
+                CalendarSyncManager().sync_calendars(email, send_event=False)
+            finally:
+                ConnectionManager().close_thread_connections()
             on_complete()
 
         def callback():
@@ -263,7 +278,7 @@ class CalendarSyncManager(metaclass=Singleton):
                 "timeZone": Config.time_zone
             },
             "end": {
-                "dateTime": dt,
+                "dateTime": event.end.strftime("%Y-%m-%dT%H:%M:%S"),
                 "timeZone": Config.time_zone
             }
         }
@@ -284,14 +299,15 @@ class CalendarSyncManager(metaclass=Singleton):
 
     def update_event(self, event: CalendarEvent, updated_event: CalendarEvent = None, d: datetime.date = None,
                      t: datetime.time = None, description: str = None, color: Color = None,
-                     recurrence: EventRecurrence = EventRecurrence.NEVER) -> None:
+                     recurrence: EventRecurrence = EventRecurrence.NEVER, duration: datetime.timedelta = None) -> None:
 
         if not event.google_id:
             return
 
         new_event = updated_event or CalendarEvent(event.id, d or event.date, t or event.time,
                                                    description or event.description, color or event.color,
-                                                   recurrence or event.recurrence, google_id=event.google_id)
+                                                   recurrence or event.recurrence, google_id=event.google_id,
+                                                   duration=event.duration if duration is None else duration)
 
         self.events_to_edit[AccountManager().current_user.email].append(new_event)
 
@@ -18,3 +18,48 @@ class Config:
     switch_account_view_size = (250, 400)
     options_view_size = (120, 70)
     top_view_size = (400, 500)
+
+    month_cache_size = 48
+    connection_pool_size = 8
+    connection_wait_timeout = 30
+    search_result_limit = 100
+    search_debounce = 0.15
+    import_batch_size = 1000
+    export_progress_interval = 1000
+
+    archive_horizon = 365
+    archive_batch_size = 500
+    archive_idle_time = 10
+    archive_interval = 3600
+
+    # Recurring events are expanded into a table for this many days around today, the window grows when needed
+    occurrence_window = 730
+    occurrence_window_step = 365
+
+    event_duration = 3600
+
+    change_journal_horizon = 90
+
+    # Statements slower than the threshold (in seconds) are explained and written to the slow query log
+    query_profiling = False
+    slow_query_threshold = 0.02
+    query_histogram_buckets = (0.1, 0.5, 1, 5, 10, 50, 100, 500)
+    debug_overlay_queries = 8
+
+    # Serves calendar reads from an in memory copy, writes reach the disk immediately ("sync") or from a thread
+    calendar_memory_mirror = False
+    calendar_mirror_flush = "sync"
+    # Writes the disk refused are kept and retried after this many seconds, or with the next write
+    calendar_mirror_retry_interval = 5
+
+    sqlite_profile = "default"
+    sqlite_profiles = {
+        "default": {
+            "journal_mode": "WAL", "synchronous": "NORMAL", "mmap_size": 0, "cache_size": -8192, "temp_store": "MEMORY"
+        },
+        # Commits don't wait for the disk, a power loss can lose the latest transactions
+        "aggressive": {
+            "journal_mode": "WAL", "synchronous": "OFF", "mmap_size": 268435456, "cache_size": -65536,
+            "temp_store": "MEMORY"
+        }
+    }
@@ -0,0 +1,117 @@
+import csv
+import datetime
+import os
+import time
+from threading import Thread
+from typing import Callable, Iterator, Optional, TextIO
+
+from src.events.event import ExportProgressEvent
+from src.events.event_loop import EventLoop
+from src.main.config import Config
+from src.models.calendar_model import CalendarModel, CalendarEvent, EventRecurrence
+from src.models.connection_manager import ConnectionManager
+from src.ui.colors import get_hex_color
+from src.utils.ics_functions import COLOR_PROPERTY, escape_ics_text, fold_ics_line, format_ics_datetime
+from src.utils.logging import Log
+
+
+class ExportManager:
+
+    RULES = {
+        EventRecurrence.WEEKLY: "FREQ=WEEKLY",
+        EventRecurrence.MONTHLY: "FREQ=MONTHLY",
+        EventRecurrence.YEARLY: "FREQ=YEARLY"
+    }
+
+    def __init__(self, database_name: str, event_loop: EventLoop) -> None:
+        self.database_name = database_name
+        self.event_loop = event_loop
+
+        self.thread: Optional[Thread] = None
+        self.cancelled = False
+
+    def export_file_threaded(self, path: str) -> None:
+        self.cancelled = False
+        self.thread = Thread(target=self.export_file, args=(path, ), daemon=True)
+        self.thread.start()
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+    def export_file(self, path: str) -> int:
+        writers: dict[str, Callable[[TextIO, Iterator[CalendarEvent]], Iterator[int]]] = {
+            ".ics": self.write_ics,
+            ".csv": self.write_csv
+        }
+        writer = writers.get(os.path.splitext(path)[1].lower())
+        if writer is None:
+            raise ValueError(f"Unsupported export format: {path}")
+
+        model = CalendarModel(database_name=self.database_name)
+        total = model.get_event_count()
+        exported = 0
+
+        self.event_loop.enqueue_threaded_event(ExportProgressEvent(time.time(), path, exported, total))
+
+        # The file only replaces an existing one once it is complete
+        temp_path = path + ".part"
+        try:
+            with open(temp_path, "w", encoding="utf-8", newline="") as file:
+                for exported in writer(file, model.iter_all_events()):
+                    if self.cancelled:
+                        break
+
+                    if exported % Config.export_progress_interval == 0:
+                        self.event_loop.enqueue_threaded_event(
+                            ExportProgressEvent(time.time(), path, exported, total)
+                        )
+
+            if self.cancelled:
+                os.remove(temp_path)
+            else:
+                os.replace(temp_path, path)
+        except OSError as e:
+            Log.e(f"Export Manager: Couldn't export to {path}: {e}")
+        finally:
+            ConnectionManager().close_thread_connections()
+            self.event_loop.enqueue_threaded_event(
+                ExportProgressEvent(time.time(), path, exported, total, finished=True, cancelled=self.cancelled)
+            )
+
+        return exported
+
+    def write_ics(self, file: TextIO, events: Iterator[CalendarEvent]) -> Iterator[int]:
+        stamp = datetime.datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+
+        file.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//Event Planner//EN\r\n")
+
+        for i, event in enumerate(events, 1):
+            lines = [
+                "BEGIN:VEVENT",
+                f"UID:{event.google_id or f'{self.database_name}-{event.id}'}",
+                f"DTSTAMP:{stamp}",
+                f"DTSTART:{format_ics_datetime(event.date, event.time)}",
+                f"DTEND:{format_ics_datetime(event.end.date(), event.end.time())}",
+                f"SUMMARY:{escape_ics_text(event.description or '')}",
+                f"{COLOR_PROPERTY}:#{get_hex_color(event.color)[2:].upper()}"
+            ]
+            if event.recurrence in self.RULES:
+                lines.append(f"RRULE:{self.RULES[event.recurrence]}")
+            lines.append("END:VEVENT")
+
+            file.write("".join(map(fold_ics_line, lines)))
+            yield i
+
+        file.write("END:VCALENDAR\r\n")
+
+    @staticmethod
+    def write_csv(file: TextIO, events: Iterator[CalendarEvent]) -> Iterator[int]:
+        writer = csv.writer(file)
+        writer.writerow(["id", "date", "time", "description", "color", "recurrence", "google_id"])
+
+        for i, event in enumerate(events, 1):
+            writer.writerow([
+                event.id, event.date.isoformat(), event.time.strftime("%H:%M"), event.description,
+                "#" + get_hex_color(event.color)[2:].upper(), event.recurrence.name, event.google_id or ""
+            ])
+            yield i
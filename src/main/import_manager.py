@@ -0,0 +1,146 @@
+import datetime
+import os
+import time
+from threading import Thread
+from typing import Optional
+
+from src.events.event import ImportProgressEvent
+from src.events.event_loop import EventLoop
+from src.main.config import Config
+from src.models.calendar_model import CalendarModel, CalendarEvent, EventRecurrence
+from src.models.connection_manager import ConnectionManager
+from src.ui.colors import Color, Colors, get_rgb_color
+from src.utils.ics_functions import COLOR_PROPERTY, iter_ics_lines, iter_ics_components, parse_ics_datetime, \
+    parse_ics_duration, parse_ics_rule, unescape_ics_text
+from src.utils.logging import Log
+
+
+class ImportManager:
+
+    RECURRENCES = {
+        "WEEKLY": EventRecurrence.WEEKLY,
+        "MONTHLY": EventRecurrence.MONTHLY,
+        "YEARLY": EventRecurrence.YEARLY
+    }
+    WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
+    def __init__(self, database_name: str, event_loop: EventLoop, color: Color = Colors.EVENT_BLUE204) -> None:
+        self.database_name = database_name
+        self.event_loop = event_loop
+        self.color = color
+
+        self.thread: Optional[Thread] = None
+        self.cancelled = False
+
+    def import_file_threaded(self, path: str) -> None:
+        self.cancelled = False
+        self.thread = Thread(target=self.import_file, args=(path, ), daemon=True)
+        self.thread.start()
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+    def import_file(self, path: str) -> tuple[int, int]:
+        model = CalendarModel(database_name=self.database_name)
+
+        size = max(os.path.getsize(path), 1)
+        imported = 0
+        skipped = 0
+
+        batch = []
+
+        self.event_loop.enqueue_threaded_event(ImportProgressEvent(time.time(), path, imported, skipped, 0))
+
+        try:
+            with open(path, "rb") as file:
+                for properties in iter_ics_components(iter_ics_lines(file)):
+                    if self.cancelled:
+                        break
+
+                    event = self.create_event(properties)
+                    # Modified occurrences of a recurring event repeat its UID, a repeated UID otherwise updates the
+                    # event through the unique index
+                    if event is None or "RECURRENCE-ID" in properties:
+                        skipped += 1
+                        continue
+
+                    batch.append((event, properties.get("UID", ({}, None))[1] or None))
+
+                    if len(batch) >= Config.import_batch_size:
+                        imported, skipped = self.import_batch(model, batch, imported, skipped)
+                        batch = []
+                        self.event_loop.enqueue_threaded_event(
+                            ImportProgressEvent(time.time(), path, imported, skipped, file.tell() / size)
+                        )
+
+                if batch and not self.cancelled:
+                    imported, skipped = self.import_batch(model, batch, imported, skipped)
+        except OSError as e:
+            Log.e(f"Import Manager: Couldn't import {path}: {e}")
+        finally:
+            ConnectionManager().close_thread_connections()
+            self.event_loop.enqueue_threaded_event(
+                ImportProgressEvent(time.time(), path, imported, skipped, 1, finished=True, cancelled=self.cancelled)
+            )
+
+        return imported, skipped
+
+    @staticmethod
+    def import_batch(model: CalendarModel, batch: list[tuple[CalendarEvent, Optional[str]]], imported: int,
+                     skipped: int) -> tuple[int, int]:
+        # Events imported before are updated through their UID, the ones that didn't change count as skipped
+        changes = model.import_events(batch)
+        return imported + changes, skipped + len(batch) - changes
+
+    def create_event(self, properties: dict[str, tuple[dict, str]]) -> Optional[CalendarEvent]:
+        if "DTSTART" not in properties:
+            return None
+
+        start = parse_ics_datetime(properties["DTSTART"][1])
+        if start is None:
+            return None
+
+        recurrence = self.get_recurrence(properties, start[0])
+
+        color = self.color
+        if COLOR_PROPERTY in properties:
+            try:
+                color = get_rgb_color(properties[COLOR_PROPERTY][1])
+            except ValueError:
+                pass
+
+        duration = datetime.timedelta(seconds=Config.event_duration)
+        if "DTEND" in properties:
+            end = parse_ics_datetime(properties["DTEND"][1])
+            if end is not None:
+                duration = datetime.datetime.combine(*end) - datetime.datetime.combine(*start)
+        elif "DURATION" in properties:
+            duration = parse_ics_duration(properties["DURATION"][1]) or duration
+
+        description = unescape_ics_text(properties.get("SUMMARY", ({}, ""))[1])
+
+        return CalendarEvent(
+            0, *start, description, color, recurrence, duration=max(duration, datetime.timedelta(0))
+        )
+
+    def get_recurrence(self, properties: dict[str, tuple[dict, str]], start: datetime.date) -> EventRecurrence:
+        # Rules the calendar can't repeat exactly keep only their first occurrence, so nothing is made up past them
+        if "RRULE" not in properties or "EXDATE" in properties or "RDATE" in properties:
+            return EventRecurrence.NEVER
+
+        rule = parse_ics_rule(properties["RRULE"][1])
+        recurrence = self.RECURRENCES.get(rule.pop("FREQ", None), EventRecurrence.NEVER)
+        if recurrence is EventRecurrence.NEVER or rule.pop("INTERVAL", "1") != "1":
+            return EventRecurrence.NEVER
+        rule.pop("WKST", None)
+
+        # Parts that only repeat the day of the start are allowed, COUNT, UNTIL and any other day make it inexact
+        allowed = {
+            EventRecurrence.WEEKLY: {"BYDAY": self.WEEKDAYS[start.weekday()]},
+            EventRecurrence.MONTHLY: {"BYMONTHDAY": str(start.day)},
+            EventRecurrence.YEARLY: {"BYMONTH": str(start.month), "BYMONTHDAY": str(start.day)}
+        }[recurrence]
+        if any(allowed.get(key) != value for key, value in rule.items()):
+            return EventRecurrence.NEVER
+
+        return recurrence
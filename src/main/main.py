@@ -6,15 +6,21 @@ from src.controllers.appbar_controller import AppbarController
 from src.controllers.calendar_controller import CalendarController
 from src.controllers.taskbar_controller import TaskbarController
 from src.events.event import CloseWindowEvent, WindowResizeEvent, MouseFocusChangedEvent, WindowMoveEvent, \
-    DeleteCharacterEvent, RenderCursorEvent
+    DeleteCharacterEvent, RenderCursorEvent, LanguageChangedEvent, SettingsChangedEvent
 from src.events.event_loop import EventLoop
 from src.main.account_manager import AccountManager
+from src.main.archive_manager import ArchiveManager
 from src.main.calendar_sync_manager import CalendarSyncManager
 from src.main.config import Config
 from src.main.settings import Settings
 from src.main.window_manager import WindowManager
-from src.models.calendar_model import CalendarModel
+from src.models.calendar_model import CalendarModel, HolidayProvider
+from src.models.connection_manager import ConnectionManager
+from src.models.mirror_manager import MirrorManager
+from src.models.query_profiler import QueryProfiler
+from src.ui.alignment import HorizontalAlignment, VerticalAlignment
 from src.ui.colors import Colors
+from src.ui.label import Label
 from src.utils.assets import Assets
 from src.main.language_manager import LanguageManager
 from src.utils.logging import Log
@@ -39,6 +45,7 @@ class Main:
 
         # Log.enable()
         # UIDebugger.enable()
+        # QueryProfiler().enable()
 
         self.event_loop = EventLoop()
         self.event_loop.add_repeating_event(DeleteCharacterEvent, 0.05)
@@ -52,6 +59,7 @@ class Main:
         LanguageManager()
         self.account_manager = AccountManager(self.win, self.event_loop)
         self.calendar_sync_manager = CalendarSyncManager(self.event_loop)
+        self.archive_manager = ArchiveManager()
 
         self.appbar_view = AppbarView(self.win, self.win.get_width(), Config.appbar_height, 0, 0)
         AppbarController(self.appbar_view, self.event_loop)
@@ -64,7 +72,8 @@ class Main:
         self.calendar_model = CalendarModel(database_name=self.account_manager.get_current_database_name())
         self.calendar_view = CalendarView(
             self.win, self.calendar_model, self.win.get_width() - self.taskbar_view.width,
-            self.win.get_height() - self.appbar_view.height, self.taskbar_view.width, self.appbar_view.height
+            self.win.get_height() - self.appbar_view.height, self.taskbar_view.width, self.appbar_view.height,
+            self.account_manager.get_merged_calendar_model()
         )
         self.calendar_controller = CalendarController(self.calendar_model, self.calendar_view, self.event_loop)
 
@@ -88,6 +97,8 @@ class Main:
             Log.i("")
             time.sleep(1 / Config.fps)
 
+        MirrorManager().close_all()
+        ConnectionManager().close_all()
         pygame.quit()
 
     def register_events(self) -> None:
@@ -108,9 +119,12 @@ class Main:
             if isinstance(event, WindowMoveEvent):
                 new_window_pos = (event.x, event.y)
                 self.update_display = True
+            if isinstance(event, (LanguageChangedEvent, SettingsChangedEvent)):
+                HolidayProvider().invalidate()
 
             self.account_manager.register_event(event)
             self.calendar_sync_manager.register_event(event)
+            self.archive_manager.register_event(event)
 
             if self.window_manager.register_event(event):
                 event = MouseFocusChangedEvent(time.time(), False)
@@ -135,8 +149,28 @@ class Main:
         self.view_manager.render(self.update_display)
 
         if self.update_display:
+            if UIDebugger.is_enabled() and QueryProfiler().enabled:
+                self.render_query_overlay()
             pygame.display.update()
 
+    def render_query_overlay(self) -> None:
+        lines = [
+            f"{stats.count:>6}x  p50 {stats.get_percentile(0.5) * 1000:6.1f} ms  "
+            f"p95 {stats.get_percentile(0.95) * 1000:6.1f} ms  {stats.rows:>7} rows  "
+            f"{max(stats.callers, key=stats.callers.get)}  {stats.sql[:60]}"
+            for stats in QueryProfiler().get_stats(Config.debug_overlay_queries)
+        ]
+
+        line_height = Assets().font12.get_linesize()
+        height = len(lines) * line_height
+        pygame.draw.rect(self.win, Colors.BLACK, (0, self.win.get_height() - height, self.win.get_width(), height))
+
+        for i, line in enumerate(reversed(lines)):
+            Label.render_text(
+                self.win, line, (4, self.win.get_height() - i * line_height), Assets().font12, Colors.YELLOW220,
+                horizontal_alignment=HorizontalAlignment.LEFT, vertical_alignment=VerticalAlignment.BOTTOM
+            )
+
     def render_start(self):
         self.win.fill(Colors.BLACK)
 
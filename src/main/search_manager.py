@@ -0,0 +1,123 @@
+import re
+import sqlite3
+import time
+import unicodedata
+from threading import Thread, Condition
+
+from src.events.event import SearchResultsEvent
+from src.events.event_loop import EventLoop
+from src.main.config import Config
+from src.models.calendar_model import CalendarModel, CalendarEvent
+from src.models.connection_manager import ConnectionManager
+
+
+class SearchManager:
+
+    def __init__(self, database_name: str, event_loop: EventLoop) -> None:
+        self.database_name = database_name
+        self.event_loop = event_loop
+
+        self.condition = Condition()
+        self.running = True
+        self.searching = False
+
+        self.query = ""
+        self.query_time = 0
+        self.generation = 0
+        self.finished_generation = 0
+
+        self.last_query = ""
+        self.last_results: list[CalendarEvent] = []
+        self.last_seq = 0
+
+        self.model = None
+        self.conn = None
+
+        Thread(target=self.run, daemon=True).start()
+
+    def search(self, query: str) -> None:
+        with self.condition:
+            self.query = query
+            self.query_time = time.time()
+            self.generation += 1
+
+            if not query:
+                self.finished_generation = self.generation
+
+            # Stale queries are cancelled instead of waiting for them to finish
+            if self.searching:
+                self.conn.interrupt()
+
+            self.condition.notify()
+
+    def stop(self) -> None:
+        with self.condition:
+            self.running = False
+
+            if self.searching:
+                self.conn.interrupt()
+
+            self.condition.notify()
+
+    def run(self) -> None:
+        self.model = CalendarModel(database_name=self.database_name)
+        # Interrupts come from the main thread, which would otherwise get its own connection
+        self.conn = self.model.conn
+
+        while True:
+            with self.condition:
+                while self.running and self.finished_generation == self.generation:
+                    self.condition.wait()
+
+                if not self.running:
+                    break
+
+                delay = self.query_time + Config.search_debounce - time.time()
+                if delay > 0:
+                    self.condition.wait(delay)
+                    continue
+
+                query = self.query
+                generation = self.generation
+                self.searching = True
+
+            try:
+                # Read before the search, a write that lands during it makes the next query search again
+                seq = self.model.get_change_seq()
+                results = self.get_results(query, seq)
+            except sqlite3.OperationalError:
+                results = None
+
+            with self.condition:
+                self.searching = False
+                self.finished_generation = max(self.finished_generation, generation)
+
+                if results is None or generation != self.generation:
+                    continue
+
+            self.last_query = query
+            self.last_results = results
+            self.last_seq = seq
+            self.event_loop.enqueue_threaded_event(SearchResultsEvent(time.time(), query, results))
+
+        ConnectionManager().close_thread_connections()
+
+    def get_results(self, query: str, seq: int) -> list[CalendarEvent]:
+        # A query that extends the previous one can only match a subset of its results, unless events changed since
+        if (
+            self.last_query and query.startswith(self.last_query) and seq == self.last_seq and
+            len(self.last_results) < Config.search_result_limit
+        ):
+            words = self.get_words(query)
+            return [
+                event for event in self.last_results
+                if all(any(token.startswith(word) for token in self.get_words(event.description)) for word in words)
+            ]
+
+        return self.model.search_events(query)
+
+    @staticmethod
+    def get_words(text: str) -> list[str]:
+        # Mirrors the unicode61 tokenizer used by the search index
+        text = unicodedata.normalize("NFKD", text.lower())
+        return re.findall(r"\w+", "".join(c for c in text if not unicodedata.combining(c)))
@@ -1,15 +1,31 @@
 import datetime
+import heapq
+import json
 import os
 import pickle
 import sqlite3
+import time
+from array import array
 from dataclasses import dataclass
 from enum import Enum, auto
+from functools import partial
+from itertools import islice
+from operator import itemgetter
+from typing import ContextManager, Iterator, NamedTuple, Optional, Union
 
+from src.main.config import Config
 from src.main.settings import Settings
-from src.ui.colors import Color, get_rgb_color, get_hex_color
+from src.models.connection_manager import ConnectionManager
+from src.models.interval_index import IntervalIndex
+from src.models.mirror_manager import MirrorManager
+from src.models.month_cache import MonthCache
+from src.models.occurrence_manager import OccurrenceManager
+from src.ui.colors import Color, get_rgb_color, get_hex_color, get_packed_color, unpack_color
 from src.utils.assets import Assets
-from src.utils.calendar_functions import get_month_length, calculate_easter
-from src.main.language_manager import LanguageManager
+from src.utils.singleton import Singleton
+from src.utils.calendar_functions import get_month_length, calculate_easter, get_seconds, get_timestamp, \
+    get_datetime, iter_weekly_dates, iter_monthly_dates, iter_yearly_dates, EPOCH_ORDINAL
+from src.main.language_manager import LanguageManager, Language
 
 
 class EventRecurrence(Enum):
@@ -19,6 +35,12 @@ class EventRecurrence(Enum):
     YEARLY = auto()
 
 
+class ChangeOperation(Enum):
+    INSERT = auto()
+    UPDATE = auto()
+    DELETE = auto()
+
+
 @dataclass
 class CalendarEvent:
     id: int
@@ -29,386 +51,1490 @@ class CalendarEvent:
     recurrence: EventRecurrence
     is_default: bool = False
     google_id: str = ""
+    duration: datetime.timedelta = datetime.timedelta(seconds=Config.event_duration)
+
+    @property
+    def start(self) -> datetime.datetime:
+        return datetime.datetime.combine(self.date, self.time)
+
+    @property
+    def end(self) -> datetime.datetime:
+        return self.start + self.duration
+
+
+class EventRecord(NamedTuple):
+    id: int
+    date: int
+    time: int
+    description: str
+    color: int
+    recurrence: int
+    is_default: bool
+    google_id: Optional[str]
+    duration: int
+
+    def to_event(self, event_type: type[CalendarEvent] = CalendarEvent, *args) -> CalendarEvent:
+        # Subclasses of CalendarEvent take their extra fields after the common ones
+        return event_type(
+            self.id, datetime.date.fromordinal(self.date), datetime.time(self.time // 60, self.time % 60),
+            self.description, unpack_color(self.color), EventRecurrence(self.recurrence), self.is_default,
+            self.google_id, datetime.timedelta(minutes=self.duration), *args
+        )
+
+
+class EventChange(NamedTuple):
+    seq: int
+    event_id: int
+    operation: int
+    date: Optional[int]
+    recurrence: Optional[int]
+    old_date: Optional[int]
+    old_recurrence: Optional[int]
+    changed_at: int
+
+
+class EventTombstone(NamedTuple):
+    id: int
+    google_id: Optional[str]
+    date: int
+    recurrence: int
+    deleted_at: int
+    seq: int
+
+
+@dataclass
+class HolidayTable:
+    days: dict[datetime.date, list[CalendarEvent]]
+    months: list[list[CalendarEvent]]
+
+
+class HolidayProvider(metaclass=Singleton):
+
+    def __init__(self) -> None:
+        self.tables: dict[tuple[Union[Language, str], int], HolidayTable] = {}
+
+    def invalidate(self) -> None:
+        self.tables = {}
+
+    def get_holiday_table(self, year: int) -> HolidayTable:
+        key = (LanguageManager().language, year)
+
+        table = self.tables.get(key)
+        if table is None:
+            table = self.create_holiday_table(year)
+            self.tables[key] = table
+
+        return table
+
+    def get_events_for_date(self, date: datetime.date) -> list[CalendarEvent]:
+        return list(self.get_holiday_table(date.year).days.get(date, ()))
+
+    def get_events_for_month(self, year: int, month: int) -> list[CalendarEvent]:
+        return list(self.get_holiday_table(year).months[month - 1])
+
+    def get_events_for_year(self, year: int) -> list[CalendarEvent]:
+        return [event for events in self.get_holiday_table(year).months for event in events]
+
+    def get_events_in_range(self, start: datetime.date, end: datetime.date) -> Iterator[CalendarEvent]:
+        for year in range(start.year, end.year + 1):
+            first_month = start.month if year == start.year else 1
+            last_month = end.month if year == end.year else 12
+            for events in self.get_holiday_table(year).months[first_month - 1:last_month]:
+                for event in events:
+                    if start <= event.date <= end:
+                        yield event
+
+    def create_holiday_table(self, year: int) -> HolidayTable:
+        events = self.create_default_events(year) + self.create_easter_events(year) + self.create_catholic_events(year)
+        events.sort(key=lambda ev: (ev.date, ev.time))
+
+        table = HolidayTable({}, [[] for _ in range(12)])
+        for event in events:
+            table.days.setdefault(event.date, []).append(event)
+            table.months[event.date.month - 1].append(event)
+
+        return table
+
+    def create_default_events(self, year: int) -> list[CalendarEvent]:
+        color = get_rgb_color(Settings().get_settings()["default_event_color"])
+
+        events = []
+        for i, event in enumerate(LanguageManager().get_string("default_event_list")):
+            date = self.parse_holiday_date(event["date"], year)
+            if not date:
+                continue
+
+            events.append(
+                CalendarEvent(
+                    i, date, datetime.time(0, 0), event["description"], color, EventRecurrence.YEARLY,
+                    is_default=True
+                )
+            )
+
+        return events
+
+    def create_easter_events(self, year: int) -> list[CalendarEvent]:
+        color = get_rgb_color(Settings().get_settings()["default_event_color"])
+
+        easter = datetime.date(*calculate_easter(year))
+        easter_m = easter + datetime.timedelta(days=1)
+        tijelovo = easter + datetime.timedelta(days=60)
+
+        easter_events = [
+            CalendarEvent(
+                -1, easter, datetime.time(0, 0), "Uskrs", color, EventRecurrence.NEVER, is_default=True
+            ),
+            CalendarEvent(
+                -2, easter_m, datetime.time(0, 0), "Uskršnji ponedjeljak", color, EventRecurrence.NEVER,
+                is_default=True
+            ),
+            CalendarEvent(
+                -3, tijelovo, datetime.time(0, 0), "Tijelovo", color, EventRecurrence.NEVER, is_default=True
+            )
+        ]
+
+        return easter_events
+
+    def create_catholic_events(self, year: int) -> list[CalendarEvent]:
+        settings = Settings().get_settings()
+
+        if not settings["show_catholic_events"]:
+            return []
+
+        color = get_rgb_color(settings["catholic_event_color"])
+
+        events = []
+        for i, event in enumerate(LanguageManager().get_string("catholic_event_list")):
+            date = self.parse_holiday_date(event["date"], year)
+            if not date:
+                continue
+
+            events.append(
+                CalendarEvent(
+                    -(i + 100), date, datetime.time(0, 0), event["description"], color, EventRecurrence.NEVER,
+                    is_default=True
+                )
+            )
+
+        return events
+
+    @staticmethod
+    def parse_holiday_date(date: str, year: int) -> Optional[datetime.date]:
+        if not date:
+            return None
+
+        month, day = map(int, date.split("-"))
+        if day > get_month_length(month, year):
+            return None
+
+        return datetime.date(year, month, day)
 
 
 class CalendarModel:
 
+    SCHEMA_VERSION = 10
+
     def __init__(self, database_name: str = "calendar") -> None:
         self.database_name = database_name
         
         self.calendar_database_path = os.path.join(Assets().calendar_database_path, database_name + ".db")
+        self.database_path = self.calendar_database_path
+
+        self.migrate_database()
+
+        if Config.calendar_memory_mirror:
+            self.database_path = MirrorManager().get_mirror_path(self.calendar_database_path)
+
+        self.indexed_holidays = None
+        self.interval_index: Optional[tuple[tuple, IntervalIndex[CalendarEvent]]] = None
+
+    # Reads go through a read only connection of the thread, inside a write they see its uncommitted rows
+    @property
+    def conn(self) -> sqlite3.Connection:
+        writer = ConnectionManager().get_active_writer(self.database_path)
+        return writer.conn if writer is not None else ConnectionManager().get_reader(self.database_path)
+
+    @property
+    def cursor(self) -> sqlite3.Cursor:
+        writer = ConnectionManager().get_active_writer(self.database_path)
+        return writer.cursor if writer is not None else ConnectionManager().get_reader_cursor(self.database_path)
+
+    def write(self) -> ContextManager[sqlite3.Cursor]:
+        return ConnectionManager().write(self.database_path)
+
+    def migrate_database(self) -> None:
+        migrations = [self.migrate_to_v1, self.migrate_to_v2, self.migrate_to_v3, self.migrate_to_v4,
+                      self.migrate_to_v5, self.migrate_to_v6, self.migrate_to_v7,
+                      self.migrate_to_v8, self.migrate_to_v9, self.migrate_to_v10]
+
+        # Up to date databases are only read, the write lock would make the UI wait for a sync that is writing
+        if os.path.exists(self.database_path) and self.get_schema_version() >= self.SCHEMA_VERSION:
+            return
+
+        # The version is read again under the write lock, so two threads opening the same file don't both migrate it
+        while True:
+            with self.write():
+                version = self.get_schema_version()
+                if version >= self.SCHEMA_VERSION:
+                    break
+
+                migrations[version]()
+                self.cursor.execute(f"PRAGMA user_version = {version + 1}")
+
+    def get_schema_version(self) -> int:
+        return self.cursor.execute("PRAGMA user_version").fetchone()[0]
+
+    def migrate_to_v1(self) -> None:
+        self.cursor.execute(f"""PRAGMA table_info("{self.database_name}")""")
+        old_columns = {row[1] for row in self.cursor.fetchall()}
+
+        if old_columns:
+            self.cursor.execute(f"""ALTER TABLE "{self.database_name}" RENAME TO "{self.database_name}_v0" """)
 
-        self.conn = sqlite3.connect(self.calendar_database_path)
-        self.cursor = self.conn.cursor()
         self.cursor.execute(
             f"""
-            CREATE TABLE IF NOT EXISTS "{self.database_name}" (
-                id INTEGER,
-                year INTEGER,
-                month INTEGER,
-                day INTEGER,
-                hour INTEGER,
-                minute INTEGER,
-                second INTEGER,
+            CREATE TABLE "{self.database_name}" (
+                id INTEGER PRIMARY KEY,
+                date INTEGER NOT NULL,
+                time INTEGER NOT NULL,
                 description TEXT,
                 color TEXT,
-                recurrence BLOB,
+                recurrence INTEGER NOT NULL,
                 is_default INTEGER,
                 google_id TEXT
             )
             """
         )
-        self.conn.commit()
+        self.cursor.execute(
+            f"""
+            CREATE INDEX "{self.database_name}_recurrence_date" ON "{self.database_name}" (recurrence, date, time)
+            """
+        )
 
-        self.current_id = None
-        self.load_current_id()
+        if not old_columns:
+            return
 
-        self.default_event_color = None
-        self.catholic_event_color = None
-        self.load_data()
+        self.cursor.execute(
+            f"""
+            SELECT id, year, month, day, hour, minute, second, description, color, recurrence, is_default, google_id
+            FROM "{self.database_name}_v0"
+            """
+        )
+        rows = []
+        used_ids = set()
+        for t in self.cursor.fetchall():
+            # Ids used to come from a counter in the settings file, so duplicates are possible
+            id_ = t[0] if t[0] is not None and t[0] not in used_ids else None
+            used_ids.add(id_)
+            rows.append(
+                (id_, datetime.date(t[1], t[2], t[3]).toordinal(), t[4] * 3600 + t[5] * 60 + (t[6] or 0), t[7],
+                 t[8], pickle.loads(t[9]).value, t[10], t[11])
+            )
 
-    def load_data(self) -> None:
-        settings = Settings().get_settings()
+        self.cursor.executemany(
+            f"""
+            INSERT INTO "{self.database_name}" (id, date, time, description, color, recurrence, is_default, google_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, sorted(rows, key=lambda r: r[0] is None)
+        )
+        self.cursor.execute(f"""DROP TABLE "{self.database_name}_v0" """)
 
-        self.default_event_color = get_rgb_color(settings["default_event_color"])
-        self.catholic_event_color = get_rgb_color(settings["catholic_event_color"])
+    def migrate_to_v2(self) -> None:
+        self.cursor.execute(
+            f"""
+            CREATE VIRTUAL TABLE "{self.database_name}_search" USING fts5(description, tokenize = "unicode61", prefix = "1 2 3")
+            """
+        )
+        self.create_search_triggers()
+        self.cursor.execute(
+            f"""
+            INSERT INTO "{self.database_name}_search" (rowid, description)
+            SELECT id, description FROM "{self.database_name}"
+            """
+        )
+
+    def migrate_to_v3(self) -> None:
+        self.cursor.execute(
+            f"""
+            CREATE TABLE "{self.database_name}_v2" (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                date INTEGER NOT NULL,
+                time INTEGER NOT NULL,
+                description TEXT,
+                color TEXT,
+                recurrence INTEGER NOT NULL,
+                is_default INTEGER,
+                google_id TEXT
+            )
+            """
+        )
+        self.cursor.execute(f"""INSERT INTO "{self.database_name}_v2" SELECT * FROM "{self.database_name}" """)
+        self.cursor.execute(f"""DROP TABLE "{self.database_name}" """)
+        self.cursor.execute(f"""ALTER TABLE "{self.database_name}_v2" RENAME TO "{self.database_name}" """)
+        self.cursor.execute(
+            f"""
+            CREATE INDEX "{self.database_name}_recurrence_date" ON "{self.database_name}" (recurrence, date, time)
+            """
+        )
+        self.create_search_triggers()
 
-    def load_current_id(self) -> None:
+        # The id counter used to live in the settings file, it is moved into the sequence of the table
         settings = Settings().get_settings()
+        current_id = settings.get("current_id", {}).get(self.database_name, 0)
+
+        self.cursor.execute("DELETE FROM sqlite_sequence WHERE name = ?", (self.database_name,))
+        self.cursor.execute(
+            f"""
+            INSERT INTO sqlite_sequence (name, seq)
+            SELECT ?, MAX(?, COALESCE(MAX(id), 0)) FROM "{self.database_name}"
+            """, (self.database_name, current_id - 1)
+        )
 
-        if self.database_name not in settings["current_id"]:
-            settings["current_id"][self.database_name] = 0
+        if self.database_name in settings.get("current_id", {}):
+            settings["current_id"].pop(self.database_name)
+            if not settings["current_id"]:
+                settings.pop("current_id")
             Settings().save_settings(settings)
 
-        self.current_id = settings["current_id"][self.database_name]
+    def migrate_to_v4(self) -> None:
+        self.cursor.execute(
+            f"""
+            ALTER TABLE "{self.database_name}"
+            ADD COLUMN start INTEGER GENERATED ALWAYS AS ((date - {EPOCH_ORDINAL}) * 86400 + time) VIRTUAL
+            """
+        )
+        self.cursor.execute(
+            f"""
+            CREATE INDEX "{self.database_name}_recurrence_start" ON "{self.database_name}" (recurrence, start)
+            """
+        )
 
-    def add_event(self, event: CalendarEvent, threaded: bool = False) -> None:
-        self.load_current_id()
+    def migrate_to_v5(self) -> None:
+        self.cursor.execute(
+            f"""
+            CREATE TABLE "{self.database_name}_archive" (
+                id INTEGER PRIMARY KEY,
+                date INTEGER NOT NULL,
+                time INTEGER NOT NULL,
+                description TEXT,
+                color TEXT,
+                recurrence INTEGER NOT NULL,
+                is_default INTEGER,
+                google_id TEXT
+            )
+            """
+        )
+        self.cursor.execute(
+            f"""CREATE INDEX "{self.database_name}_archive_date" ON "{self.database_name}_archive" (date, time)"""
+        )
 
-        if threaded:
-            conn = sqlite3.connect(self.calendar_database_path)
-            cursor = conn.cursor()
-        else:
-            conn = self.conn
-            cursor = self.cursor
+    def migrate_to_v6(self) -> None:
+        # Events without a Google id used to store an empty string, only real ids have to be unique
+        for table in (self.database_name, f"{self.database_name}_archive"):
+            self.cursor.execute(f"""UPDATE "{table}" SET google_id = NULL WHERE google_id = ''""")
+        self.cursor.execute(
+            f"""
+            DELETE FROM "{self.database_name}"
+            WHERE google_id IS NOT NULL AND id NOT IN (
+                SELECT MIN(id) FROM "{self.database_name}" WHERE google_id IS NOT NULL GROUP BY google_id
+            )
+            """
+        )
+        self.cursor.execute(
+            f"""
+            CREATE UNIQUE INDEX "{self.database_name}_google_id" ON "{self.database_name}" (google_id)
+            WHERE google_id IS NOT NULL
+            """
+        )
 
-        with conn:
-            cursor.execute(
-                f"""
-                INSERT INTO "{self.database_name}" (id, year, month, day, hour, minute, second, description, color, 
-                recurrence, is_default, google_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (self.current_id, event.date.year, event.date.month, event.date.day, event.time.hour,
-                      event.time.minute, int(event.time.second), event.description, get_hex_color(event.color),
-                      pickle.dumps(event.recurrence), event.is_default, event.google_id)
+    def migrate_to_v7(self) -> None:
+        self.cursor.execute(
+            f"""
+            CREATE TABLE "{self.database_name}_occurrences" (
+                date INTEGER NOT NULL,
+                event_id INTEGER NOT NULL,
+                PRIMARY KEY (date, event_id)
+            ) WITHOUT ROWID
+            """
+        )
+        self.cursor.execute(
+            f"""
+            CREATE INDEX "{self.database_name}_occurrences_event" ON "{self.database_name}_occurrences" (event_id)
+            """
+        )
+        self.cursor.execute(
+            f"""
+            CREATE TABLE "{self.database_name}_occurrence_window" (
+                first_date INTEGER NOT NULL, 
+                last_date INTEGER NOT NULL
             )
-            conn.commit()
+            """
+        )
+
+        # Occurrences of a changed event are dropped here and expanded again by the model
+        self.cursor.execute(
+            f"""
+            CREATE TRIGGER "{self.database_name}_occurrences_delete" AFTER DELETE ON "{self.database_name}" 
+            WHEN old.recurrence != {EventRecurrence.NEVER.value} BEGIN
+                DELETE FROM "{self.database_name}_occurrences" WHERE event_id = old.id;
+            END
+            """
+        )
+        self.cursor.execute(
+            f"""
+            CREATE TRIGGER "{self.database_name}_occurrences_update" AFTER UPDATE OF date, recurrence 
+            ON "{self.database_name}" WHEN old.recurrence != {EventRecurrence.NEVER.value} BEGIN
+                DELETE FROM "{self.database_name}_occurrences" WHERE event_id = old.id;
+            END
+            """
+        )
 
-        self.current_id += 1
+        today = datetime.date.today().toordinal()
+        first_date, last_date = today - Config.occurrence_window, today + Config.occurrence_window
+        self.cursor.execute(
+            f"""INSERT INTO "{self.database_name}_occurrence_window" VALUES (?, ?)""", (first_date, last_date)
+        )
 
-        Settings().update_settings(["current_id", self.database_name], self.current_id)
+        self.cursor.execute(
+            f"""SELECT id, date, recurrence FROM "{self.database_name}" WHERE recurrence != ? AND date <= ?""",
+            (EventRecurrence.NEVER.value, last_date)
+        )
+        self.cursor.executemany(
+            self.get_occurrence_sql(), self.get_occurrence_rows(self.cursor.fetchall(), [(first_date, last_date)])
+        )
 
-    def get_events_for_date(self, date: datetime.date) -> list[CalendarEvent]:
-        with self.conn:
+    def migrate_to_v8(self) -> None:
+        # Events used to have only a start, they get the default length
+        for table in (self.database_name, f"{self.database_name}_archive"):
             self.cursor.execute(
-                f"""
-                SELECT id, year, month, day, hour, minute, second, description, color, recurrence, is_default, google_id
-                FROM "{self.database_name}"
-                WHERE year = ? AND month = ? AND day = ? AND recurrence = ?
-                """,
-                (date.year, date.month, date.day, pickle.dumps(EventRecurrence.NEVER))
+                f"""ALTER TABLE "{table}" ADD COLUMN duration INTEGER NOT NULL DEFAULT {Config.event_duration}"""
             )
+            self.cursor.execute(f"""CREATE INDEX "{table}_duration" ON "{table}" (duration)""")
 
-        default_events = list(filter(lambda ev: ev.date == date, self.get_default_events()))
-        easter_events = list(filter(lambda ev: ev.date == date, self.get_easter_events(date.year)))
-        catholic_events = list(filter(lambda ev: ev.date.month == date.month and ev.date.day == date.day,
-                                      self.get_catholic_events()))
+    def migrate_to_v9(self) -> None:
+        # Events written before the journal existed have no known modification time
+        for table in (self.database_name, f"{self.database_name}_archive"):
+            self.cursor.execute(f"""ALTER TABLE "{table}" ADD COLUMN modified_at INTEGER NOT NULL DEFAULT 0""")
 
-        return default_events + easter_events + catholic_events + list(
-            map(
-                lambda t: CalendarEvent(
-                    t[0], datetime.date(t[1], t[2], t[3]), datetime.time(t[4], t[5], t[6]), t[7], get_rgb_color(t[8]),
-                    pickle.loads(t[9]), t[10], t[11]
-                ),
-                self.cursor.fetchall()
+        self.cursor.execute(
+            f"""
+            CREATE TABLE "{self.database_name}_changes" (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                event_id INTEGER NOT NULL,
+                operation INTEGER NOT NULL,
+                date INTEGER,
+                recurrence INTEGER,
+                old_date INTEGER,
+                old_recurrence INTEGER,
+                changed_at INTEGER NOT NULL
             )
-        ) + self.get_recurring_events(date.year, date.month, date.day)
+            """
+        )
+        self.cursor.execute(
+            f"""
+            CREATE TABLE "{self.database_name}_tombstones" (
+                id INTEGER PRIMARY KEY,
+                google_id TEXT,
+                date INTEGER NOT NULL,
+                recurrence INTEGER NOT NULL,
+                deleted_at INTEGER NOT NULL,
+                seq INTEGER NOT NULL
+            )
+            """
+        )
+        self.cursor.execute(
+            f"""
+            CREATE INDEX "{self.database_name}_tombstones_seq" ON "{self.database_name}_tombstones" (seq)
+            """
+        )
 
-    def get_events_for_month(self, year: int, month: int) -> list[list[CalendarEvent]]:
-        with self.conn:
+        now = "CAST(strftime('%s', 'now') AS INTEGER)"
+
+        # Moves between the events and the archive table aren't changes, the row is in the other table by then
+        self.cursor.execute(
+            f"""
+            CREATE TRIGGER "{self.database_name}_changes_insert" AFTER INSERT ON "{self.database_name}"
+            WHEN NOT EXISTS (SELECT 1 FROM "{self.database_name}_archive" WHERE id = new.id) BEGIN
+                INSERT INTO "{self.database_name}_changes" (event_id, operation, date, recurrence, changed_at)
+                VALUES (new.id, {ChangeOperation.INSERT.value}, new.date, new.recurrence, new.modified_at);
+            END
+            """
+        )
+        self.cursor.execute(
+            f"""
+            CREATE TRIGGER "{self.database_name}_changes_update" AFTER UPDATE ON "{self.database_name}" BEGIN
+                INSERT INTO "{self.database_name}_changes" 
+                (event_id, operation, date, recurrence, old_date, old_recurrence, changed_at)
+                VALUES (
+                    new.id, {ChangeOperation.UPDATE.value}, new.date, new.recurrence, old.date, old.recurrence, 
+                    new.modified_at
+                );
+            END
+            """
+        )
+        for table, other_table in ((self.database_name, f"{self.database_name}_archive"),
+                                   (f"{self.database_name}_archive", self.database_name)):
             self.cursor.execute(
                 f"""
-                SELECT id, year, month, day, hour, minute, second, description, color, recurrence, is_default, google_id
-                FROM "{self.database_name}"
-                WHERE year = ? AND month = ? AND recurrence = ?
-                """,
-                (year, month, pickle.dumps(EventRecurrence.NEVER),)
+                CREATE TRIGGER "{table}_changes_delete" AFTER DELETE ON "{table}"
+                WHEN NOT EXISTS (SELECT 1 FROM "{other_table}" WHERE id = old.id) BEGIN
+                    INSERT INTO "{self.database_name}_changes" 
+                    (event_id, operation, old_date, old_recurrence, changed_at)
+                    VALUES (old.id, {ChangeOperation.DELETE.value}, old.date, old.recurrence, {now});
+                    INSERT OR REPLACE INTO "{self.database_name}_tombstones" 
+                    (id, google_id, date, recurrence, deleted_at, seq)
+                    VALUES (old.id, old.google_id, old.date, old.recurrence, {now}, last_insert_rowid());
+                END
+                """
             )
 
-            events = list(
-                map(
-                    lambda t: CalendarEvent(
-                        t[0], datetime.date(t[1], t[2], t[3]), datetime.time(t[4], t[5], t[6]), t[7],
-                        get_rgb_color(t[8]),
-                        pickle.loads(t[9]), t[10], t[11]
-                    ),
-                    self.cursor.fetchall()
-                )
-            )
+    def migrate_to_v10(self) -> None:
+        # Imported events keep the UID of their file, importing it again updates them instead of adding copies
+        for table in (self.database_name, f"{self.database_name}_archive"):
+            self.cursor.execute(f"""ALTER TABLE "{table}" ADD COLUMN uid TEXT""")
 
-        default_events = list(filter(lambda ev: ev.date.month == month, self.get_default_events()))
-        easter_events = list(filter(lambda ev: ev.date.month == month, self.get_easter_events(year)))
-        catholic_events = list(filter(lambda ev: ev.date.month == month, self.get_catholic_events()))
+        self.cursor.execute(
+            f"""
+            CREATE UNIQUE INDEX "{self.database_name}_uid" ON "{self.database_name}" (uid) WHERE uid IS NOT NULL
+            """
+        )
+        self.cursor.execute(
+            f"""
+            CREATE INDEX "{self.database_name}_archive_uid" ON "{self.database_name}_archive" (uid) 
+            WHERE uid IS NOT NULL
+            """
+        )
 
-        recurring_events = self.get_recurring_events(year, month)
+    def create_search_triggers(self) -> None:
+        self.cursor.execute(
+            f"""
+            CREATE TRIGGER "{self.database_name}_search_insert" AFTER INSERT ON "{self.database_name}" BEGIN
+                INSERT INTO "{self.database_name}_search" (rowid, description) VALUES (new.id, new.description);
+            END
+            """
+        )
+        self.cursor.execute(
+            f"""
+            CREATE TRIGGER "{self.database_name}_search_delete" AFTER DELETE ON "{self.database_name}" BEGIN
+                DELETE FROM "{self.database_name}_search" WHERE rowid = old.id;
+            END
+            """
+        )
+        self.cursor.execute(
+            f"""
+            CREATE TRIGGER "{self.database_name}_search_update" AFTER UPDATE OF id, description 
+            ON "{self.database_name}" BEGIN
+                DELETE FROM "{self.database_name}_search" WHERE rowid = old.id;
+                INSERT INTO "{self.database_name}_search" (rowid, description) VALUES (new.id, new.description);
+            END
+            """
+        )
 
-        ret = [[] for _ in range(get_month_length(month))]
+    def add_event(self, event: CalendarEvent) -> int:
+        return self.add_events([event])[0]
 
-        for event in default_events + easter_events + catholic_events + events + recurring_events:
-            ret[event.date.day - 1].append(event)
+    def add_events(self, events: list[CalendarEvent]) -> list[int]:
+        if not events:
+            return []
 
-        return ret
+        modified_at = int(time.time())
+        rows = [(event.date.toordinal(), get_seconds(event.time), event.description, get_hex_color(event.color),
+                 event.recurrence.value, event.is_default, event.google_id or None,
+                 int(event.duration.total_seconds()), modified_at) for event in events]
 
-    def get_recurring_events(self, year: int, month: int, day: int = None) -> list[CalendarEvent]:
-        with self.conn:
-            self.cursor.execute(
+        with self.write():
+            self.cursor.executemany(
                 f"""
-                SELECT id, year, month, day, hour, minute, second, description, color, recurrence, is_default, google_id
-                FROM "{self.database_name}"
-                WHERE recurrence != ?
-                """,
-                (pickle.dumps(EventRecurrence.NEVER),)
+                INSERT INTO "{self.database_name}" (date, time, description, color, recurrence, is_default, google_id,
+                duration, modified_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, rows
             )
+            # The transaction holds the write lock, so AUTOINCREMENT hands out consecutive ids
+            last_id = self.cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+            ids = list(range(last_id - len(events) + 1, last_id + 1))
 
-            events = list(
-                map(
-                    lambda t: CalendarEvent(
-                        t[0], datetime.date(t[1], t[2], t[3]), datetime.time(t[4], t[5], t[6]), t[7],
-                        get_rgb_color(t[8]),
-                        pickle.loads(t[9]), t[10], t[11]
-                    ),
-                    self.cursor.fetchall()
-                )
+            occurrence_rows = self.get_occurrence_rows(
+                [(id_, row[0], row[4]) for id_, row in zip(ids, rows)], [self.get_occurrence_window()]
             )
+            self.cursor.executemany(self.get_occurrence_sql(), occurrence_rows)
+
+            # The disk copy has to use the ids the mirror handed out
+            self.write_through([
+                (
+                    f"""
+                    INSERT INTO "{self.database_name}" (id, date, time, description, color, recurrence, is_default, 
+                    google_id, duration, modified_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """, [(id_, *row) for id_, row in zip(ids, rows)]
+                ),
+                (self.get_occurrence_sql(), occurrence_rows)
+            ])
 
-        ret = []
         for event in events:
-            if event.recurrence == EventRecurrence.WEEKLY:
-                for i in range(get_month_length(month)):
-                    if day and day != i + 1:
-                        continue
-                    if datetime.date(year, month, i + 1).weekday() == event.date.weekday():
-                        ret.append(
-                            CalendarEvent(
-                                event.id, datetime.date(year, month, i + 1), event.time,
-                                event.description, event.color, event.recurrence, event.is_default, event.google_id
-                            )
-                        )
-            elif (
-                    event.recurrence == EventRecurrence.MONTHLY and
-                    event.date.day <= get_month_length(month) and
-                    (not day or event.date.day == day)
-            ):
-                ret.append(
-                    CalendarEvent(
-                        event.id, datetime.date(year, month, event.date.day), event.time,
-                        event.description, event.color, event.recurrence, event.is_default, event.google_id
-                    )
-                )
-            elif event.recurrence == EventRecurrence.YEARLY and event.date.month == month and (
-                    not day or event.date.day == day):
-                ret.append(
-                    CalendarEvent(
-                        event.id, datetime.date(year, month, event.date.day), event.time,
-                        event.description, event.color, event.recurrence, event.is_default, event.google_id
-                    )
-                )
+            self.invalidate_event(event)
 
-        return ret
+        return ids
 
-    def get_default_events(self) -> list[CalendarEvent]:
-        events = LanguageManager().get_string("default_event_list")
-        default_events = []
+    def execute_statements(self, statements: list[tuple[str, list[tuple]]]) -> int:
+        with self.write():
+            changes = self.run_statements(statements)
+            self.write_through(statements)
 
-        for i, event in enumerate(events):
-            if not event["date"]:
-                continue
-            month, day = event["date"].split("-")
-            date = datetime.date(datetime.datetime.now().year, int(month), int(day))
+        return changes
 
-            default_events.append(
-                CalendarEvent(
-                    i, date, datetime.time(0, 0), event["description"],
-                    self.default_event_color, EventRecurrence.YEARLY, is_default=True
+    def run_statements(self, statements: list[tuple[str, list[tuple]]]) -> int:
+        return sum(self.cursor.executemany(sql, rows).rowcount for sql, rows in statements)
+
+    def get_occurrence_window(self) -> tuple[int, int]:
+        return self.conn.execute(
+            f"""SELECT first_date, last_date FROM "{self.database_name}_occurrence_window" """
+        ).fetchone()
+
+    def get_occurrence_sql(self) -> str:
+        return f"""INSERT OR IGNORE INTO "{self.database_name}_occurrences" (date, event_id) VALUES (?, ?)"""
+
+    def get_occurrence_rows(self, events: list[tuple[int, int, int]],
+                            ranges: list[tuple[int, int]]) -> list[tuple[int, int]]:
+        return [
+            (date, id_)
+            for id_, event_date, recurrence in events if recurrence != EventRecurrence.NEVER.value
+            for first, last in ranges
+            for date in self.iter_recurrence_dates(EventRecurrence(recurrence), event_date, first, last)
+        ]
+
+    def has_occurrences(self, start: datetime.date, end: datetime.date) -> bool:
+        return self.covers_occurrences(self.get_occurrence_window(), start, end)
+
+    def covers_occurrences(self, window: tuple[int, int], start: datetime.date, end: datetime.date) -> bool:
+        first_date, last_date = window
+        if first_date <= start.toordinal() and end.toordinal() <= last_date:
+            return True
+
+        # Reads never write, ranges next to the window are expanded on the fly while it grows in the background
+        # Jumps far away from the window are always expanded on the fly instead of filling the table for decades
+        if start.toordinal() >= first_date - Config.occurrence_window_step and \
+                end.toordinal() <= last_date + Config.occurrence_window_step:
+            OccurrenceManager().extend(self.database_path, partial(self.extend_occurrences, start, end))
+
+        return False
+
+    def extend_occurrences(self, start: datetime.date, end: datetime.date) -> None:
+        # The window and the events are read in the transaction, so events added meanwhile aren't missed
+        with self.write():
+            first_date, last_date = self.get_occurrence_window()
+
+            # The window grows by a whole step, so navigating month by month doesn't expand every month
+            ranges = []
+            if start.toordinal() < first_date:
+                ranges.append((first_date - Config.occurrence_window_step, first_date - 1))
+            if end.toordinal() > last_date:
+                ranges.append((last_date + 1, last_date + Config.occurrence_window_step))
+            if not ranges:
+                return
+
+            new_first = min(first_date, ranges[0][0])
+            new_last = max(last_date, ranges[-1][1])
+
+            self.cursor.execute(
+                f"""SELECT id, date, recurrence FROM "{self.database_name}" WHERE recurrence != ? AND date <= ?""",
+                (EventRecurrence.NEVER.value, new_last)
+            )
+            statements = [
+                (self.get_occurrence_sql(), self.get_occurrence_rows(self.cursor.fetchall(), ranges)),
+                (
+                    f"""
+                    UPDATE "{self.database_name}_occurrence_window" 
+                    SET first_date = MIN(first_date, ?), last_date = MAX(last_date, ?)
+                    """, [(new_first, new_last)]
                 )
+            ]
+            self.run_statements(statements)
+            self.write_through(statements)
+
+    def write_through(self, statements: list[tuple[str, list[tuple]]]) -> None:
+        # The file gets the writes once they are committed to the mirror and in the same order, so the AUTOINCREMENT
+        # ids it hands out to replayed inserts are the ones the mirror did
+        if self.database_path != self.calendar_database_path:
+            ConnectionManager().call_on_commit(
+                self.database_path, partial(MirrorManager().write, self.calendar_database_path, statements)
             )
 
-        self.current_id = max(self.current_id, len(default_events))
-        return default_events
+    def archive_events(self, before: datetime.date, limit: int = Config.archive_batch_size) -> int:
+        # The events are picked in the transaction that moves them, one moved or made recurring meanwhile stays
+        with self.write():
+            self.cursor.execute(
+                f"""SELECT id FROM "{self.database_name}" WHERE recurrence = ? AND date < ? LIMIT ?""",
+                (EventRecurrence.NEVER.value, before.toordinal(), limit)
+            )
+            ids = self.cursor.fetchall()
 
-    def get_easter_events(self, year: int) -> list[CalendarEvent]:
-        easter = datetime.date(*calculate_easter(year))
-        easter_m = easter + datetime.timedelta(days=1)
-        tijelovo = easter + datetime.timedelta(days=60)
+            # Archived events keep their search entries, the delete trigger of the events table removes them
+            self.execute_statements([
+                (
+                    f"""
+                    INSERT INTO "{self.database_name}_archive" 
+                    SELECT id, date, time, description, color, recurrence, is_default, google_id, duration, modified_at, 
+                    uid
+                    FROM "{self.database_name}" WHERE id = ?
+                    """, ids
+                ),
+                (f"""DELETE FROM "{self.database_name}" WHERE id = ?""", ids),
+                (
+                    f"""
+                    INSERT INTO "{self.database_name}_search" (rowid, description)
+                    SELECT id, description FROM "{self.database_name}_archive" WHERE id = ?
+                    """, ids
+                )
+            ])
 
-        easter_events = [
-            CalendarEvent(
-                -1, easter, datetime.time(0, 0), "Uskrs", self.default_event_color, EventRecurrence.NEVER,
-                is_default=True
+        return len(ids)
+
+    def get_archive_end(self) -> Optional[int]:
+        return self.conn.execute(f"""SELECT MAX(date) FROM "{self.database_name}_archive" """).fetchone()[0]
+
+    def reaches_archive(self, start: datetime.date) -> bool:
+        archive_end = self.get_archive_end()
+        return archive_end is not None and start.toordinal() <= archive_end
+
+    def get_archive_delete_statements(self, ids: list[tuple]) -> list[tuple[str, list[tuple]]]:
+        return [
+            (
+                f"""
+                DELETE FROM "{self.database_name}_search" 
+                WHERE rowid IN (SELECT id FROM "{self.database_name}_archive" WHERE id = ?)
+                """, ids
             ),
-            CalendarEvent(
-                -2, easter_m, datetime.time(0, 0), "Uskršnji ponedjeljak", self.default_event_color,
-                EventRecurrence.NEVER, is_default=True
+            (f"""DELETE FROM "{self.database_name}_archive" WHERE id = ?""", ids)
+        ]
+
+    def get_unarchive_statements(self, ids: list[tuple]) -> list[tuple[str, list[tuple]]]:
+        if self.get_archive_end() is None:
+            return []
+
+        # The search entry is removed first, the insert trigger of the events table adds it again
+        # Rows archived before v6 can still have an empty Google id, which would collide in the unique index
+        return [
+            (
+                f"""
+                DELETE FROM "{self.database_name}_search" 
+                WHERE rowid IN (SELECT id FROM "{self.database_name}_archive" WHERE id = ?)
+                """, ids
             ),
-            CalendarEvent(
-                -3, tijelovo, datetime.time(0, 0), "Tijelovo", self.default_event_color, EventRecurrence.NEVER,
-                is_default=True
-            )
+            (
+                f"""
+                INSERT INTO "{self.database_name}" (id, date, time, description, color, recurrence, is_default, 
+                google_id, duration, modified_at, uid)
+                SELECT id, date, time, description, color, recurrence, is_default, NULLIF(google_id, ''), duration, 
+                modified_at, uid
+                FROM "{self.database_name}_archive" WHERE id = ?
+                """, ids
+            ),
+            (f"""DELETE FROM "{self.database_name}_archive" WHERE id = ?""", ids)
         ]
 
-        return easter_events
+    def get_events_for_date(self, date: datetime.date) -> list[CalendarEvent]:
+        return HolidayProvider().get_events_for_date(date) + [
+            record.to_event() for record in self.load_month_records(date.year, date.month)[date.day - 1]
+        ]
 
-    def get_catholic_events(self) -> list[CalendarEvent]:
-        settings = Settings().get_settings()
-        catholic_events = LanguageManager().get_string("catholic_event_list")
+    def get_events_for_month(self, year: int, month: int) -> list[list[CalendarEvent]]:
+        ret = [[] for _ in range(get_month_length(month, year))]
 
-        if not settings["show_catholic_events"]:
-            return []
+        for event in HolidayProvider().get_events_for_month(year, month):
+            ret[event.date.day - 1].append(event)
 
-        events = []
-        for i, event in enumerate(catholic_events):
-            if not event["date"]:
-                continue
-            month, day = event["date"].split("-")
-            date = datetime.date(datetime.datetime.now().year, int(month), int(day))
+        for i, records in enumerate(self.load_month_records(year, month)):
+            ret[i].extend(record.to_event() for record in records)
 
-            events.append(
-                CalendarEvent(
-                    -(i + 100), date, datetime.time(0, 0), event["description"],
-                    self.catholic_event_color, EventRecurrence.NEVER, is_default=True
-                )
+        return ret
+
+    def load_month_records(self, year: int, month: int) -> list[list[EventRecord]]:
+        month_records = MonthCache().get(self.database_name, year, month)
+        if month_records is not None:
+            return month_records
+
+        generation = MonthCache().get_generation(self.database_name)
+
+        first = datetime.date(year, month, 1).toordinal()
+        month_records = [[] for _ in range(get_month_length(month, year))]
+
+        for record in self.iter_database_records(
+                datetime.date(year, month, 1), datetime.date(year, month, get_month_length(month, year))
+        ):
+            month_records[record.date - first].append(record)
+
+        MonthCache().put(self.database_name, year, month, month_records, generation)
+
+        return month_records
+
+    def get_events_in_range(self, start: datetime.date, end: datetime.date) -> Iterator[CalendarEvent]:
+        return heapq.merge(
+            HolidayProvider().get_events_in_range(start, end), self.iter_database_events(start, end),
+            key=lambda ev: (ev.date, ev.time)
+        )
+
+    def iter_database_events(self, start: datetime.date, end: datetime.date) -> Iterator[CalendarEvent]:
+        return map(EventRecord.to_event, self.iter_database_records(start, end))
+
+    def iter_database_records(self, start: datetime.date, end: datetime.date) -> Iterator[EventRecord]:
+        if not self.has_occurrences(start, end):
+            return self.iter_expanded_records(start, end)
+
+        sql = f"""
+            SELECT e.id, o.date, e.time, e.description, e.color, e.recurrence, e.is_default, e.google_id, 
+            e.duration
+            FROM "{self.database_name}_occurrences" AS o
+            JOIN "{self.database_name}" AS e ON e.id = o.event_id
+            WHERE o.date BETWEEN ? AND ?
+            UNION ALL
+            SELECT id, date, time, description, color, recurrence, is_default, google_id, duration
+            FROM "{self.database_name}"
+            WHERE recurrence = ? AND date BETWEEN ? AND ?
+            """
+        params = (start.toordinal(), end.toordinal(), EventRecurrence.NEVER.value, start.toordinal(), end.toordinal())
+
+        # The archive only holds non recurring events from before the horizon
+        if self.reaches_archive(start):
+            sql += f"""
+                UNION ALL
+                SELECT id, date, time, description, color, recurrence, is_default, google_id, duration
+                FROM "{self.database_name}_archive"
+                WHERE date BETWEEN ? AND ?
+                """
+            params += (start.toordinal(), end.toordinal())
+
+        return map(self.create_record, self.conn.execute(sql + " ORDER BY date, time", params))
+
+    def iter_expanded_records(self, start: datetime.date, end: datetime.date) -> Iterator[EventRecord]:
+        cursor = self.conn.execute(
+            f"""
+            SELECT id, date, time, description, color, recurrence, is_default, google_id, duration
+            FROM "{self.database_name}"
+            WHERE recurrence > ? AND date <= ?
+            """,
+            (EventRecurrence.NEVER.value, end.toordinal())
+        )
+        recurring_records = list(map(self.create_record, cursor.fetchall()))
+
+        sql = f"""
+            SELECT id, date, time, description, color, recurrence, is_default, google_id, duration
+            FROM "{self.database_name}"
+            WHERE recurrence = ? AND date BETWEEN ? AND ?
+            """
+        params = (EventRecurrence.NEVER.value, start.toordinal(), end.toordinal())
+
+        if self.reaches_archive(start):
+            sql += f"""
+                UNION ALL
+                SELECT id, date, time, description, color, recurrence, is_default, google_id, duration
+                FROM "{self.database_name}_archive"
+                WHERE date BETWEEN ? AND ?
+                """
+            params += (start.toordinal(), end.toordinal())
+
+        cursor = self.conn.execute(sql + " ORDER BY date, time", params)
+
+        return heapq.merge(
+            map(self.create_record, cursor),
+            *(self.iter_record_occurrences(record, start, end) for record in recurring_records),
+            key=itemgetter(1, 2)
+        )
+
+    def iter_record_occurrences(self, record: EventRecord, start: datetime.date,
+                                end: datetime.date) -> Iterator[EventRecord]:
+        for date in self.iter_recurrence_dates(
+                EventRecurrence(record.recurrence), record.date, start.toordinal(), end.toordinal()
+        ):
+            yield record._replace(date=date)
+
+    def iter_occurrences(self, event: CalendarEvent, start: datetime.date, end: datetime.date) -> Iterator[CalendarEvent]:
+        if event.recurrence is EventRecurrence.NEVER:
+            if start <= event.date <= end:
+                yield event
+            return
+
+        for date in self.iter_recurrence_dates(
+                event.recurrence, event.date.toordinal(), start.toordinal(), end.toordinal()
+        ):
+            yield CalendarEvent(
+                event.id, datetime.date.fromordinal(date), event.time, event.description, event.color,
+                event.recurrence, event.is_default, event.google_id, event.duration
             )
 
-        return events
+    @staticmethod
+    def iter_recurrence_dates(recurrence: EventRecurrence, date: int, start: int, end: int) -> Iterator[int]:
+        return {
+            EventRecurrence.WEEKLY: iter_weekly_dates,
+            EventRecurrence.MONTHLY: iter_monthly_dates,
+            EventRecurrence.YEARLY: iter_yearly_dates
+        }[recurrence](date, start, end)
 
-    def get_upcoming_events(self, date: datetime.datetime, threaded: bool = False) -> list[CalendarEvent]:
-        if threaded:
-            conn = sqlite3.connect(self.calendar_database_path)
-            cursor = conn.cursor()
-        else:
-            conn = self.conn
-            cursor = self.cursor
+    def get_day_counts(self, year: int) -> array:
+        first = datetime.date(year, 1, 1).toordinal()
+        last = datetime.date(year, 12, 31).toordinal()
+
+        # Indexed by the day of the year, the last entry stays empty in non leap years
+        counts = array("H", bytes(2 * 366))
+
+        expanded = self.has_occurrences(datetime.date(year, 1, 1), datetime.date(year, 12, 31))
+
+        sql = f"""SELECT date FROM "{self.database_name}" WHERE recurrence = ? AND date BETWEEN ? AND ?"""
+        params = (EventRecurrence.NEVER.value, first, last)
+        if expanded:
+            sql += f""" UNION ALL SELECT date FROM "{self.database_name}_occurrences" WHERE date BETWEEN ? AND ?"""
+            params += (first, last)
+        if self.reaches_archive(datetime.date(year, 1, 1)):
+            sql += f""" UNION ALL SELECT date FROM "{self.database_name}_archive" WHERE date BETWEEN ? AND ?"""
+            params += (first, last)
+
+        for date, count in self.conn.execute(f"""SELECT date, COUNT(*) FROM ({sql}) GROUP BY date""", params):
+            counts[date - first] = min(count, 0xFFFF)
+
+        if not expanded:
+            for recurrence, date in self.conn.execute(
+                    f"""SELECT recurrence, date FROM "{self.database_name}" WHERE recurrence > ? AND date <= ?""",
+                    (EventRecurrence.NEVER.value, last)
+            ):
+                for d in self.iter_recurrence_dates(EventRecurrence(recurrence), date, first, last):
+                    counts[d - first] = min(counts[d - first] + 1, 0xFFFF)
+
+        for date, events in HolidayProvider().get_holiday_table(year).days.items():
+            counts[date.toordinal() - first] = min(counts[date.toordinal() - first] + len(events), 0xFFFF)
+
+        return counts
+
+    def get_max_duration(self) -> int:
+        return self.conn.execute(
+            f"""
+            SELECT MAX(IFNULL((SELECT MAX(duration) FROM "{self.database_name}"), 0), 
+            IFNULL((SELECT MAX(duration) FROM "{self.database_name}_archive"), 0))
+            """
+        ).fetchone()[0]
+
+    def get_interval_index(self, start: datetime.date, end: datetime.date) -> IntervalIndex[CalendarEvent]:
+        # Events from earlier days can still be running at the start of the range
+        start -= datetime.timedelta(days=-(-self.get_max_duration() // 86400))
+
+        key = (start, end, MonthCache().get_generation(self.database_name))
+        if self.interval_index is not None and self.interval_index[0] == key:
+            return self.interval_index[1]
+
+        intervals = []
+        for record in self.iter_database_records(start, end):
+            if not record.is_default:
+                timestamp = get_timestamp(record.date, record.time * 60)
+                intervals.append((timestamp, timestamp + record.duration * 60, record.to_event()))
+
+        index = IntervalIndex(intervals)
+        self.interval_index = (key, index)
+
+        return index
+
+    def get_overlapping_events(self, start: datetime.datetime, end: datetime.datetime,
+                               exclude_id: Optional[int] = None) -> list[CalendarEvent]:
+        return [
+            event for event in self.get_interval_index(start.date(), end.date()).get_overlapping(
+                get_timestamp(start.toordinal(), get_seconds(start.time())),
+                get_timestamp(end.toordinal(), get_seconds(end.time()))
+            ) if event.id != exclude_id
+        ]
+
+    def get_busy_intervals(self, start: datetime.datetime,
+                           end: datetime.datetime) -> list[tuple[datetime.datetime, datetime.datetime]]:
+        return [
+            (get_datetime(busy_start), get_datetime(busy_end))
+            for busy_start, busy_end in self.get_interval_index(start.date(), end.date()).get_busy(
+                get_timestamp(start.toordinal(), get_seconds(start.time())),
+                get_timestamp(end.toordinal(), get_seconds(end.time()))
+            )
+        ]
+
+    def get_free_intervals(self, start: datetime.datetime,
+                           end: datetime.datetime) -> list[tuple[datetime.datetime, datetime.datetime]]:
+        return [
+            (get_datetime(free_start), get_datetime(free_end))
+            for free_start, free_end in self.get_interval_index(start.date(), end.date()).get_free(
+                get_timestamp(start.toordinal(), get_seconds(start.time())),
+                get_timestamp(end.toordinal(), get_seconds(end.time()))
+            )
+        ]
 
-        with conn:
-            cursor.execute(
+    def get_event_count(self) -> int:
+        return self.conn.execute(
+            f"""
+            SELECT (SELECT COUNT(*) FROM "{self.database_name}") + 
+            (SELECT COUNT(*) FROM "{self.database_name}_archive")
+            """
+        ).fetchone()[0]
+
+    def iter_all_events(self) -> Iterator[CalendarEvent]:
+        # The rows are read from the cursor as they are consumed instead of being fetched at once
+        cursor = self.conn.execute(
+            f"""
+            SELECT id, date, time, description, color, recurrence, is_default, google_id, duration
+            FROM "{self.database_name}"
+            UNION ALL
+            SELECT id, date, time, description, color, recurrence, is_default, google_id, duration
+            FROM "{self.database_name}_archive"
+            ORDER BY id
+            """
+        )
+        return map(self.create_event, cursor)
+
+    def get_upcoming_events(self, date: datetime.datetime) -> list[CalendarEvent]:
+        return list(self.iter_upcoming(date))
+
+    def iter_upcoming(self, after: datetime.datetime, limit: int = None) -> Iterator[CalendarEvent]:
+        # Only the hot table is read, archived events are older than the horizon
+        after_date = after.date().toordinal()
+        after_start = get_timestamp(after_date, get_seconds(after.time()))
+
+        recurring_records = []
+        for row in self.conn.execute(
                 f"""
-                SELECT id, year, month, day, hour, minute, second, description, color, recurrence, is_default, google_id
+                SELECT id, date, time, description, color, recurrence, is_default, google_id, duration
                 FROM "{self.database_name}"
-                WHERE recurrence != ? OR year > ? OR (year = ? AND month > ?) OR (year = ? AND month = ? AND day >= ?)
+                WHERE recurrence > ?
                 """,
-                (pickle.dumps(EventRecurrence.NEVER), date.year, date.year, date.month, date.year, date.month, date.day)
-            )
+                (EventRecurrence.NEVER.value, )
+        ):
+            record = self.create_record(row)
+            for date in self.iter_recurrence_dates(
+                    EventRecurrence(record.recurrence), record.date, after_date, datetime.date.max.toordinal()
+            ):
+                start = get_timestamp(date, row[2])
+                if start > after_start:
+                    recurring_records.append((start, record))
+                    break
+        recurring_records.sort(key=itemgetter(0))
 
-            events = list(
-                map(
-                    lambda t: CalendarEvent(
-                        t[0], datetime.date(t[1], t[2], t[3]), datetime.time(t[4], t[5], t[6]), t[7],
-                        get_rgb_color(t[8]),
-                        pickle.loads(t[9]), t[10], t[11]
-                    ),
-                    cursor.fetchall()
-                )
-            )
-            events = list(
-                filter(
-                    lambda e: e.date != date.date() or (e.time.hour > date.hour or (e.time.hour <= date.hour and e.time.minute > date.minute)),
-                    events
-                )
-            )
+        cursor = self.conn.execute(
+            f"""
+            SELECT start, id, date, time, description, color, recurrence, is_default, google_id, duration
+            FROM "{self.database_name}"
+            WHERE recurrence = ? AND start > ?
+            ORDER BY start
+            """,
+            (EventRecurrence.NEVER.value, after_start)
+        )
 
-        return events
+        # Recurring events are ordered by their next occurrence, but stay as stored so they can be written back
+        records = heapq.merge(
+            ((row[0], self.create_record(row[1:])) for row in cursor), recurring_records, key=itemgetter(0)
+        )
 
-    def remove_event(self, event: CalendarEvent, threaded: bool = False) -> None:
-        if threaded:
-            conn = sqlite3.connect(self.calendar_database_path)
-            cursor = conn.cursor()
-        else:
-            conn = self.conn
-            cursor = self.cursor
-
-        with conn:
-            cursor.execute(f"""DELETE from "{self.database_name}" WHERE id = :id""", {"id": event.id})
-            # self.cursor.execute(f"""DELETE from {self.database_name}
-            #                     WHERE year = :year AND month = :month AND day = :day AND hour = :hour AND
-            #                     minute = :minute AND description = :description AND color = :color AND
-            #                     recurring = :recurring AND recurrence_id = :recurrence_id""",
-            #                     {"year": event.date.year, "month": event.date.month, "day": event.date.day,
-            #                      "hour": event.time.hour,
-            #                      "minute": event.time.minute, "description": event.description,
-            #                      "color": get_hex_color(event.color), "recurring": pickle.dumps(event.recurrence),
-            #                      "recurrence_id": event.recurrence_id})
+        for _, record in islice(records, limit):
+            yield record.to_event()
+
+    def remove_event(self, event: CalendarEvent) -> None:
+        self.remove_events([event])
+
+    def remove_events(self, events: list[CalendarEvent]) -> None:
+        if not events:
+            return
+
+        ids = [(event.id, ) for event in events]
+
+        self.execute_statements([
+            (f"""DELETE from "{self.database_name}" WHERE id = ?""", ids),
+            *self.get_archive_delete_statements(ids)
+        ])
+
+        for event in events:
+            self.invalidate_event(event)
 
     def update_event(self, event: CalendarEvent, updated_event: CalendarEvent = None, d: datetime.date = None,
                      t: datetime.time = None, description: str = None, color: Color = None,
                      recurrence: EventRecurrence = None, google_id: str = None,
-                     threaded: bool = False) -> None:
+                     duration: datetime.timedelta = None) -> None:
         new_event = updated_event or CalendarEvent(
             event.id, d or event.date, t or event.time, description or event.description, color or event.color,
-            recurrence or event.recurrence, google_id=google_id or event.google_id
+            recurrence or event.recurrence, google_id=google_id or event.google_id,
+            duration=event.duration if duration is None else duration
         )
 
-        if threaded:
-            conn = sqlite3.connect(self.calendar_database_path)
-            cursor = conn.cursor()
-        else:
-            conn = self.conn
-            cursor = self.cursor
+        self.update_events([(event, new_event)])
+
+    def update_events(self, events: list[tuple[CalendarEvent, CalendarEvent]]) -> None:
+        if not events:
+            return
 
-        with conn:
-            cursor.execute(
+        sql = f"""
+            UPDATE "{self.database_name}" SET date = ?, time = ?, description = ?, color = ?, recurrence = ?, 
+            google_id = ?, duration = ?, modified_at = ? WHERE id = ?
+            """
+        modified_at = int(time.time())
+        rows = [(new_event.date.toordinal(), get_seconds(new_event.time), new_event.description,
+                 get_hex_color(new_event.color), new_event.recurrence.value, new_event.google_id or None,
+                 int(new_event.duration.total_seconds()), modified_at, event.id)
+                for event, new_event in events]
+
+        # The window is read in the transaction, an extension running in the background could grow it meanwhile
+        with self.write():
+            occurrence_rows = self.get_occurrence_rows(
+                [(event.id, new_event.date.toordinal(), new_event.recurrence.value) for event, new_event in events],
+                [self.get_occurrence_window()]
+            )
+
+            # Archived events are brought back first, the archiver moves them again if they are still old
+            statements = [
+                *self.get_unarchive_statements([(event.id, ) for event, _ in events]), (sql, rows),
+                (self.get_occurrence_sql(), occurrence_rows)
+            ]
+            self.run_statements(statements)
+            self.write_through(statements)
+
+        for event, new_event in events:
+            self.invalidate_event(event)
+            self.invalidate_event(new_event)
+
+    def upsert_google_events(self, events: list[CalendarEvent]) -> int:
+        if not events:
+            return 0
+
+        modified_at = int(time.time())
+        rows = [(event.date.toordinal(), get_seconds(event.time), event.description, get_hex_color(event.color),
+                 event.recurrence.value, int(event.duration.total_seconds()), modified_at, event.google_id)
+                for event in events if event.google_id]
+
+        seq = self.get_change_seq()
+
+        # Unchanged events aren't written, so they don't count as changes or touch the search index
+        changes = self.execute_statements([(
+            f"""
+            INSERT INTO "{self.database_name}" (date, time, description, color, recurrence, duration, modified_at,
+            is_default, google_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, 0, ?)
+            ON CONFLICT (google_id) WHERE google_id IS NOT NULL DO UPDATE SET
+                date = excluded.date, time = excluded.time, description = excluded.description,
+                color = excluded.color, recurrence = excluded.recurrence, duration = excluded.duration,
+                modified_at = excluded.modified_at
+            WHERE date != excluded.date OR time != excluded.time OR description IS NOT excluded.description
+                OR color != excluded.color OR recurrence != excluded.recurrence OR duration != excluded.duration
+            """, rows
+        )])
+
+        # Recurring events that were inserted or moved have lost their occurrences
+        recurring_ids = [row[-1] for row in rows if row[4] != EventRecurrence.NEVER.value]
+        if changes and recurring_ids:
+            self.cursor.execute(
                 f"""
-                UPDATE "{self.database_name}" SET year = ?, month = ?, day = ?, hour = ?, minute = ?, description = ?, 
-                color = ?, recurrence = ?, google_id = ? WHERE id = ?
+                SELECT id, date, recurrence FROM "{self.database_name}"
+                WHERE google_id IN (SELECT value FROM json_each(?))
+                AND id NOT IN (SELECT event_id FROM "{self.database_name}_occurrences")
                 """,
-                (new_event.date.year, new_event.date.month, new_event.date.day, new_event.time.hour,
-                 new_event.time.minute, new_event.description, get_hex_color(new_event.color),
-                 pickle.dumps(new_event.recurrence), new_event.google_id, event.id)
+                (json.dumps(recurring_ids), )
             )
+            self.execute_statements([(
+                self.get_occurrence_sql(),
+                self.get_occurrence_rows(self.cursor.fetchall(), [self.get_occurrence_window()])
+            )])
 
-    def search_events(self, query: str) -> list[CalendarEvent]:
-        with self.conn:
+        if changes:
+            self.invalidate_changes(seq)
+
+        return changes
+
+    def remove_missing_google_events(self, after: datetime.datetime, google_ids: list[str]) -> int:
+        seq = self.get_change_seq()
+
+        # Covers the same events as iter_upcoming, recurring events are upcoming until they are removed
+        changes = self.execute_statements([(
+            f"""
+            DELETE FROM "{self.database_name}"
+            WHERE google_id IS NOT NULL AND (recurrence != ? OR start > ?)
+            AND google_id NOT IN (SELECT value FROM json_each(?))
+            """,
+            [(EventRecurrence.NEVER.value, get_timestamp(after.toordinal(), get_seconds(after.time())),
+              json.dumps(google_ids))]
+        )])
+
+        if changes:
+            self.invalidate_changes(seq)
+
+        return changes
+
+    def claim_google_ids(self, events: list[tuple[CalendarEvent, str]]) -> list[str]:
+        if not events:
+            return []
+
+        seq = self.get_change_seq()
+
+        # The ids were created by uploading these events, so another row with one is a copy a concurrent sync fetched
+        # A sync that linked the event first keeps its id, the unclaimed one is returned to be deleted in Google
+        statements = [
+            (f"""DELETE FROM "{self.database_name}" WHERE google_id = ? AND id != ?""",
+             [(google_id, event.id) for event, google_id in events]),
+            (
+                f"""
+                UPDATE "{self.database_name}" SET google_id = ?, modified_at = ? WHERE id = ? AND google_id IS NULL
+                """,
+                [(google_id, int(time.time()), event.id) for event, google_id in events]
+            )
+        ]
+        with self.write():
+            self.run_statements(statements)
             self.cursor.execute(
                 f"""
-                SELECT id, year, month, day, hour, minute, second, description, color, recurrence, is_default, google_id
-                FROM "{self.database_name}"
-                WHERE description LIKE ?
+                SELECT google_id FROM "{self.database_name}" 
+                WHERE (id, google_id) IN (
+                    SELECT json_extract(value, '$[0]'), json_extract(value, '$[1]') FROM json_each(?)
+                )
                 """,
-                (f"%{query}%",)
+                (json.dumps([(event.id, google_id) for event, google_id in events]), )
             )
+            claimed = {row[0] for row in self.cursor.fetchall()}
+            self.write_through(statements)
+
+        self.invalidate_changes(seq)
+
+        return [google_id for _, google_id in events if google_id not in claimed]
+
+    def import_events(self, events: list[tuple[CalendarEvent, Optional[str]]]) -> int:
+        if not events:
+            return 0
+
+        modified_at = int(time.time())
+        rows = [(event.date.toordinal(), get_seconds(event.time), event.description, get_hex_color(event.color),
+                 event.recurrence.value, int(event.duration.total_seconds()), modified_at, uid)
+                for event, uid in events]
 
-            default_events = list(
-                filter(lambda ev: query.lower() in ev.description.lower(), self.get_default_events())
+        seq = self.get_change_seq()
+
+        with self.write():
+            # Events of an earlier import that were archived meanwhile are brought back and updated in place
+            self.cursor.execute(
+                f"""
+                SELECT id FROM "{self.database_name}_archive" WHERE uid IN (SELECT value FROM json_each(?))
+                """,
+                (json.dumps([uid for _, uid in events if uid is not None]), )
+            )
+            statements = self.get_unarchive_statements(self.cursor.fetchall())
+            self.run_statements(statements)
+
+            # Events without a UID are always added, unchanged ones aren't written again
+            statements.append((
+                f"""
+                INSERT INTO "{self.database_name}" (date, time, description, color, recurrence, duration, modified_at,
+                uid, is_default)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)
+                ON CONFLICT (uid) WHERE uid IS NOT NULL DO UPDATE SET
+                    date = excluded.date, time = excluded.time, description = excluded.description,
+                    color = excluded.color, recurrence = excluded.recurrence, duration = excluded.duration,
+                    modified_at = excluded.modified_at
+                WHERE date != excluded.date OR time != excluded.time OR description IS NOT excluded.description
+                    OR color != excluded.color OR recurrence != excluded.recurrence OR duration != excluded.duration
+                """, rows
+            ))
+            changes = self.run_statements(statements[-1:])
+
+            # Recurring events that were inserted or moved have lost their occurrences
+            self.cursor.execute(
+                f"""
+                SELECT id, date, recurrence FROM "{self.database_name}"
+                WHERE recurrence > ? AND modified_at = ?
+                AND id NOT IN (SELECT event_id FROM "{self.database_name}_occurrences")
+                """,
+                (EventRecurrence.NEVER.value, modified_at)
+            )
+            statements.append((
+                self.get_occurrence_sql(),
+                self.get_occurrence_rows(self.cursor.fetchall(), [self.get_occurrence_window()])
+            ))
+            self.run_statements(statements[-1:])
+            self.write_through(statements)
+
+        if changes:
+            self.invalidate_changes(seq)
+
+        return changes
+
+    def get_change_seq(self) -> int:
+        row = self.conn.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = ?", (f"{self.database_name}_changes", )
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_changes(self, since: int) -> Optional[list[EventChange]]:
+        changes = [
+            EventChange(*row) for row in self.conn.execute(
+                f"""
+                SELECT seq, event_id, operation, date, recurrence, old_date, old_recurrence, changed_at
+                FROM "{self.database_name}_changes" WHERE seq > ? ORDER BY seq
+                """,
+                (since, )
             )
+        ]
+
+        # Compacted changes can't be replayed, the consumer has to reload everything instead
+        first = changes[0].seq if changes else self.get_change_seq() + 1
+        if first > since + 1:
+            return None
+
+        return changes
+
+    def get_changed_events(self, since: int) -> Optional[tuple[int, list[CalendarEvent], list[EventTombstone]]]:
+        changes = self.get_changes(since)
+        if changes is None:
+            return None
+
+        seq = changes[-1].seq if changes else since
+        ids = json.dumps(list({change.event_id for change in changes}))
 
-            easter_events = list(
-                filter(lambda ev: query.lower() in ev.description.lower(),
-                       self.get_easter_events(datetime.datetime.now().year))
+        # Events changed more than once are returned once, as they are now
+        cursor = self.conn.execute(
+            f"""
+            SELECT id, date, time, description, color, recurrence, is_default, google_id, duration
+            FROM "{self.database_name}" WHERE id IN (SELECT value FROM json_each(?))
+            UNION ALL
+            SELECT id, date, time, description, color, recurrence, is_default, google_id, duration
+            FROM "{self.database_name}_archive" WHERE id IN (SELECT value FROM json_each(?))
+            ORDER BY id
+            """,
+            (ids, ids)
+        )
+        events = list(map(self.create_event, cursor))
+
+        tombstones = [
+            EventTombstone(*row) for row in self.conn.execute(
+                f"""
+                SELECT id, google_id, date, recurrence, deleted_at, seq FROM "{self.database_name}_tombstones"
+                WHERE seq > ? AND seq <= ? ORDER BY seq
+                """,
+                (since, seq)
             )
-            catholic_events = list(
-                filter(lambda ev: query.lower() in ev.description.lower(), self.get_catholic_events())
+        ]
+
+        return seq, events, tombstones
+
+    def compact_changes(self, before: datetime.datetime) -> int:
+        # The journal keeps a contiguous tail, so a seq that is still in it can always be replayed
+        cursor = self.conn.execute(
+            f"""SELECT MAX(seq) FROM "{self.database_name}_changes" WHERE changed_at < ?""",
+            (int(before.timestamp()), )
+        )
+        seq = cursor.fetchone()[0]
+        if seq is None:
+            return 0
+
+        return self.execute_statements([
+            (f"""DELETE FROM "{self.database_name}_changes" WHERE seq <= ?""", [(seq, )]),
+            (f"""DELETE FROM "{self.database_name}_tombstones" WHERE seq <= ?""", [(seq, )])
+        ])
+
+    def search_events(self, query: str, limit: int = Config.search_result_limit) -> list[CalendarEvent]:
+        # Every word is matched as a prefix, so results update while the user is still typing it
+        match = " ".join('"' + word.replace('"', '""') + '"*' for word in query.split())
+        if not match:
+            return []
+
+        today = datetime.date.today()
+        holiday_events = HolidayProvider().get_events_for_year(today.year)
+        self.index_holidays(holiday_events, today.year)
+
+        with self.conn:
+            self.cursor.execute(
+                f"""
+                SELECT search.rowid, e.id, e.date, e.time, e.description, e.color, e.recurrence, e.is_default, 
+                e.google_id, e.duration
+                FROM "{self.database_name}_search" AS search
+                LEFT JOIN "{self.database_name}" AS e ON e.id = search.rowid
+                WHERE "{self.database_name}_search" MATCH ?
+                ORDER BY rank
+                LIMIT ?
+                """,
+                (match, limit)
             )
 
-            return default_events + easter_events + catholic_events + list(
-                map(
-                    lambda t: CalendarEvent(
-                        t[0], datetime.date(t[1], t[2], t[3]), datetime.time(t[4], t[5], t[6]), t[7],
-                        get_rgb_color(t[8]),
-                        pickle.loads(t[9]), t[10], t[11]
-                    ),
-                    self.cursor.fetchall()
+            rows = self.cursor.fetchall()
+
+            # Matches that aren't in the events table were archived
+            archived_ids = [row[0] for row in rows if row[0] > 0 and row[1] is None]
+            archived = {}
+            if archived_ids:
+                self.cursor.execute(
+                    f"""
+                    SELECT id, date, time, description, color, recurrence, is_default, google_id, duration
+                    FROM "{self.database_name}_archive"
+                    WHERE id IN ({", ".join("?" * len(archived_ids))})
+                    """,
+                    archived_ids
                 )
+                archived = {row[0]: row for row in self.cursor.fetchall()}
+
+            events = []
+            for row in rows:
+                # Holidays are indexed under negative rowids
+                if row[0] < 0:
+                    events.append(holiday_events[-row[0] - 1])
+                    continue
+
+                if row[1] is None:
+                    if row[0] not in archived:
+                        continue
+                    row = (row[0], *archived[row[0]])
+
+                event = self.create_event(row[1:])
+                # Recurring events are shown at their next occurrence instead of the date they were created on
+                if event.recurrence is not EventRecurrence.NEVER:
+                    event = next(self.iter_occurrences(event, today, datetime.date.max), event)
+                events.append(event)
+
+        return events
+
+    def index_holidays(self, holiday_events: list[CalendarEvent], year: int) -> None:
+        key = (LanguageManager().language, Settings().get_settings()["show_catholic_events"], year)
+        if key == self.indexed_holidays:
+            return
+
+        with self.write():
+            self.cursor.execute(f"""DELETE FROM "{self.database_name}_search" WHERE rowid < 0""")
+            self.cursor.executemany(
+                f"""INSERT INTO "{self.database_name}_search" (rowid, description) VALUES (?, ?)""",
+                [(-(i + 1), event.description) for i, event in enumerate(holiday_events)]
             )
 
+        self.indexed_holidays = key
+
+    def invalidate_changes(self, since: int) -> None:
+        changes = self.get_changes(since)
+        if changes is None:
+            MonthCache().invalidate_database(self.database_name)
+            return
+
+        months = set()
+        for change in changes:
+            for date, recurrence in ((change.date, change.recurrence), (change.old_date, change.old_recurrence)):
+                if date is None:
+                    continue
+                if recurrence != EventRecurrence.NEVER.value:
+                    MonthCache().invalidate_database(self.database_name)
+                    return
+
+                date = datetime.date.fromordinal(date)
+                months.add((date.year, date.month))
+
+        for year, month in months:
+            MonthCache().invalidate(self.database_name, year, month)
+
+    def invalidate_event(self, event: CalendarEvent) -> None:
+        if event.recurrence is EventRecurrence.NEVER:
+            MonthCache().invalidate(self.database_name, event.date.year, event.date.month)
+        else:
+            MonthCache().invalidate_database(self.database_name)
+
+    def create_event(self, row: tuple) -> CalendarEvent:
+        return self.create_record(row).to_event()
+
+    @staticmethod
+    def create_record(row: tuple) -> EventRecord:
+        id_, date, seconds, description, color, recurrence, is_default, google_id, duration = row
+        return EventRecord(
+            id_, date, seconds // 60, description, get_packed_color(color), recurrence, is_default, google_id,
+            duration // 60
+        )
+
     def compare_events(self, event1: CalendarEvent, event2: CalendarEvent) -> bool:
         return (
                 event1.description == event2.description and event1.date == event2.date and
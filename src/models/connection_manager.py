@@ -0,0 +1,248 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from threading import Condition, Lock
+from typing import Callable, Iterator, Optional
+
+from src.main.config import Config
+from src.models.query_profiler import QueryProfiler, ProfiledConnection
+from src.utils.singleton import Singleton
+
+
+@dataclass
+class PooledConnection:
+
+    conn: sqlite3.Connection
+    cursor: sqlite3.Cursor
+    thread: threading.Thread
+    last_used: float
+
+
+@dataclass
+class WriterConnection:
+
+    conn: sqlite3.Connection
+    cursor: sqlite3.Cursor
+    lock: Lock = field(default_factory=Lock)
+    owner: Optional[int] = None
+    on_commit: list[Callable[[], None]] = field(default_factory=list)
+
+
+class ConnectionManager(metaclass=Singleton):
+
+    def __init__(self, pool_size: int = Config.connection_pool_size) -> None:
+        self.pool_size = pool_size
+
+        self.connections: OrderedDict[tuple[int, str, bool], PooledConnection] = OrderedDict()
+        self.writers: dict[str, WriterConnection] = {}
+        self.profiles: dict[str, str] = {}
+        self.condition = Condition()
+
+        self.hits = 0
+        self.opened = 0
+        self.closed = 0
+        self.waits = 0
+
+    def get_connection(self, database_path: str) -> sqlite3.Connection:
+        return self.get_pooled_connection(database_path).conn
+
+    def get_cursor(self, database_path: str) -> sqlite3.Cursor:
+        return self.get_pooled_connection(database_path).cursor
+
+    def get_reader(self, database_path: str) -> sqlite3.Connection:
+        return self.get_pooled_connection(database_path, read_only=True).conn
+
+    def get_reader_cursor(self, database_path: str) -> sqlite3.Cursor:
+        return self.get_pooled_connection(database_path, read_only=True).cursor
+
+    @staticmethod
+    def get_read_only_path(database_path: str) -> str:
+        if database_path.startswith("file:"):
+            return database_path + ("&" if "?" in database_path else "?") + "mode=ro"
+        return f"file:{database_path}?mode=ro"
+
+    def get_pooled_connection(self, database_path: str, read_only: bool = False) -> PooledConnection:
+        key = (threading.get_ident(), database_path, read_only)
+
+        with self.condition:
+            connection = self.connections.get(key)
+            if connection is not None:
+                self.hits += 1
+                connection.last_used = time.time()
+                self.connections.move_to_end(key)
+                return connection
+
+            self.close_unused_connections()
+
+            # The UI thread never waits for workers, the others give up instead of hanging when nothing is released
+            deadline = time.time() + Config.connection_wait_timeout
+            while threading.current_thread() is not threading.main_thread() and self.is_pool_full():
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise TimeoutError(
+                        f"No SQLite connection was released within {Config.connection_wait_timeout} s, "
+                        f"{len(self.connections)} are open"
+                    )
+
+                # Threads release their connections when they finish, dead threads are checked periodically
+                self.waits += 1
+                self.condition.wait(min(remaining, 0.1))
+                self.close_unused_connections()
+
+            if read_only:
+                # Readers never begin a transaction, so a failed statement can't leave them on an old snapshot
+                conn = self.connect(self.get_read_only_path(database_path), isolation_level=None)
+            else:
+                conn = self.connect(database_path)
+            self.apply_profile(conn, self.profiles.get(database_path, Config.sqlite_profile), read_only)
+            connection = PooledConnection(conn, conn.cursor(), threading.current_thread(), time.time())
+            self.connections[key] = connection
+            self.opened += 1
+
+            return connection
+
+    @staticmethod
+    def connect(database_path: str, **kwargs) -> sqlite3.Connection:
+        # Connections are closed on shutdown from the main thread, so they can't be bound to their thread
+        return sqlite3.connect(
+            database_path, check_same_thread=False, uri=database_path.startswith("file:"),
+            factory=ProfiledConnection if QueryProfiler().enabled else sqlite3.Connection, **kwargs
+        )
+
+    def get_writer(self, database_path: str) -> WriterConnection:
+        with self.condition:
+            writer = self.writers.get(database_path)
+            if writer is None:
+                conn = self.connect(database_path)
+                self.apply_profile(conn, self.profiles.get(database_path, Config.sqlite_profile))
+                writer = self.writers[database_path] = WriterConnection(conn, conn.cursor())
+                self.opened += 1
+
+            return writer
+
+    def get_active_writer(self, database_path: str) -> Optional[WriterConnection]:
+        writer = self.writers.get(database_path)
+        if writer is not None and writer.owner == threading.get_ident():
+            return writer
+        return None
+
+    @contextmanager
+    def write(self, database_path: str) -> Iterator[sqlite3.Cursor]:
+        writer = self.get_writer(database_path)
+
+        # A write started inside another one joins its transaction
+        if writer.owner == threading.get_ident():
+            yield writer.cursor
+            return
+
+        # Writers of every thread queue here instead of failing on the file lock, readers in WAL mode don't wait
+        with writer.lock:
+            writer.owner = threading.get_ident()
+            try:
+                writer.cursor.execute("BEGIN IMMEDIATE")
+                try:
+                    yield writer.cursor
+                except BaseException:
+                    writer.conn.rollback()
+                    raise
+                writer.conn.commit()
+
+                # Still under the lock, so the callbacks of different writes run in the order they were committed
+                for callback in writer.on_commit:
+                    callback()
+            finally:
+                writer.on_commit.clear()
+                writer.owner = None
+
+    def call_on_commit(self, database_path: str, callback: Callable[[], None]) -> None:
+        writer = self.get_active_writer(database_path)
+        if writer is None:
+            callback()
+        else:
+            writer.on_commit.append(callback)
+
+    def set_profile(self, database_path: str, profile: str) -> None:
+        if profile not in Config.sqlite_profiles:
+            raise ValueError(f"Unknown SQLite profile: {profile}")
+
+        # Applied to the connections opened from now on, the open ones keep their settings until they are closed
+        with self.condition:
+            self.profiles[database_path] = profile
+
+    @staticmethod
+    def apply_profile(conn: sqlite3.Connection, profile: str, read_only: bool = False) -> None:
+        for pragma, value in Config.sqlite_profiles[profile].items():
+            # The journal mode is stored in the file, a reader can open it before the writer switched it to WAL
+            if read_only and pragma == "journal_mode":
+                continue
+            conn.execute(f"PRAGMA {pragma} = {value}")
+
+    def is_pool_full(self) -> bool:
+        # Connections of the UI thread aren't counted, they are kept open for as long as the app runs
+        main_thread = threading.main_thread().ident
+        return sum(key[0] != main_thread for key in self.connections) >= self.pool_size
+
+    def close_unused_connections(self) -> None:
+        for key, connection in list(self.connections.items()):
+            if not connection.thread.is_alive():
+                self.close_connection(key)
+
+        if threading.current_thread() is threading.main_thread():
+            return
+
+        # Idle connections of the calling thread to other databases are the only live ones that are safe to close
+        for key, connection in list(self.connections.items()):
+            if not self.is_pool_full():
+                break
+            if key[0] == threading.get_ident() and not connection.conn.in_transaction:
+                self.close_connection(key)
+
+    def close_connection(self, key: tuple[int, str, bool]) -> None:
+        connection = self.connections.pop(key)
+        connection.conn.close()
+        self.closed += 1
+        self.condition.notify_all()
+
+    def close_thread_connections(self) -> None:
+        with self.condition:
+            for key in [key for key in self.connections if key[0] == threading.get_ident()]:
+                self.close_connection(key)
+
+    def close_database_connections(self, database_path: str) -> None:
+        with self.condition:
+            for key, connection in list(self.connections.items()):
+                # Threads that are still reading the database close their connections when they finish
+                if key[1] != database_path or (
+                        connection.thread.is_alive() and connection.thread is not threading.current_thread()
+                ):
+                    continue
+                self.close_connection(key)
+
+    def close_all(self) -> None:
+        with self.condition:
+            for key, connection in list(self.connections.items()):
+                # Threads that are still working (e.g. the sync started on exit) close their own connections
+                if connection.thread.is_alive() and connection.thread is not threading.current_thread():
+                    continue
+                self.close_connection(key)
+
+            for database_path, writer in list(self.writers.items()):
+                # A writer that is in use is closed by the next call once its transaction ends
+                if not writer.lock.acquire(blocking=False):
+                    continue
+                try:
+                    writer.conn.close()
+                    self.writers.pop(database_path)
+                    self.closed += 1
+                finally:
+                    writer.lock.release()
+
+    def get_stats(self) -> dict[str, int]:
+        with self.condition:
+            return {
+                "open": len(self.connections), "writers": len(self.writers), "opened": self.opened,
+                "closed": self.closed, "hits": self.hits, "waits": self.waits
+            }
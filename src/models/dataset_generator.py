@@ -0,0 +1,95 @@
+import datetime
+import random
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Optional
+
+from src.main.config import Config
+from src.models.calendar_model import CalendarModel, CalendarEvent, EventRecurrence
+from src.ui.colors import Colors
+
+
+@dataclass
+class DatasetSpec:
+    events: int = 10000
+    seed: int = 0
+    # Share of the events that repeat, the rest never do
+    recurrence_mix: dict[EventRecurrence, float] = field(default_factory=lambda: {
+        EventRecurrence.WEEKLY: 0.02,
+        EventRecurrence.MONTHLY: 0.01,
+        EventRecurrence.YEARLY: 0.01
+    })
+    description_length: tuple[int, int] = (8, 60)
+    # Events are spread over this many days before and after the center date
+    days: int = 3 * 365
+    center: Optional[datetime.date] = None
+
+
+class DatasetGenerator:
+
+    WORDS = [
+        "meeting", "lunch", "call", "review", "dentist", "birthday", "gym", "project", "deadline", "trip",
+        "dinner", "school", "exam", "doctor", "party", "team", "standup", "planning", "concert", "payment",
+        "training", "family", "weekend", "report", "interview", "flight", "hotel", "coffee", "workshop", "release"
+    ]
+    COLORS = [
+        Colors.EVENT_GREEN204, Colors.EVENT_BLUE204, Colors.EVENT_PURPLE204, Colors.EVENT_PINK204,
+        Colors.EVENT_RED204, Colors.EVENT_ORANGE, Colors.EVENT_YELLOW204
+    ]
+    DURATIONS = [15, 30, 30, 60, 60, 60, 90, 120, 240, 24 * 60]
+
+    def __init__(self, spec: DatasetSpec) -> None:
+        self.spec = spec
+        self.center = spec.center or datetime.date.today()
+
+    def iter_events(self) -> Iterator[CalendarEvent]:
+        # The same spec always produces the same events
+        rng = random.Random(self.spec.seed)
+
+        recurrences = list(self.spec.recurrence_mix)
+        weights = list(self.spec.recurrence_mix.values())
+        recurrences.append(EventRecurrence.NEVER)
+        weights.append(max(1 - sum(weights), 0))
+
+        first = self.center.toordinal() - self.spec.days
+        for _ in range(self.spec.events):
+            yield CalendarEvent(
+                0,
+                datetime.date.fromordinal(first + rng.randrange(2 * self.spec.days + 1)),
+                datetime.time(rng.randrange(6, 22), rng.choice((0, 15, 30, 45))),
+                self.create_description(rng),
+                rng.choice(self.COLORS),
+                rng.choices(recurrences, weights)[0],
+                duration=datetime.timedelta(minutes=rng.choice(self.DURATIONS))
+            )
+
+    def create_description(self, rng: random.Random) -> str:
+        length = rng.randint(*self.spec.description_length)
+
+        words = []
+        size = -1
+        while size < length:
+            words.append(rng.choice(self.WORDS))
+            size += len(words[-1]) + 1
+
+        return " ".join(words)[:length].rstrip().capitalize()
+
+    def generate(self, database_name: str, progress: Callable[[int], None] = None) -> CalendarModel:
+        model = CalendarModel(database_name=database_name)
+
+        generated = 0
+        batch = []
+        for event in self.iter_events():
+            batch.append(event)
+            if len(batch) >= Config.import_batch_size:
+                model.add_events(batch)
+                generated += len(batch)
+                batch = []
+                if progress is not None:
+                    progress(generated)
+
+        if batch:
+            model.add_events(batch)
+            if progress is not None:
+                progress(generated + len(batch))
+
+        return model
@@ -0,0 +1,78 @@
+from array import array
+from operator import itemgetter
+from typing import Generic, Iterable, TypeVar
+
+T = TypeVar("T")
+
+
+class IntervalIndex(Generic[T]):
+
+    def __init__(self, intervals: Iterable[tuple[int, int, T]]) -> None:
+        intervals = sorted(intervals, key=itemgetter(0))
+
+        self.starts = array("q", (start for start, _, _ in intervals))
+        # Intervals without a length still take up their start
+        self.ends = array("q", (max(end, start + 1) for start, end, _ in intervals))
+        self.items = [item for _, _, item in intervals]
+
+        # The sorted intervals form an implicit balanced tree, every middle element keeps the latest end below it
+        self.max_ends = array("q", self.ends)
+        self.build(0, len(self.items))
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def build(self, lo: int, hi: int) -> int:
+        if lo >= hi:
+            return -2 ** 63
+
+        mid = (lo + hi) // 2
+        self.max_ends[mid] = max(self.ends[mid], self.build(lo, mid), self.build(mid + 1, hi))
+        return self.max_ends[mid]
+
+    def get_overlapping_indices(self, start: int, end: int) -> list[int]:
+        indices = []
+
+        stack = [(0, len(self.items))]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+
+            mid = (lo + hi) // 2
+            # Nothing below ends after the start
+            if self.max_ends[mid] <= start:
+                continue
+
+            stack.append((lo, mid))
+            # Everything to the right starts after the end
+            if self.starts[mid] < end:
+                if self.ends[mid] > start:
+                    indices.append(mid)
+                stack.append((mid + 1, hi))
+
+        indices.sort()
+        return indices
+
+    def get_overlapping(self, start: int, end: int) -> list[T]:
+        return [self.items[i] for i in self.get_overlapping_indices(start, end)]
+
+    def get_busy(self, start: int, end: int) -> list[tuple[int, int]]:
+        busy = []
+        for i in self.get_overlapping_indices(start, end):
+            interval_start, interval_end = max(self.starts[i], start), min(self.ends[i], end)
+            if busy and interval_start <= busy[-1][1]:
+                busy[-1] = (busy[-1][0], max(busy[-1][1], interval_end))
+            else:
+                busy.append((interval_start, interval_end))
+        return busy
+
+    def get_free(self, start: int, end: int) -> list[tuple[int, int]]:
+        free = []
+        for busy_start, busy_end in self.get_busy(start, end):
+            if busy_start > start:
+                free.append((start, busy_start))
+            start = busy_end
+        if start < end:
+            free.append((start, end))
+        return free
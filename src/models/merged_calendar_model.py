@@ -0,0 +1,189 @@
+import datetime
+import heapq
+import sqlite3
+from dataclasses import dataclass
+from itertools import count
+from operator import itemgetter
+from typing import Iterator, Optional
+
+from src.main.config import Config
+from src.models.calendar_model import CalendarModel, CalendarEvent, EventRecord, EventRecurrence, HolidayProvider
+from src.models.connection_manager import ConnectionManager
+from src.utils.calendar_functions import get_month_length
+
+
+@dataclass
+class AccountEvent(CalendarEvent):
+    account: Optional[str] = None
+
+
+class MergedCalendarModel:
+
+    instances = count()
+
+    def __init__(self, accounts: list[Optional[str]]) -> None:
+        self.accounts: list[Optional[str]] = []
+        self.models: list[CalendarModel] = []
+        self.database_names: list[str] = []
+        self.database_path: Optional[str] = None
+
+        self.set_accounts(accounts)
+
+    def set_accounts(self, accounts: list[Optional[str]]) -> None:
+        # Accounts are attached once per connection, so a changed list starts over with a new one
+        self.close()
+
+        # SQLite attaches at most 10 databases to a connection by default, None is the calendar used while signed out
+        self.accounts = accounts[:10]
+
+        # Every file is brought to the current schema before it is attached read only
+        self.models = [
+            CalendarModel(database_name="calendar" if account is None else f"calendar_{account}")
+            for account in self.accounts
+        ]
+        self.database_names = [model.database_name for model in self.models]
+        self.database_path = f"file:merged_calendar_{next(self.instances)}?mode=memory"
+
+    def close(self) -> None:
+        if self.database_path is not None:
+            ConnectionManager().close_database_connections(self.database_path)
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        conn = ConnectionManager().get_connection(self.database_path)
+
+        attached = {row[1] for row in conn.execute("PRAGMA database_list")}
+        for i, model in enumerate(self.models):
+            if f"a{i}" not in attached:
+                conn.execute(f"ATTACH DATABASE ? AS a{i}", (f"file:{model.calendar_database_path}?mode=ro", ))
+
+        return conn
+
+    def select_all(self, columns: str, where: str, table: str = "", accounts: Optional[list[int]] = None) -> str:
+        # The same query runs against every attached account, the account index is returned as the first column
+        return " UNION ALL ".join(
+            f"""SELECT {i} AS account, {columns} FROM a{i}."{self.database_names[i]}{table}" {where}"""
+            for i in (range(len(self.database_names)) if accounts is None else accounts)
+        )
+
+    def get_events_for_date(self, date: datetime.date) -> list[AccountEvent]:
+        return self.get_events_in_range(date, date)
+
+    def get_events_for_month(self, year: int, month: int) -> list[list[AccountEvent]]:
+        ret = [[] for _ in range(get_month_length(month, year))]
+
+        for event in self.get_events_in_range(
+                datetime.date(year, month, 1), datetime.date(year, month, get_month_length(month, year))
+        ):
+            ret[event.date.day - 1].append(event)
+
+        return ret
+
+    def get_events_in_range(self, start: datetime.date, end: datetime.date) -> list[AccountEvent]:
+        holidays = [
+            (event.date.toordinal(), event.time.hour * 60 + event.time.minute, AccountEvent(**vars(event)))
+            for event in HolidayProvider().get_events_in_range(start, end)
+        ]
+
+        return [
+            event for _, _, event in heapq.merge(holidays, self.iter_account_records(start, end), key=itemgetter(0, 1))
+        ]
+
+    def iter_account_records(self, start: datetime.date, end: datetime.date) -> Iterator[tuple[int, int, AccountEvent]]:
+        if not self.database_names:
+            return iter(())
+
+        conn = self.conn
+        columns = "id, date, time, description, color, recurrence, is_default, google_id, duration"
+        windows = {
+            row[0]: row[1:] for row in conn.execute(self.select_all("first_date, last_date", "", "_occurrence_window"))
+        }
+
+        # Accounts whose occurrence window covers the range are read from it, the others are expanded on the fly
+        expanded, recurring_accounts = [], []
+        for i, model in enumerate(self.models):
+            if model.covers_occurrences(windows[i], start, end):
+                expanded.append(i)
+            else:
+                recurring_accounts.append(i)
+
+        recurring = []
+        if recurring_accounts:
+            recurring = [
+                (row[0], CalendarModel.create_record(row[1:])) for row in conn.execute(
+                    self.select_all(columns, "WHERE recurrence > ? AND date <= ?", accounts=recurring_accounts),
+                    (EventRecurrence.NEVER.value, end.toordinal()) * len(recurring_accounts)
+                )
+            ]
+
+        sql = " UNION ALL ".join(
+            f"""
+            SELECT {i}, e.id, o.date, e.time, e.description, e.color, e.recurrence, e.is_default, e.google_id,
+            e.duration
+            FROM a{i}."{self.database_names[i]}_occurrences" AS o
+            JOIN a{i}."{self.database_names[i]}" AS e ON e.id = o.event_id
+            WHERE o.date BETWEEN ? AND ?
+            """ for i in expanded
+        )
+        params = (start.toordinal(), end.toordinal()) * len(expanded)
+
+        # Archived events are all non recurring, an archive that ends before the range finds nothing in its index
+        sql += (" UNION ALL " if sql else "") + (
+            self.select_all(columns, "WHERE recurrence = ? AND date BETWEEN ? AND ?") + " UNION ALL " +
+            self.select_all(columns, "WHERE recurrence = ? AND date BETWEEN ? AND ?", "_archive")
+        )
+        params += (EventRecurrence.NEVER.value, start.toordinal(), end.toordinal()) * len(self.database_names) * 2
+
+        cursor = conn.execute(sql + " ORDER BY 3, 4", params)
+
+        return heapq.merge(
+            (self.create_account_event(row[0], CalendarModel.create_record(row[1:])) for row in cursor),
+            *(self.iter_account_occurrences(account, record, start, end) for account, record in recurring),
+            key=itemgetter(0, 1)
+        )
+
+    def iter_account_occurrences(self, account: int, record: EventRecord, start: datetime.date,
+                                 end: datetime.date) -> Iterator[tuple[int, int, AccountEvent]]:
+        for date in CalendarModel.iter_recurrence_dates(
+                EventRecurrence(record.recurrence), record.date, start.toordinal(), end.toordinal()
+        ):
+            yield self.create_account_event(account, record._replace(date=date))
+
+    def create_account_event(self, account: int, record: EventRecord) -> tuple[int, int, AccountEvent]:
+        return record.date, record.time, record.to_event(AccountEvent, self.accounts[account])
+
+    def search_events(self, query: str, limit: int = Config.search_result_limit) -> list[AccountEvent]:
+        if not self.database_names:
+            return []
+
+        match = " ".join('"' + word.replace('"', '""') + '"*' for word in query.split())
+        if not match:
+            return []
+
+        # Holidays are indexed in every account, they are left out so they don't show up once per account
+        cursor = self.conn.execute(
+            " UNION ALL ".join(
+                f"""
+                SELECT {i}, search.rank, e.id, e.date, e.time, e.description, e.color, e.recurrence, e.is_default,
+                e.google_id, e.duration
+                FROM a{i}."{database_name}_search" AS search
+                JOIN a{i}."{database_name}{table}" AS e ON e.id = search.rowid
+                WHERE "{database_name}_search" MATCH ?
+                """ for i, database_name in enumerate(self.database_names) for table in ("", "_archive")
+            ) + " ORDER BY 2 LIMIT ?",
+            (match, ) * len(self.database_names) * 2 + (limit, )
+        )
+
+        today = datetime.date.today()
+        events = []
+        for row in cursor:
+            event = CalendarModel.create_record(row[2:]).to_event(AccountEvent, self.accounts[row[0]])
+            if event.recurrence is not EventRecurrence.NEVER:
+                date = next(CalendarModel.iter_recurrence_dates(
+                    event.recurrence, event.date.toordinal(), today.toordinal(), datetime.date.max.toordinal()
+                ), None)
+                if date is not None:
+                    event.date = datetime.date.fromordinal(date)
+            events.append(event)
+
+        return events
@@ -0,0 +1,142 @@
+import os
+import sqlite3
+from queue import Empty, Queue
+from threading import Lock, Thread
+from typing import Optional
+
+from src.main.config import Config
+from src.models.connection_manager import ConnectionManager
+from src.utils.logging import Log
+from src.utils.singleton import Singleton
+
+
+class MirrorManager(metaclass=Singleton):
+
+    def __init__(self, flush_mode: str = Config.calendar_mirror_flush) -> None:
+        if flush_mode not in ("sync", "background"):
+            raise ValueError(f"Unknown mirror flush mode: {flush_mode}")
+
+        self.flush_mode = flush_mode
+
+        # The in memory databases live as long as one connection to them is open
+        self.mirrors: dict[str, sqlite3.Connection] = {}
+        self.lock = Lock()
+
+        self.queue: Queue[Optional[tuple[str, list[tuple[str, list[tuple]]]]]] = Queue()
+        self.thread: Optional[Thread] = None
+
+        # Writes the disk refused, they are retried before any newer ones
+        self.pending: list[tuple[str, list[tuple[str, list[tuple]]]]] = []
+        self.pending_lock = Lock()
+
+    def get_mirror_path(self, database_path: str) -> str:
+        with self.lock:
+            if database_path not in self.mirrors:
+                mirror = sqlite3.connect(self.get_uri(database_path), uri=True, check_same_thread=False)
+                # A page by page backup would carry over the WAL flag of the file, which memdb can't open
+                source = sqlite3.connect(database_path)
+                try:
+                    source.execute("VACUUM INTO ?", (self.get_uri(database_path), ))
+                finally:
+                    source.close()
+
+                self.mirrors[database_path] = mirror
+
+            return self.get_uri(database_path)
+
+    @staticmethod
+    def get_uri(database_path: str) -> str:
+        # The memdb VFS shares names starting with "/" between connections and keeps the usual file locking
+        return f"file:/{os.path.basename(database_path)}?vfs=memdb"
+
+    def write(self, database_path: str, statements: list[tuple[str, list[tuple]]]) -> None:
+        statements = [(sql, rows) for sql, rows in statements if rows]
+        if not statements:
+            return
+
+        if self.flush_mode == "sync":
+            self.flush_pending([(database_path, statements)])
+            return
+
+        self.start_thread()
+        self.queue.put((database_path, statements))
+
+    def start_thread(self) -> None:
+        # A thread that died would leave the queued writes waiting forever
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = Thread(target=self.run, daemon=True)
+                self.thread.start()
+
+    def run(self) -> None:
+        try:
+            while True:
+                try:
+                    timeout = Config.calendar_mirror_retry_interval if self.pending else None
+                    writes = [self.queue.get(timeout=timeout)]
+                except Empty:
+                    writes = []
+                while not self.queue.empty():
+                    writes.append(self.queue.get())
+
+                try:
+                    self.flush_pending([write for write in writes if write is not None])
+                finally:
+                    for _ in writes:
+                        self.queue.task_done()
+
+                if None in writes:
+                    break
+        finally:
+            ConnectionManager().close_thread_connections()
+
+    def flush_pending(self, writes: list[tuple[str, list[tuple[str, list[tuple]]]]]) -> None:
+        # Writes that failed before go first, so the disk sees every database's writes in the mirror's order
+        with self.pending_lock:
+            self.pending.extend(writes)
+            self.pending = self.flush_writes(self.pending)
+
+    @staticmethod
+    def flush_writes(
+            writes: list[tuple[str, list[tuple[str, list[tuple]]]]]
+    ) -> list[tuple[str, list[tuple[str, list[tuple]]]]]:
+        # Writes that piled up while the last flush was running share one transaction per database
+        failed = []
+        for database_path in dict.fromkeys(write[0] for write in writes):
+            database_writes = [write for write in writes if write[0] == database_path]
+            try:
+                with ConnectionManager().write(database_path) as cursor:
+                    for _, statements in database_writes:
+                        for sql, rows in statements:
+                            cursor.executemany(sql, rows)
+            except sqlite3.Error as e:
+                Log.e(f"Mirror Manager: Couldn't write {len(database_writes)} changes to {database_path}: {e}")
+                failed.extend(database_writes)
+
+        return failed
+
+    def flush(self) -> None:
+        if self.flush_mode == "background":
+            if not self.queue.empty():
+                self.start_thread()
+            self.queue.join()
+
+        # Writes the disk refused get another try
+        self.flush_pending([])
+
+    def close_all(self) -> None:
+        with self.lock:
+            thread, self.thread = self.thread, None
+
+        if thread is not None:
+            if thread.is_alive():
+                self.queue.put(None)
+                thread.join()
+
+        # Whatever the disk refused until now gets a last try
+        self.flush_pending([])
+
+        with self.lock:
+            for mirror in self.mirrors.values():
+                mirror.close()
+            self.mirrors.clear()
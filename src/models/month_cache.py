@@ -0,0 +1,66 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Optional
+
+from src.main.config import Config
+from src.utils.singleton import Singleton
+
+
+class MonthCache(metaclass=Singleton):
+
+    def __init__(self, max_size: int = Config.month_cache_size) -> None:
+        self.max_size = max_size
+
+        self.months: OrderedDict[tuple[str, int, int], Any] = OrderedDict()
+        self.generations: dict[str, int] = {}
+        self.lock = Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, database_name: str, year: int, month: int) -> Optional[Any]:
+        key = (database_name, year, month)
+        with self.lock:
+            if key not in self.months:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.months.move_to_end(key)
+            return self.months[key]
+
+    def put(self, database_name: str, year: int, month: int, value: Any, generation: int) -> None:
+        with self.lock:
+            # A write happened while the month was being loaded, so the value may already be stale
+            if generation != self.generations.get(database_name, 0):
+                return
+
+            self.months[(database_name, year, month)] = value
+            self.months.move_to_end((database_name, year, month))
+            while len(self.months) > self.max_size:
+                self.months.popitem(last=False)
+
+    def get_generation(self, database_name: str) -> int:
+        with self.lock:
+            return self.generations.get(database_name, 0)
+
+    def invalidate(self, database_name: str, year: int, month: int) -> None:
+        with self.lock:
+            self.generations[database_name] = self.generations.get(database_name, 0) + 1
+            self.months.pop((database_name, year, month), None)
+
+    def invalidate_database(self, database_name: str) -> None:
+        with self.lock:
+            self.generations[database_name] = self.generations.get(database_name, 0) + 1
+            for key in [key for key in self.months if key[0] == database_name]:
+                self.months.pop(key)
+
+    def clear(self) -> None:
+        with self.lock:
+            for database_name in self.generations.keys() | {key[0] for key in self.months}:
+                self.generations[database_name] = self.generations.get(database_name, 0) + 1
+            self.months.clear()
+
+    def get_stats(self) -> dict[str, int]:
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self.months)}
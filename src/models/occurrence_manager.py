@@ -0,0 +1,41 @@
+import sqlite3
+from threading import Lock, Thread
+from typing import Callable
+
+from src.models.connection_manager import ConnectionManager
+from src.utils.logging import Log
+from src.utils.singleton import Singleton
+
+
+class OccurrenceManager(metaclass=Singleton):
+
+    def __init__(self) -> None:
+        self.threads: dict[str, Thread] = {}
+        self.lock = Lock()
+
+    def extend(self, database_path: str, extend_occurrences: Callable[[], None]) -> None:
+        # Reads keep expanding on the fly until the window has grown, one extension per database runs at a time
+        with self.lock:
+            thread = self.threads.get(database_path)
+            if thread is not None and thread.is_alive():
+                return
+
+            thread = Thread(target=self.run, args=(extend_occurrences, ), daemon=True)
+            self.threads[database_path] = thread
+            thread.start()
+
+    @staticmethod
+    def run(extend_occurrences: Callable[[], None]) -> None:
+        try:
+            extend_occurrences()
+        except sqlite3.Error as e:
+            Log.e(f"Occurrence Manager: Couldn't extend the occurrence window: {e}")
+        finally:
+            ConnectionManager().close_thread_connections()
+
+    def join(self) -> None:
+        with self.lock:
+            threads = list(self.threads.values())
+
+        for thread in threads:
+            thread.join()
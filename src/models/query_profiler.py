@@ -0,0 +1,238 @@
+import datetime
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from src.main.config import Config
+from src.utils.assets import Assets
+from src.utils.singleton import Singleton
+
+
+@dataclass
+class QueryStats:
+
+    sql: str
+    count: int = 0
+    rows: int = 0
+    total_time: float = 0
+    fetch_time: float = 0
+    max_time: float = 0
+    histogram: list[int] = field(default_factory=lambda: [0] * (len(Config.query_histogram_buckets) + 1))
+    callers: dict[str, int] = field(default_factory=dict)
+    plan: Optional[list[str]] = None
+
+    def get_percentile(self, percentile: float) -> float:
+        # Percentiles are known to the bucket, the upper bound of the bucket is returned
+        rank = percentile * self.count
+        seen = 0
+        for bound, count in zip(Config.query_histogram_buckets, self.histogram):
+            seen += count
+            if seen >= rank and count:
+                return min(bound / 1000, self.max_time)
+        return self.max_time
+
+
+class QueryProfiler(metaclass=Singleton):
+
+    def __init__(self) -> None:
+        self.enabled = Config.query_profiling
+
+        self.stats: dict[str, QueryStats] = {}
+        self.normalized: dict[str, str] = {}
+        self.lock = threading.Lock()
+
+    def enable(self) -> None:
+        # Only connections opened from now on are profiled
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        with self.lock:
+            self.stats.clear()
+
+    def record(self, cursor: sqlite3.Cursor, sql: str, elapsed: float) -> QueryStats:
+        normalized = self.normalized.get(sql)
+        if normalized is None:
+            normalized = self.normalized.setdefault(sql, " ".join(sql.split()))
+
+        caller = self.get_caller()
+        rows = max(cursor.rowcount, 0)
+
+        with self.lock:
+            stats = self.stats.get(normalized)
+            if stats is None:
+                stats = self.stats.setdefault(normalized, QueryStats(normalized))
+
+            stats.count += 1
+            stats.rows += rows
+            stats.total_time += elapsed
+            stats.max_time = max(stats.max_time, elapsed)
+            stats.histogram[self.get_bucket(elapsed)] += 1
+            stats.callers[caller] = stats.callers.get(caller, 0) + 1
+
+        return stats
+
+    def record_slow(self, cursor: sqlite3.Cursor, stats: QueryStats, sql: str, parameters: Any, elapsed: float,
+                    rows: int) -> None:
+        if stats.plan is None:
+            stats.plan = self.explain(cursor.connection, sql, parameters)
+        self.log_slow_query(stats, elapsed, rows, self.get_caller())
+
+    def record_fetch(self, stats: QueryStats, rows: int, elapsed: float) -> None:
+        with self.lock:
+            stats.rows += rows
+            stats.fetch_time += elapsed
+
+    @staticmethod
+    def get_bucket(elapsed: float) -> int:
+        for i, bound in enumerate(Config.query_histogram_buckets):
+            if elapsed * 1000 <= bound:
+                return i
+        return len(Config.query_histogram_buckets)
+
+    @staticmethod
+    def get_caller() -> str:
+        # The first frame outside the models is the view, controller or manager that asked for the data
+        frame = sys._getframe(2)
+        while frame is not None:
+            module = frame.f_globals.get("__name__", "")
+            if module.startswith("src.") and not module.startswith("src.models."):
+                return getattr(frame.f_code, "co_qualname", frame.f_code.co_name)
+            frame = frame.f_back
+
+        return threading.current_thread().name
+
+    @staticmethod
+    def explain(conn: sqlite3.Connection, sql: str, parameters: Any) -> list[str]:
+        if not sql.lstrip().upper().startswith(("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")):
+            return []
+
+        try:
+            # A plain cursor, so the plan itself isn't recorded
+            cursor = sqlite3.Cursor(conn)
+            return [row[3] for row in sqlite3.Cursor.execute(cursor, "EXPLAIN QUERY PLAN " + sql, parameters)]
+        except sqlite3.Error:
+            return []
+
+    def log_slow_query(self, stats: QueryStats, elapsed: float, rows: int, caller: str) -> None:
+        lines = [
+            f"{datetime.datetime.now().isoformat(timespec='milliseconds')} {elapsed * 1000:.1f} ms, {rows} rows, "
+            f"{caller}, {threading.current_thread().name}",
+            f"    {stats.sql}",
+            *(f"    | {line}" for line in stats.plan or [])
+        ]
+
+        with self.lock:
+            try:
+                with open(Assets().slow_query_log_path, "a", encoding="utf-8") as file:
+                    file.write("\n".join(lines) + "\n")
+            except OSError:
+                pass
+
+    def get_stats(self, limit: int = None) -> list[QueryStats]:
+        with self.lock:
+            stats = sorted(self.stats.values(), key=lambda s: s.total_time + s.fetch_time, reverse=True)
+        return stats[:limit]
+
+
+class ProfiledCursor(sqlite3.Cursor):
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats: Optional[QueryStats] = None
+
+        # The statement and the rows read so far, a select only turns out slow once its rows are stepped
+        self.sql = ""
+        self.parameters: Any = ()
+        self.elapsed = 0
+        self.rows = 0
+        self.slow = False
+
+    def execute(self, sql: str, parameters: Any = ()) -> sqlite3.Cursor:
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self.record(sql, parameters, time.perf_counter() - start)
+
+    def executemany(self, sql: str, seq_of_parameters: Any) -> sqlite3.Cursor:
+        # The rows are needed again to explain the statement
+        seq_of_parameters = list(seq_of_parameters)
+
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self.record(sql, seq_of_parameters[0] if seq_of_parameters else (), time.perf_counter() - start)
+
+    def record(self, sql: str, parameters: Any, elapsed: float) -> None:
+        self.stats = QueryProfiler().record(self, sql, elapsed)
+        self.sql = sql
+        self.parameters = parameters
+        self.elapsed = elapsed
+        self.rows = max(self.rowcount, 0)
+        self.slow = False
+        self.check_slow()
+
+    def record_fetch(self, rows: int, elapsed: float) -> None:
+        if self.stats is None:
+            return
+
+        QueryProfiler().record_fetch(self.stats, rows, elapsed)
+        self.elapsed += elapsed
+        self.rows += rows
+        self.check_slow()
+
+    def check_slow(self) -> None:
+        if not self.slow and self.elapsed >= Config.slow_query_threshold:
+            self.slow = True
+            QueryProfiler().record_slow(self, self.stats, self.sql, self.parameters, self.elapsed, self.rows)
+
+    def fetchone(self) -> Any:
+        start = time.perf_counter()
+        row = super().fetchone()
+        self.record_fetch(row is not None, time.perf_counter() - start)
+        return row
+
+    def fetchmany(self, size: int = None) -> list:
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self.record_fetch(len(rows), time.perf_counter() - start)
+        return rows
+
+    def fetchall(self) -> list:
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self.record_fetch(len(rows), time.perf_counter() - start)
+        return rows
+
+    def __next__(self) -> Any:
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self.record_fetch(0, time.perf_counter() - start)
+            raise
+        self.record_fetch(1, time.perf_counter() - start)
+        return row
+
+    def __iter__(self) -> "ProfiledCursor":
+        return self
+
+
+class ProfiledConnection(sqlite3.Connection):
+
+    def cursor(self, factory: type[sqlite3.Cursor] = ProfiledCursor) -> sqlite3.Cursor:
+        return super().cursor(factory)
+
+    # The connection shortcuts would run the statement on the cursor without going through its methods
+    def execute(self, sql: str, parameters: Any = ()) -> sqlite3.Cursor:
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Any) -> sqlite3.Cursor:
+        return self.cursor().executemany(sql, seq_of_parameters)
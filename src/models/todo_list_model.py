@@ -4,6 +4,7 @@ import sqlite3
 from dataclasses import dataclass
 from enum import Enum, auto
 
+from src.models.connection_manager import ConnectionManager
 from src.utils.assets import Assets
 
 
@@ -30,8 +31,6 @@ class TodoListModel:
 
         self.database_path = os.path.join(Assets().todo_list_database_path, database_name + ".db")
 
-        self.conn = sqlite3.connect(self.database_path)
-        self.cursor = self.conn.cursor()
         self.cursor.execute(
             f"""
             CREATE TABLE IF NOT EXISTS "{self.database_name}" (
@@ -46,6 +45,14 @@ class TodoListModel:
 
         self.tasks = self.load_tasks()
 
+    @property
+    def conn(self) -> sqlite3.Connection:
+        return ConnectionManager().get_connection(self.database_path)
+
+    @property
+    def cursor(self) -> sqlite3.Cursor:
+        return ConnectionManager().get_cursor(self.database_path)
+
     def load_tasks(self) -> dict[int, Task]:
         with self.conn:
             self.cursor.execute(f"SELECT id, description, importance, idx FROM '{self.database_name}'")
@@ -67,14 +74,11 @@ class TodoListModel:
             self.cursor.execute(f"DELETE from '{self.database_name}' WHERE id = :id", {"id": id_})
 
     def update_task(self, id_: int, description: str = None, importance: TaskImportance = None, idx: int = None) -> None:
-        conn = sqlite3.connect(self.database_path)
-        cursor = conn.cursor()
-
         new_task = Task(id_, description or self.tasks[id_].description, importance or self.tasks[id_].importance,
                         idx or self.tasks[id_].idx)
-        with conn:
-            cursor.execute(f"UPDATE '{self.database_name}' SET description = ?, importance = ?, idx = ? WHERE id = ?",
-                           (new_task.description, pickle.dumps(new_task.importance), new_task.idx, id_))
+        with self.conn:
+            self.cursor.execute(f"UPDATE '{self.database_name}' SET description = ?, importance = ?, idx = ? WHERE id = ?",
+                                (new_task.description, pickle.dumps(new_task.importance), new_task.idx, id_))
 
     def get_next_id(self) -> int:
         ids = {i for i in range(len(self.tasks)+1)}
@@ -46,10 +46,32 @@ def brighten(color: Color, value: int):
     return brighter[0], brighter[1], brighter[2]
 
 
+# Stored colors come from a small palette, so decoded values are looked up instead of parsed for every row
+packed_colors: dict[str, int] = {}
+rgb_colors: dict[int, Color] = {}
+
+
+def get_packed_color(s: str) -> int:
+    packed = packed_colors.get(s)
+    if packed is None:
+        # Both "#RRGGBB" and "0xRRGGBB" are in use
+        packed = packed_colors[s] = int(s[-6:], 16)
+    return packed
+
+
+def pack_color(color: Color) -> int:
+    return color[0] << 16 | color[1] << 8 | color[2]
+
+
+def unpack_color(packed: int) -> Color:
+    color = rgb_colors.get(packed)
+    if color is None:
+        color = rgb_colors[packed] = (packed >> 16 & 0xFF, packed >> 8 & 0xFF, packed & 0xFF)
+    return color
+
+
 def get_rgb_color(s: str) -> Color:
-    if s.startswith("#"):
-        s = "0x" + s[1:]
-    return tuple(eval("0x" + s[i * 2:i * 2 + 2]) for i in range(1, 4))
+    return unpack_color(get_packed_color(s))
 
 
 def get_hex_color(color: Color) -> str:
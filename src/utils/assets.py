@@ -128,20 +128,19 @@ class Assets(metaclass=Singleton):
         self.todo_list_database_path = os.path.join(self.DATA_PATH, "todo_lists")
         self.calendar_database_path = os.path.join(self.DATA_PATH, "calendars")
         self.settings_database_path = os.path.join(self.SETTINGS_PATH, "settings.json")
+        self.slow_query_log_path = os.path.join(self.DATA_PATH, "slow_queries.log")
 
         if not os.path.exists(self.settings_database_path):
             settings = {
                 "language": "eng",
-                "current_id": {
-                    "calendar": 0
-                },
                 "default_event_color": "#FF5400",
                 "show_catholic_events": False,
                 "catholic_event_color": "#544ACC",
                 "current_user_email": None,
                 "render_filled_events": False,
                 "high_quality_graphics": True,
-                "autosync": True
+                "autosync": True,
+                "show_all_calendars": False
             }
             with open(self.settings_database_path, "w", encoding="utf-16") as file:
                 json.dump(settings, file)
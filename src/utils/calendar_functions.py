@@ -1,4 +1,8 @@
+import calendar
 import datetime
+from typing import Iterator
+
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
 
 
 def get_month_name(month: int) -> str:
@@ -10,9 +14,9 @@ def get_weekday_name(weekday: int) -> str:
     return ["pon", "uto", "sri", "čet", "pet", "sub", "ned"][weekday - 1]
 
 
-def get_month_length(month: int) -> int:
+def get_month_length(month: int, year: int = None) -> int:
     if month == 2:
-        return 28
+        return 29 if year and calendar.isleap(year) else 28
     if month in (1, 3, 5, 7, 8, 10, 12):
         return 31
     return 30
@@ -39,3 +43,54 @@ def calculate_easter(year):
     day = ((h + l - 7 * m + 114) % 31) + 1
     return year, month, day
 
+
+
+def get_seconds(time: datetime.time) -> int:
+    return time.hour * 3600 + time.minute * 60 + time.second
+
+
+def get_timestamp(date: int, seconds: int) -> int:
+    # Event times are naive, they are counted from the epoch as if they were UTC
+    return (date - EPOCH_ORDINAL) * 86400 + seconds
+
+
+def get_datetime(timestamp: int) -> datetime.datetime:
+    date, seconds = divmod(timestamp, 86400)
+    return datetime.datetime.combine(datetime.date.fromordinal(date + EPOCH_ORDINAL), datetime.time()) + \
+        datetime.timedelta(seconds=seconds)
+
+
+def iter_weekly_dates(date: int, start: int, end: int) -> Iterator[int]:
+    first = max(date, date + (start - date + 6) // 7 * 7)
+    return iter(range(first, end + 1, 7))
+
+
+def iter_monthly_dates(date: int, start: int, end: int) -> Iterator[int]:
+    base = datetime.date.fromordinal(date)
+    first = datetime.date.fromordinal(max(date, start))
+    last = datetime.date.fromordinal(end)
+
+    for i in range(first.year * 12 + first.month - 1, last.year * 12 + last.month):
+        year, month = divmod(i, 12)
+        if base.day > get_month_length(month + 1, year):
+            continue
+        ordinal = datetime.date(year, month + 1, base.day).toordinal()
+        if ordinal > end:
+            return
+        if ordinal >= start:
+            yield ordinal
+
+
+def iter_yearly_dates(date: int, start: int, end: int) -> Iterator[int]:
+    base = datetime.date.fromordinal(date)
+    first = datetime.date.fromordinal(max(date, start))
+    last = datetime.date.fromordinal(end)
+
+    for year in range(first.year, last.year + 1):
+        if base.day > get_month_length(base.month, year):
+            continue
+        ordinal = datetime.date(year, base.month, base.day).toordinal()
+        if ordinal > end:
+            return
+        if ordinal >= start:
+            yield ordinal
@@ -0,0 +1,32 @@
+import tkinter
+from tkinter import filedialog
+from typing import Optional
+
+
+def create_dialog_root() -> tkinter.Tk:
+    # The dialogs need a Tk window to belong to, it is hidden and kept above the pygame window
+    root = tkinter.Tk()
+    root.withdraw()
+    root.attributes("-topmost", True)
+    return root
+
+
+def ask_open_path(title: str, file_types: list[tuple[str, str]]) -> Optional[str]:
+    root = create_dialog_root()
+    try:
+        return filedialog.askopenfilename(parent=root, title=title, filetypes=file_types) or None
+    finally:
+        root.destroy()
+
+
+
+def ask_save_path(title: str, file_types: list[tuple[str, str]], default_extension: str,
+                  initial_file: str = "") -> Optional[str]:
+    root = create_dialog_root()
+    try:
+        return filedialog.asksaveasfilename(
+            parent=root, title=title, filetypes=file_types, defaultextension=default_extension,
+            initialfile=initial_file
+        ) or None
+    finally:
+        root.destroy()
@@ -0,0 +1,151 @@
+import datetime
+import re
+from typing import BinaryIO, Iterator, Optional
+
+# Colors aren't part of the standard event properties, exported files carry them in an extension property
+COLOR_PROPERTY = "X-EVENT-PLANNER-COLOR"
+
+ESCAPED_CHARACTERS = {"\\\\": "\\", "\\;": ";", "\\,": ",", "\\n": "\n", "\\N": "\n"}
+ESCAPE_PATTERN = re.compile(r"\\[\\;,nN]")
+DURATION_PATTERN = re.compile(r"([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?")
+
+
+def iter_ics_lines(file: BinaryIO) -> Iterator[str]:
+    line = None
+    for raw_line in file:
+        raw_line = raw_line.decode("utf-8", errors="replace").rstrip("\r\n")
+
+        # Long lines are folded by starting the continuation with a space or a tab
+        if raw_line[:1] in (" ", "\t") and line is not None:
+            line += raw_line[1:]
+            continue
+
+        if line:
+            yield line
+        line = raw_line
+
+    if line:
+        yield line
+
+
+def parse_ics_line(line: str) -> tuple[str, dict[str, str], str]:
+    colon = line.find(":")
+    if colon < 0:
+        return line.upper(), {}, ""
+
+    head = line[:colon]
+    value = line[colon + 1:]
+
+    if '"' in head:
+        # Quoted parameter values can contain ":" or ";", so the line is split by hand
+        parts = []
+        start = 0
+        quoted = False
+        for i, char in enumerate(line):
+            if char == '"':
+                quoted = not quoted
+            elif not quoted and char in ";:":
+                parts.append(line[start:i])
+                start = i + 1
+                if char == ":":
+                    break
+        value = line[start:]
+    else:
+        parts = head.split(";")
+
+    params = {}
+    for param in parts[1:]:
+        key, _, param_value = param.partition("=")
+        params[key.upper()] = param_value.strip('"')
+
+    return parts[0].upper(), params, value
+
+
+def iter_ics_components(lines: Iterator[str], component: str = "VEVENT") -> Iterator[dict[str, tuple[dict, str]]]:
+    properties = None
+    depth = 0
+
+    for line in lines:
+        name, params, value = parse_ics_line(line)
+
+        if name == "BEGIN":
+            if properties is not None:
+                # Nested components (e.g. alarms) don't describe the event itself
+                depth += 1
+            elif value.upper() == component:
+                properties = {}
+        elif name == "END":
+            if depth:
+                depth -= 1
+            elif properties is not None and value.upper() == component:
+                yield properties
+                properties = None
+        elif properties is not None and not depth:
+            properties.setdefault(name, (params, value))
+
+
+def parse_ics_datetime(value: str) -> Optional[tuple[datetime.date, datetime.time]]:
+    try:
+        date = datetime.date(int(value[0:4]), int(value[4:6]), int(value[6:8]))
+        if value[8:9] != "T":
+            return date, datetime.time(0, 0)
+
+        # Times are kept naive like the ones coming from sync, the "Z" suffix is dropped
+        return date, datetime.time(int(value[9:11]), int(value[11:13]), int(value[13:15] or 0))
+    except ValueError:
+        return None
+
+
+def parse_ics_duration(value: str) -> Optional[datetime.timedelta]:
+    match = DURATION_PATTERN.fullmatch(value.strip().upper())
+    if match is None:
+        return None
+
+    sign, weeks, days, hours, minutes, seconds = match.groups()
+    duration = datetime.timedelta(
+        weeks=int(weeks or 0), days=int(days or 0), hours=int(hours or 0), minutes=int(minutes or 0),
+        seconds=int(seconds or 0)
+    )
+    return -duration if sign == "-" else duration
+
+
+def format_ics_datetime(date: datetime.date, time: datetime.time) -> str:
+    return f"{date.year:04}{date.month:02}{date.day:02}T{time.hour:02}{time.minute:02}{time.second:02}"
+
+
+def parse_ics_rule(value: str) -> dict[str, str]:
+    rule = {}
+    for part in value.split(";"):
+        key, _, val = part.partition("=")
+        rule[key.upper()] = val.upper()
+    return rule
+
+
+def unescape_ics_text(value: str) -> str:
+    if "\\" not in value:
+        return value
+    return ESCAPE_PATTERN.sub(lambda match: ESCAPED_CHARACTERS[match.group()], value)
+
+
+def escape_ics_text(value: str) -> str:
+    return value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def fold_ics_line(line: str, width: int = 75) -> str:
+    encoded = line.encode("utf-8")
+    if len(encoded) <= width:
+        return line + "\r\n"
+
+    # Lines are folded at octet boundaries without splitting multibyte characters
+    parts = []
+    start = 0
+    limit = width
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        while end < len(encoded) and encoded[end] & 0xC0 == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode("utf-8"))
+        start = end
+        limit = width - 1
+
+    return "\r\n ".join(parts) + "\r\n"
@@ -6,6 +6,7 @@ import pygame
 from src.events.event import Event, MouseClickEvent, MouseReleaseEvent, MouseWheelUpEvent, \
     MouseWheelDownEvent, KeyReleaseEvent, LanguageChangedEvent
 from src.events.event_loop import EventLoop
+from src.main.config import Config
 from src.main.settings import Settings
 from src.models.calendar_model import CalendarEvent, EventRecurrence
 from src.ui.button import Button
@@ -39,6 +40,7 @@ class AddEventView(View):
 
         self.selected_color = None
         self.invalid_time_error = self.language_manager.get_string("invalid_time_error")
+        self.overlap_warning = self.language_manager.get_string("overlap_warning")
         self.editing_state = False
         self.event_to_edit = None
 
@@ -84,7 +86,7 @@ class AddEventView(View):
 
         self.hours_input = TextField(
             self.canvas,
-            (self.width // 4 - 25, 380),
+            (self.width // 4 - 45, 380),
             (40, 40),
             label=Label(text_color=Colors.TEXT_GREY, font=Assets().font24),
             hint="00",
@@ -98,7 +100,35 @@ class AddEventView(View):
 
         self.minutes_input = TextField(
             self.canvas,
-            (self.width // 4 + 25, 380),
+            (self.width // 4 + 5, 380),
+            (40, 40),
+            label=Label(text_color=Colors.TEXT_GREY, font=Assets().font24),
+            hint="00",
+            hint_text_color=Colors.TEXT_DARK_GREY,
+            color=Colors.BACKGROUND_GREY30,
+            border_width=0,
+            max_length=2,
+            allowed_char_set=set("0123456789"),
+            underline=Colors.TEXT_GREY
+        )
+
+        self.end_hours_input = TextField(
+            self.canvas,
+            (self.width // 4 + 65, 380),
+            (40, 40),
+            label=Label(text_color=Colors.TEXT_GREY, font=Assets().font24),
+            hint="00",
+            hint_text_color=Colors.TEXT_DARK_GREY,
+            color=Colors.BACKGROUND_GREY30,
+            border_width=0,
+            max_length=2,
+            allowed_char_set=set("0123456789"),
+            underline=Colors.TEXT_GREY
+        )
+
+        self.end_minutes_input = TextField(
+            self.canvas,
+            (self.width // 4 + 115, 380),
             (40, 40),
             label=Label(text_color=Colors.TEXT_GREY, font=Assets().font24),
             hint="00",
@@ -112,16 +142,16 @@ class AddEventView(View):
 
         self.recurring_label = Label(
             self.canvas,
-            (self.width // 2 + 30, 380),
-            (100, 40),
+            (self.width - 80, 350),
+            (100, 24),
             text=self.language_manager.get_string("recurring"),
             text_color=Colors.TEXT_DARK_GREY,
-            font=Assets().font20
+            font=Assets().font18
         )
 
         self.dropdown = DropDown(
             self.canvas,
-            (320, 380),
+            (self.width - 80, 380),
             (86, 34),
             self.language_manager.get_string("event_dropdown_options"),
             color=Colors.BACKGROUND_GREY22,
@@ -143,6 +173,14 @@ class AddEventView(View):
             font=Assets().font18
         )
 
+        self.warning_label = Label(
+            self.canvas,
+            (self.width // 2, 420),
+            (self.width - 20, 40),
+            text_color=Colors.EVENT_YELLOW204,
+            font=Assets().font18
+        )
+
         self.add_event_button = Button(
             self.canvas,
             (self.width // 2, 460),
@@ -182,6 +220,12 @@ class AddEventView(View):
                 self.minutes_input.set_focus(True)
             elif self.minutes_input.focused:
                 self.minutes_input.set_focus(False)
+                self.end_hours_input.set_focus(True)
+            elif self.end_hours_input.focused:
+                self.end_hours_input.set_focus(False)
+                self.end_minutes_input.set_focus(True)
+            elif self.end_minutes_input.focused:
+                self.end_minutes_input.set_focus(False)
                 self.description_text_field.set_focus(True)
 
         return registered_events
@@ -200,7 +244,9 @@ class AddEventView(View):
         for btn in self.color_buttons:
             btn.render()
 
-        Label.render_text(self.canvas, ":", (self.width // 4, 378), Assets().font24, Colors.GREY140, True)
+        Label.render_text(self.canvas, ":", (self.width // 4 - 20, 378), Assets().font24, Colors.GREY140, True)
+        Label.render_text(self.canvas, "-", (self.width // 4 + 35, 378), Assets().font24, Colors.GREY140, True)
+        Label.render_text(self.canvas, ":", (self.width // 4 + 90, 378), Assets().font24, Colors.GREY140, True)
 
         pygame.draw.line(self.canvas, Colors.GREY70, (20, 70), (self.width - 20, 70))
 
@@ -220,6 +266,11 @@ class AddEventView(View):
 
     def show_error(self, error: str) -> None:
         self.error_label.set_text(error)
+        self.warning_label.set_text("")
+
+    def show_warning(self, warning: str) -> None:
+        if not self.error_label.text:
+            self.warning_label.set_text(warning)
 
     def update_canvas(self, canvas: pygame.Surface) -> None:
         self.canvas = canvas
@@ -244,6 +295,7 @@ class AddEventView(View):
 
     def update_language(self) -> None:
         self.invalid_time_error = self.language_manager.get_string("invalid_time_error")
+        self.overlap_warning = self.language_manager.get_string("overlap_warning")
         self.add_event_label.set_text(self.language_manager.get_string("add_event"))
         self.description_text_field.set_hint(self.language_manager.get_string("event_description"))
         self.recurring_label.set_text(self.language_manager.get_string("recurring"))
@@ -253,6 +305,22 @@ class AddEventView(View):
     def get_time(self) -> datetime.time:
         return datetime.time(int(self.hours_input.text or "00"), int(self.minutes_input.text or "00"))
 
+    def get_end_time(self) -> datetime.time:
+        return datetime.time(int(self.end_hours_input.text or "00"), int(self.end_minutes_input.text or "00"))
+
+    def get_duration(self) -> datetime.timedelta:
+        if not self.end_hours_input.text and not self.end_minutes_input.text:
+            return datetime.timedelta(seconds=Config.event_duration)
+
+        start = datetime.datetime.combine(datetime.date.min, self.get_time())
+        end = datetime.datetime.combine(datetime.date.min, self.get_end_time())
+
+        # An end before the start is on the next day
+        if end < start:
+            end += datetime.timedelta(days=1)
+
+        return end - start
+
     def get_event_recurring(self) -> EventRecurrence:
         options = self.language_manager.get_string("event_dropdown_options")
 
@@ -289,6 +357,8 @@ class AddEventView(View):
         self.description_text_field.set_text(event.description)
         self.hours_input.set_text(str(event.time)[:2])
         self.minutes_input.set_text(str(event.time)[3:5])
+        self.end_hours_input.set_text(str(event.end.time())[:2])
+        self.end_minutes_input.set_text(str(event.end.time())[3:5])
         self.dropdown.set_option(self.get_dropdown_option(event.recurrence))
         self.add_event_button.label.set_text(self.language_manager.get_string("apply"))
 
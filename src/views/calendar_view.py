@@ -1,14 +1,16 @@
 import datetime
 from dataclasses import dataclass
-from typing import Union, Callable
+from typing import Union, Callable, Optional
 
 import pygame
 
 from src.events.event import MouseClickEvent, MouseReleaseEvent, Event, MouseWheelUpEvent, MouseWheelDownEvent, \
-    UpdateCalendarEvent, LanguageChangedEvent, CalendarSyncEvent, KeyPressEvent, ChangeMonthEvent
+    UpdateCalendarEvent, LanguageChangedEvent, CalendarSyncEvent, KeyPressEvent, ChangeMonthEvent, ImportProgressEvent, \
+    SettingsChangedEvent, UserSignOutEvent
 from src.main.config import Config
 from src.main.settings import Settings
 from src.models.calendar_model import CalendarModel, CalendarEvent
+from src.models.merged_calendar_model import MergedCalendarModel
 from src.ui.alignment import VerticalAlignment
 from src.ui.button import Button
 from src.ui.colors import Colors, Color
@@ -32,10 +34,11 @@ class MonthEvent:
 class CalendarView(View):
 
     def __init__(self, display: pygame.Surface, model: CalendarModel,
-                 width: int, height: int, x: int, y: int) -> None:
+                 width: int, height: int, x: int, y: int, merged_model: Optional[MergedCalendarModel] = None) -> None:
         super().__init__(width, height, x, y)
         self.display = display
         self.model = model
+        self.merged_model = merged_model
         self.width = width
         self.height = height
         self.x = x
@@ -122,7 +125,7 @@ class CalendarView(View):
         ]
 
     def create_day_buttons(self) -> None:
-        month_length = get_month_length(self.month)
+        month_length = get_month_length(self.month, self.year)
         starting_day = get_month_starting_day(self.year, self.month)
         n_rows = ((month_length + starting_day) / 7).__ceil__()
         btn_height = (self.height - 300) // n_rows
@@ -143,7 +146,7 @@ class CalendarView(View):
                 break
 
         self.month_events = [[] for _ in range(len(self.month_events))]
-        for i, events in enumerate(self.model.get_events_for_month(self.year, self.month)):
+        for i, events in enumerate(self.get_events_for_month()):
             if not events:
                 continue
             for j, event in enumerate(events):
@@ -159,6 +162,12 @@ class CalendarView(View):
                     )
                 )
 
+    def get_events_for_month(self) -> list[list[CalendarEvent]]:
+        # The other calendars are only overlaid, events are still added to and edited in the current one
+        if self.merged_model is not None and Settings().get_settings().get("show_all_calendars", False):
+            return self.merged_model.get_events_for_month(self.year, self.month)
+        return self.model.get_events_for_month(self.year, self.month)
+
     def register_event(self, event: Event) -> bool:
         registered_events = False
 
@@ -179,7 +188,9 @@ class CalendarView(View):
             if obj.register_event(event):
                 registered_events = True
 
-        if isinstance(event, (UpdateCalendarEvent, CalendarSyncEvent, )):
+        if isinstance(event, (UpdateCalendarEvent, CalendarSyncEvent, UserSignOutEvent)) or \
+                (isinstance(event, ImportProgressEvent) and event.finished) or \
+                (isinstance(event, SettingsChangedEvent) and event.key == "show_all_calendars"):
             self.create_day_buttons()
             self.calendar_binding()
             registered_events = True
@@ -7,10 +7,12 @@ from src.events.event import Event, MouseMotionEvent, MouseClickEvent, MouseRele
 from src.events.event_loop import EventLoop
 from src.main.language_manager import LanguageManager
 from src.main.settings import Settings
+from src.models.calendar_model import CalendarModel
 from src.ui.button import Button
 from src.ui.colors import Colors
 from src.ui.label import Label
 from src.utils.assets import Assets
+from src.utils.calendar_functions import get_month_length
 from src.utils.rendering import render_rounded_rect
 from src.utils.ui_utils import adjust_labels_font_size
 from src.views.view import View
@@ -18,11 +20,13 @@ from src.views.view import View
 
 class ChooseMonthView(View):
 
-    def __init__(self, display: pygame.Surface, event_loop: EventLoop, month: int,
+    def __init__(self, display: pygame.Surface, model: CalendarModel, event_loop: EventLoop, year: int, month: int,
                  width: int, height: int, x: int, y: int) -> None:
         super().__init__(width, height, x, y)
         self.display = display
+        self.model = model
         self.event_loop = event_loop
+        self.year = year
         self.month = month
         self.width = width
         self.height = height
@@ -41,6 +45,9 @@ class ChooseMonthView(View):
         self.buttons: list[Button] = []
         self.create_buttons()
 
+        self.month_counts: list[int] = []
+        self.update_month_counts()
+
         adjust_labels_font_size(self.get_ui_elements())
 
     def register_event(self, event: Event) -> bool:
@@ -76,6 +83,8 @@ class ChooseMonthView(View):
         for btn in self.buttons:
             btn.render()
 
+        self.render_month_counts()
+
         self.shadow_canvas.fill((0, 0, 0, 0))
         for i in range(8):
             pygame.draw.rect(self.shadow_canvas, (0, 0, 0, max(110 - i * 11, 0)),
@@ -99,6 +108,28 @@ class ChooseMonthView(View):
         if self.on_create_buttons:
             self.on_create_buttons()
 
+    def update_month_counts(self) -> None:
+        day_counts = self.model.get_day_counts(self.year)
+
+        self.month_counts = []
+        start = 0
+        for month in range(1, 13):
+            length = get_month_length(month, self.year)
+            self.month_counts.append(sum(day_counts[start:start + length]))
+            start += length
+
+    def render_month_counts(self) -> None:
+        for i, count in enumerate(self.month_counts):
+            if not count:
+                continue
+
+            text = Assets().font14.render(str(count), True, Colors.TEXT_LIGHT_GREY)
+            rect = pygame.Rect(0, 0, text.get_width() + 10, 18)
+            rect.midright = (self.width - 12, 20 + i * 32)
+
+            pygame.draw.rect(self.canvas, Colors.GREY70, rect, border_radius=9)
+            self.canvas.blit(text, text.get_rect(center=rect.center))
+
     def resize(self, width: int = None, height: int = None) -> None:
         self.width = width or self.width
         self.height = height or self.height
@@ -3,7 +3,7 @@ from typing import Union, Callable
 import pygame
 
 from src.events.event import MouseClickEvent, MouseReleaseEvent, MouseWheelUpEvent, MouseWheelDownEvent, Event, \
-    MouseMotionEvent, LanguageChangedEvent
+    MouseMotionEvent, LanguageChangedEvent, SearchResultsEvent
 from src.events.event_loop import EventLoop
 from src.events.mouse_buttons import MouseButtons
 from src.main.config import Config
@@ -153,6 +153,7 @@ class SearchView(View):
         self.on_scroll = None
 
         self.on_search_event_release = None
+        self.on_delete_callback = None
 
         self.event_list_start_pos = (self.width // 2, 100)
 
@@ -197,6 +198,10 @@ class SearchView(View):
 
         if isinstance(event, LanguageChangedEvent):
             self.update_language()
+        elif isinstance(event, SearchResultsEvent) and event.query == self.search_bar.text:
+            self.create_search_events(event.events)
+            self.bind_search_event_methods()
+            registered_events = True
 
         event = self.get_event(event)
 
@@ -293,6 +298,9 @@ class SearchView(View):
     def bind_on_search_event_release(self, on_search_event_release: Callable[[CalendarEvent], None]) -> None:
         self.on_search_event_release = on_search_event_release
 
+    def bind_on_delete(self, on_delete: Callable) -> None:
+        self.on_delete_callback = on_delete
+
     def bind_on_click(self, on_click: Callable[[MouseClickEvent], None]) -> None:
         self.on_click = on_click
 
@@ -312,7 +320,8 @@ class SearchView(View):
         return self.x <= event.x < self.x + self.width and self.y <= event.y < self.y + self.height
 
     def on_delete(self) -> None:
-        pass
+        if self.on_delete_callback:
+            self.on_delete_callback()
 
     def get_min_size(self) -> (int, int):
         return Config.side_view_min_size
@@ -4,7 +4,7 @@ from typing import Union, Callable
 import pygame
 
 from src.events.event import MouseClickEvent, MouseReleaseEvent, Event, MouseWheelUpEvent, MouseWheelDownEvent, \
-    LanguageChangedEvent, MouseMotionEvent, MouseFocusChangedEvent
+    LanguageChangedEvent, MouseMotionEvent, MouseFocusChangedEvent, ImportProgressEvent, ExportProgressEvent
 from src.events.mouse_buttons import MouseButtons
 from src.main.config import Config
 from src.main.language_manager import LanguageManager
@@ -232,9 +232,40 @@ class SettingsView(View):
             checked=Settings().get_settings()["autosync"]
         )
 
+        self.all_calendars_label = Label(
+            self.canvas,
+            (150, 730),
+            (260, 40),
+            text=self.language_manager.get_string("all_calendars"),
+            text_color=Colors.TEXT_LIGHT_GREY,
+            font=Assets().font18,
+            horizontal_text_alignment=HorizontalAlignment.LEFT
+        )
+
+        self.all_calendars_label2 = Label(
+            self.canvas,
+            (225, 760),
+            (350, 20),
+            text=self.language_manager.get_string("all_calendars_description"),
+            text_color=Colors.TEXT_GREY,
+            font=Assets().font14,
+            horizontal_text_alignment=HorizontalAlignment.LEFT
+        )
+
+        self.all_calendars_checkbox = CheckBox(
+            self.canvas,
+            (30, 760),
+            20,
+            color=Colors.BACKGROUND_GREY22,
+            border_color=Colors.GREY70,
+            border_radius=4,
+            border_width=1,
+            checked=Settings().get_settings().get("show_all_calendars", False)
+        )
+
         self.sync_button = Button(
             self.canvas,
-            (140, 760),
+            (140, 830),
             (240, 36),
             label=Label(text=self.language_manager.get_string("sync_calendars"),
                         text_color=Colors.TEXT_LIGHT_GREY, font=Assets().font18),
@@ -245,7 +276,7 @@ class SettingsView(View):
 
         self.sign_out_button = Button(
             self.canvas,
-            (140, 820),
+            (140, 890),
             (240, 36),
             label=Label(text=self.language_manager.get_string("sign_out_all"),
                         text_color=Colors.TEXT_LIGHT_GREY, font=Assets().font18),
@@ -254,6 +285,59 @@ class SettingsView(View):
             border_width=0
         )
 
+        self.data_label = Label(
+            self.canvas,
+            (110, 960),
+            (200, 40),
+            text=self.language_manager.get_string("data"),
+            text_color=Colors.TEXT_LIGHT_GREY,
+            font=Assets().font24,
+            horizontal_text_alignment=HorizontalAlignment.LEFT
+        )
+
+        self.import_button = Button(
+            self.canvas,
+            (140, 1020),
+            (240, 36),
+            label=Label(text=self.language_manager.get_string("import_calendar"),
+                        text_color=Colors.TEXT_LIGHT_GREY, font=Assets().font18),
+            color=Colors.BACKGROUND_GREY22,
+            border_radius=4,
+            border_width=0
+        )
+
+        self.export_button = Button(
+            self.canvas,
+            (140, 1080),
+            (240, 36),
+            label=Label(text=self.language_manager.get_string("export_calendar"),
+                        text_color=Colors.TEXT_LIGHT_GREY, font=Assets().font18),
+            color=Colors.BACKGROUND_GREY22,
+            border_radius=4,
+            border_width=0
+        )
+
+        self.cancel_button = Button(
+            self.canvas,
+            (140, 1140),
+            (240, 36),
+            label=Label(text=self.language_manager.get_string("cancel_transfer"),
+                        text_color=Colors.TEXT_LIGHT_GREY, font=Assets().font18),
+            color=Colors.BACKGROUND_GREY22,
+            border_radius=4,
+            border_width=0
+        )
+
+        self.data_status_label = Label(
+            self.canvas,
+            (170, 1190),
+            (300, 20),
+            text_color=Colors.TEXT_GREY,
+            font=Assets().font14,
+            horizontal_text_alignment=HorizontalAlignment.LEFT,
+            wrap_text=False
+        )
+
         adjust_labels_font_size(self.get_ui_elements())
 
     def register_event(self, event: Event) -> bool:
@@ -261,6 +345,12 @@ class SettingsView(View):
 
         if isinstance(event, LanguageChangedEvent):
             self.update_language()
+        elif isinstance(event, ImportProgressEvent):
+            self.show_import_progress(event)
+            registered_events = True
+        elif isinstance(event, ExportProgressEvent):
+            self.show_export_progress(event)
+            registered_events = True
 
         event = self.get_event(event)
         if isinstance(event, (MouseClickEvent, MouseReleaseEvent, MouseMotionEvent, MouseWheelUpEvent, MouseWheelDownEvent)) and event.y < 80:
@@ -299,6 +389,10 @@ class SettingsView(View):
             self.canvas, Colors.TEXT_DARK_GREY, (10, self.account_label.y + 18),
             (self.width - 10, self.account_label.y + 18)
         )
+        pygame.draw.line(
+            self.canvas, Colors.TEXT_DARK_GREY, (10, self.data_label.y + 18),
+            (self.width - 10, self.data_label.y + 18)
+        )
 
         self.language_dropdown.render()
 
@@ -346,24 +440,60 @@ class SettingsView(View):
         self.account_label.set_text(self.language_manager.get_string("account"))
         self.auto_sync_label.set_text(self.language_manager.get_string("auto_sync"))
         self.auto_sync_label2.set_text(self.language_manager.get_string("auto_sync_description"))
+        self.all_calendars_label.set_text(self.language_manager.get_string("all_calendars"))
+        self.all_calendars_label2.set_text(self.language_manager.get_string("all_calendars_description"))
         self.sync_button.label.set_text(self.language_manager.get_string("sync_calendars"))
         self.sign_out_button.label.set_text(self.language_manager.get_string("sign_out_all"))
+        self.data_label.set_text(self.language_manager.get_string("data"))
+        self.import_button.label.set_text(self.language_manager.get_string("import_calendar"))
+        self.export_button.label.set_text(self.language_manager.get_string("export_calendar"))
+        self.cancel_button.label.set_text(self.language_manager.get_string("cancel_transfer"))
 
         self.language_label2.font = Assets().font14
         self.catholic_events_label.font = Assets().font14
         self.fill_events_label2.font = Assets().font14
         self.graphics_label2.font = Assets().font14
         self.auto_sync_label2.font = Assets().font14
+        self.all_calendars_label2.font = Assets().font14
         self.language_label.font = Assets().font18
         self.catholic_events_label.font = Assets().font18
         self.fill_events_label.font = Assets().font18
         self.graphics_label.font = Assets().font18
         self.auto_sync_label.font = Assets().font18
+        self.all_calendars_label.font = Assets().font18
         self.sync_button.label.font = Assets().font18
         self.sign_out_button.label.font = Assets().font18
+        self.import_button.label.font = Assets().font18
+        self.export_button.label.font = Assets().font18
+        self.cancel_button.label.font = Assets().font18
 
         adjust_labels_font_size(self.get_ui_elements())
 
+    def show_import_progress(self, event: ImportProgressEvent) -> None:
+        # The batches imported before a cancel stay in the calendar
+        if event.cancelled:
+            text = self.language_manager.get_string("import_cancelled").format(imported=event.imported)
+        elif event.finished:
+            text = self.language_manager.get_string("import_finished").format(
+                imported=event.imported, skipped=event.skipped
+            )
+        else:
+            text = self.language_manager.get_string("import_progress").format(progress=int(event.progress * 100))
+        self.data_status_label.set_text(text)
+
+    def show_export_progress(self, event: ExportProgressEvent) -> None:
+        if event.cancelled:
+            text = self.language_manager.get_string("export_cancelled").format(
+                exported=event.exported, total=event.total
+            )
+        elif event.finished:
+            text = self.language_manager.get_string("export_finished").format(exported=event.exported)
+        else:
+            text = self.language_manager.get_string("export_progress").format(
+                exported=event.exported, total=event.total
+            )
+        self.data_status_label.set_text(text)
+
     def bind_on_click(self, on_click: Callable[[MouseClickEvent], None]) -> None:
         self.on_click = on_click
 
@@ -9,6 +9,7 @@ from src.events.event import Event, MouseClickEvent, MouseReleaseEvent, MouseWhe
 from src.events.event_loop import EventLoop
 from src.events.mouse_buttons import MouseButtons
 from src.main.config import Config
+from src.models.connection_manager import ConnectionManager
 from src.models.todo_list_model import TodoListModel, Task, TaskImportance
 from src.ui.alignment import HorizontalAlignment
 from src.ui.button import Button
@@ -434,6 +435,7 @@ class TodoListView(View):
             for id_ in cls.tasks:
                 task = cls.tasks[id_]
                 cls.model.update_task(id_, description=task.task.description, importance=task.task.importance, idx=task.task.idx)
+            ConnectionManager().close_thread_connections()
 
         thread = threading.Thread(target=save_threaded, args=(self, ))
         thread.start()
@@ -0,0 +1,71 @@
+import os
+import uuid
+
+import pytest
+
+# The models load images and fonts through pygame, which needs a display even when nothing is shown
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from src.main.language_manager import LanguageManager
+from src.main.settings import Settings
+from src.models.calendar_model import CalendarModel
+from src.models.connection_manager import ConnectionManager
+from src.models.mirror_manager import MirrorManager
+from src.utils.assets import Assets
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def assets(tmp_path_factory: pytest.TempPathFactory) -> Assets:
+    # Databases and settings of the tests are kept apart from the ones the app uses
+    data_path = tmp_path_factory.mktemp("assets")
+    Assets.IMAGES_PATH = os.path.join(ROOT_PATH, "assets", "images")
+    Assets.FONTS_PATH = os.path.join(ROOT_PATH, "assets", "fonts")
+    Assets.DATA_PATH = str(data_path / "data")
+    Assets.SETTINGS_PATH = str(data_path / "settings")
+    Assets.GOOGLE_PATH = str(data_path / "google")
+    Assets.GOOGLE_TOKENS_PATH = str(data_path / "tokens")
+    LanguageManager.LANGUAGES_PATH = os.path.join(ROOT_PATH, "assets", "languages")
+    for path in (Assets.SETTINGS_PATH, Assets.GOOGLE_TOKENS_PATH, os.path.join(Assets.DATA_PATH, "calendars"),
+                 os.path.join(Assets.DATA_PATH, "todo_lists")):
+        os.makedirs(path, exist_ok=True)
+
+    pygame.init()
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+
+    Settings(Assets().settings_database_path)
+    LanguageManager()
+
+    yield Assets()
+
+    MirrorManager().close_all()
+    ConnectionManager().close_all()
+    pygame.quit()
+
+
+@pytest.fixture
+def database_name() -> str:
+    # Every test gets its own database, the caches of the singletons are keyed by its name
+    return f"test_{uuid.uuid4().hex}"
+
+
+@pytest.fixture
+def model(database_name: str) -> CalendarModel:
+    yield CalendarModel(database_name=database_name)
+
+    ConnectionManager().close_all()
+
+
+@pytest.fixture
+def create_old_model(database_name: str):
+    # The migrations up to the version run as they would have when that version was current
+    def create(version: int) -> CalendarModel:
+        return type(f"CalendarModelV{version}", (CalendarModel, ), {"SCHEMA_VERSION": version})(database_name)
+
+    yield create
+
+    ConnectionManager().close_all()
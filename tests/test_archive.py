@@ -0,0 +1,59 @@
+import dataclasses
+import datetime
+
+from src.main.archive_manager import ArchiveManager
+from src.main.config import Config
+from src.models.calendar_model import CalendarModel, CalendarEvent, ChangeOperation, EventRecurrence
+from src.ui.colors import Colors
+
+
+def create_event(date: datetime.date, description: str) -> CalendarEvent:
+    return CalendarEvent(0, date, datetime.time(10), description, Colors.EVENT_BLUE204, EventRecurrence.NEVER)
+
+
+def test_update_brings_archived_event_back(model):
+    old = create_event(datetime.date(2020, 5, 4), "Old meeting")
+    old.id = model.add_event(old)
+    assert model.archive_events(datetime.date(2021, 1, 1)) == 1
+    assert model.get_archive_end() == old.date.toordinal()
+
+    seq = model.get_change_seq()
+    updated = dataclasses.replace(old, date=datetime.date(2020, 5, 6), description="Moved meeting")
+    model.update_event(old, updated)
+
+    assert model.get_archive_end() is None
+    assert [(event.id, event.date, event.description) for event in model.iter_all_events()] == \
+           [(old.id, updated.date, "Moved meeting")]
+    assert [event.description for event in model.get_events_for_date(updated.date) if not event.is_default] == \
+           ["Moved meeting"]
+    assert [event.id for event in model.search_events("moved")] == [old.id]
+
+    # Moving the row out of the archive isn't a change of its own
+    assert [(change.event_id, change.operation) for change in model.get_changes(seq)] == \
+           [(old.id, ChangeOperation.UPDATE.value)]
+
+
+def test_archived_events_are_still_read(model):
+    old = create_event(datetime.date(2020, 5, 4), "Old meeting")
+    old.id = model.add_event(old)
+    model.archive_events(datetime.date(2021, 1, 1))
+
+    assert [event.id for event in model.get_events_for_date(old.date) if not event.is_default] == [old.id]
+    assert [event.id for event in model.search_events("old meeting")] == [old.id]
+    assert model.get_event_count() == 1
+
+
+def test_archive_manager_includes_default_calendar():
+    model = CalendarModel("calendar")
+    today = datetime.date.today()
+    old_date = today - datetime.timedelta(days=Config.archive_horizon + 30)
+    model.add_events([create_event(old_date, "Old"), create_event(today, "Today")])
+
+    manager = ArchiveManager()
+    manager.idle = True
+    try:
+        assert manager.archive_all_calendars() == 1
+    finally:
+        manager.idle = False
+
+    assert model.get_archive_end() == old_date.toordinal()
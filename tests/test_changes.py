@@ -0,0 +1,85 @@
+import dataclasses
+import datetime
+
+from src.models.calendar_model import CalendarEvent, ChangeOperation, EventRecurrence
+from src.ui.colors import Colors
+
+
+def create_events(model, n: int) -> list[CalendarEvent]:
+    today = datetime.date.today()
+    events = [
+        CalendarEvent(0, today + datetime.timedelta(days=i), datetime.time(10), f"Event {i}", Colors.EVENT_BLUE204,
+                      EventRecurrence.NEVER) for i in range(n)
+    ]
+    for event, id_ in zip(events, model.add_events(events)):
+        event.id = id_
+    return events
+
+
+def age_changes(model, seq: int) -> None:
+    # Changes up to the seq look as if they were made long ago
+    with model.write():
+        model.cursor.execute(f"""UPDATE "{model.database_name}_changes" SET changed_at = 0 WHERE seq <= ?""", (seq, ))
+
+
+def test_changes_are_replayed_in_order(model):
+    since = model.get_change_seq()
+    first, second = create_events(model, 2)
+    model.update_events([(first, dataclasses.replace(first, description="Renamed"))])
+    model.remove_events([second])
+
+    changes = model.get_changes(since)
+    assert [(change.event_id, ChangeOperation(change.operation)) for change in changes] == [
+        (first.id, ChangeOperation.INSERT), (second.id, ChangeOperation.INSERT), (first.id, ChangeOperation.UPDATE),
+        (second.id, ChangeOperation.DELETE)
+    ]
+
+    seq, events, tombstones = model.get_changed_events(since)
+    assert seq == changes[-1].seq == model.get_change_seq()
+    assert [(event.id, event.description) for event in events] == [(first.id, "Renamed")]
+    assert [tombstone.id for tombstone in tombstones] == [second.id]
+    assert model.get_changed_events(seq) == (seq, [], [])
+
+
+def test_changes_across_compaction(model):
+    since = model.get_change_seq()
+    old_events = create_events(model, 3)
+    model.remove_events(old_events[:1])
+    compacted = model.get_change_seq()
+
+    new_events = create_events(model, 2)
+    model.remove_events(new_events[:1])
+
+    age_changes(model, compacted)
+    assert model.compact_changes(datetime.datetime.now() - datetime.timedelta(hours=1)) > 0
+
+    # Consumers behind the compacted part have to reload, the ones after it still get the tail
+    assert model.get_changes(since) is None
+    assert model.get_changed_events(since) is None
+    assert model.get_changes(compacted - 1) is None
+
+    seq, events, tombstones = model.get_changed_events(compacted)
+    assert seq == model.get_change_seq()
+    assert [event.id for event in events] == [new_events[1].id]
+    assert [tombstone.id for tombstone in tombstones] == [new_events[0].id]
+
+    # Nothing newer than the last compaction is removed
+    assert model.compact_changes(datetime.datetime.now() - datetime.timedelta(hours=1)) == 0
+    assert len(model.get_changes(compacted)) == 3
+
+
+def test_empty_journal_after_compaction(model):
+    since = model.get_change_seq()
+    create_events(model, 2)
+    seq = model.get_change_seq()
+
+    age_changes(model, seq)
+    model.compact_changes(datetime.datetime.now())
+
+    assert model.get_changes(since) is None
+    assert model.get_changes(seq) == []
+
+    event, = create_events(model, 1)
+    assert [change.event_id for change in model.get_changes(seq)] == [event.id]
+    # Seqs aren't reused after the journal was emptied
+    assert model.get_changes(seq)[0].seq == seq + 1
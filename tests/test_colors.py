@@ -0,0 +1,34 @@
+import datetime
+
+import pytest
+
+from src.models.calendar_model import CalendarEvent, EventRecurrence
+from src.ui.colors import Colors, get_hex_color, get_packed_color, get_rgb_color, pack_color, unpack_color
+
+PALETTE = sorted({value for name, value in vars(Colors).items() if not name.startswith("_")})
+
+
+@pytest.mark.parametrize("color", PALETTE + [(0, 0, 0), (255, 255, 255), (1, 2, 3), (255, 0, 16)])
+def test_colors_round_trip(color):
+    assert get_rgb_color(get_hex_color(color)) == color
+    assert unpack_color(pack_color(color)) == color
+    assert get_packed_color(get_hex_color(color)) == pack_color(color)
+
+
+@pytest.mark.parametrize("s", ["0x1a2b3c", "0x1A2B3C", "#1a2b3c", "#1A2B3C"])
+def test_both_stored_formats_decode(s):
+    assert get_rgb_color(s) == (0x1A, 0x2B, 0x3C)
+    # Decoded values are cached per string, a second lookup returns the same color
+    assert get_rgb_color(s) is get_rgb_color(s)
+
+
+def test_colors_survive_the_model(model):
+    colors = [Colors.EVENT_BLUE204, Colors.EVENT_RED204, (0, 0, 0), (1, 2, 3), (255, 255, 254)]
+    model.add_events([
+        CalendarEvent(0, datetime.date(2024, 1, 1), datetime.time(9), f"Event {i}", color, EventRecurrence.NEVER)
+        for i, color in enumerate(colors)
+    ])
+
+    assert [event.color for event in model.iter_all_events()] == colors
+    assert [event.color for event in model.get_events_for_date(datetime.date(2024, 1, 1)) if not event.is_default] \
+        == colors
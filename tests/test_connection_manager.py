@@ -0,0 +1,171 @@
+import datetime
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from src.main.config import Config
+from src.models.calendar_model import CalendarModel, CalendarEvent, EventRecurrence
+from src.models.connection_manager import ConnectionManager
+from src.ui.colors import Colors
+
+
+def test_opening_current_database_doesnt_wait_for_writer(model, database_name):
+    locked = threading.Event()
+    release = threading.Event()
+
+    def write() -> None:
+        with model.write():
+            locked.set()
+            release.wait(10)
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    locked.wait(10)
+    try:
+        opener = threading.Thread(target=CalendarModel, args=(database_name, ))
+        opener.start()
+        opener.join(2)
+        assert not opener.is_alive()
+    finally:
+        release.set()
+        writer.join()
+
+
+@pytest.fixture
+def full_pool(tmp_path, monkeypatch):
+    # Two workers keep their connections open until they are released
+    manager = ConnectionManager()
+    monkeypatch.setattr(manager, "pool_size", 2)
+    monkeypatch.setattr(Config, "connection_wait_timeout", 0.5)
+    opened = threading.Barrier(3)
+    release = threading.Event()
+
+    def hold(path: str) -> None:
+        manager.get_connection(path)
+        opened.wait(10)
+        release.wait(10)
+
+    workers = [threading.Thread(target=hold, args=(str(tmp_path / f"worker_{i}.db"), )) for i in range(2)]
+    for worker in workers:
+        worker.start()
+    opened.wait(10)
+
+    yield manager, release, workers
+
+    release.set()
+    for worker in workers:
+        worker.join()
+    manager.close_all()
+
+
+def test_main_thread_doesnt_wait_for_full_pool(full_pool, tmp_path):
+    manager, release, workers = full_pool
+
+    start = time.time()
+    manager.get_connection(str(tmp_path / "main.db")).execute("SELECT 1")
+    assert time.time() - start < 0.5
+
+
+def test_worker_gives_up_on_full_pool(full_pool, tmp_path):
+    manager, release, workers = full_pool
+    errors = []
+
+    def open_connection() -> None:
+        try:
+            manager.get_connection(str(tmp_path / "waiting.db"))
+        except TimeoutError as e:
+            errors.append(e)
+
+    opener = threading.Thread(target=open_connection)
+    opener.start()
+    opener.join(5)
+    assert not opener.is_alive()
+    assert len(errors) == 1
+
+
+def test_connections_of_finished_threads_are_released(full_pool, tmp_path):
+    manager, release, workers = full_pool
+    release.set()
+    for worker in workers:
+        worker.join()
+
+    opened = []
+    opener = threading.Thread(target=lambda: opened.append(manager.get_connection(str(tmp_path / "next.db"))))
+    opener.start()
+    opener.join(5)
+    assert len(opened) == 1
+    assert all(key[0] == opener.ident for key in manager.connections if str(tmp_path) in key[1])
+
+
+def create_event(description: str) -> CalendarEvent:
+    return CalendarEvent(0, datetime.date.today(), datetime.time(12), description, Colors.EVENT_BLUE204,
+                         EventRecurrence.NEVER)
+
+
+def test_readers_dont_see_uncommitted_rows(model):
+    inserted = threading.Event()
+    release = threading.Event()
+
+    def write() -> None:
+        with model.write():
+            model.add_event(create_event("Uncommitted"))
+            inserted.set()
+            release.wait(10)
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    inserted.wait(10)
+    try:
+        assert model.get_event_count() == 0
+    finally:
+        release.set()
+        writer.join()
+
+    assert model.get_event_count() == 1
+
+
+def test_nested_writes_join_the_transaction(model):
+    with model.write():
+        model.add_event(create_event("First"))
+        # Reads inside the write go through the writer and see its rows
+        assert model.conn is ConnectionManager().get_writer(model.database_path).conn
+        assert model.get_event_count() == 1
+        model.add_event(create_event("Second"))
+
+    assert model.conn is ConnectionManager().get_reader(model.database_path)
+    assert model.get_event_count() == 2
+
+
+def test_failed_write_is_rolled_back(model):
+    with pytest.raises(RuntimeError):
+        with model.write():
+            model.add_event(create_event("Rolled back"))
+            raise RuntimeError
+
+    assert model.get_event_count() == 0
+
+    # The writer is released for the next write
+    model.add_event(create_event("Committed"))
+    assert model.get_event_count() == 1
+
+
+def test_reader_connection_is_read_only(model):
+    with pytest.raises(sqlite3.OperationalError):
+        model.conn.execute(f"""DELETE FROM "{model.database_name}" """)
+
+
+def test_writes_of_threads_are_serialized(model):
+    def write(thread: int) -> None:
+        for i in range(50):
+            model.add_event(create_event(f"Event {thread} {i}"))
+        ConnectionManager().close_thread_connections()
+
+    threads = [threading.Thread(target=write, args=(i, )) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert model.get_event_count() == 200
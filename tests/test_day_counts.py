@@ -0,0 +1,51 @@
+import datetime
+
+import pytest
+
+from src.models.calendar_model import CalendarEvent, EventRecurrence
+from src.ui.colors import Colors
+
+
+def add_events(model) -> None:
+    model.add_events([
+        CalendarEvent(0, date, datetime.time(9), description, Colors.EVENT_BLUE204, recurrence)
+        for date, description, recurrence in [
+            # Months without a 31st and years without a 29 February are skipped
+            (datetime.date(2022, 1, 31), "Rent", EventRecurrence.MONTHLY),
+            (datetime.date(2020, 2, 29), "Leap day", EventRecurrence.YEARLY),
+            (datetime.date(2022, 3, 7), "Gym", EventRecurrence.WEEKLY),
+            (datetime.date(2023, 12, 31), "New Year's Eve", EventRecurrence.NEVER),
+            (datetime.date(2024, 12, 31), "New Year's Eve", EventRecurrence.NEVER),
+            (datetime.date(2024, 2, 29), "Dentist", EventRecurrence.NEVER),
+            (datetime.date(2024, 2, 29), "Dinner", EventRecurrence.NEVER)
+        ]
+    ])
+
+
+def get_month_counts(model, year: int) -> list[int]:
+    return [len(day) for month in range(1, 13) for day in model.get_events_for_month(year, month)]
+
+
+# Years outside the occurrence window are counted from the recurring events themselves
+@pytest.mark.parametrize("year", [2023, 2024, datetime.date.today().year, datetime.date.today().year + 1, 2100])
+def test_day_counts_match_months(model, year):
+    add_events(model)
+
+    counts = model.get_day_counts(year)
+    days = (datetime.date(year + 1, 1, 1) - datetime.date(year, 1, 1)).days
+    assert len(counts) == 366
+    assert list(counts[:days]) == get_month_counts(model, year)
+    if days == 365:
+        assert counts[365] == 0
+
+
+@pytest.mark.parametrize("year, leap_day, last_day", [(2023, 0, 2), (2024, 3, 2)])
+def test_day_counts_of_leap_day_and_31st(model, year, leap_day, last_day):
+    holidays = model.get_day_counts(year)
+    add_events(model)
+    counts = [count - holiday for count, holiday in zip(model.get_day_counts(year), holidays)]
+
+    # Rent and New Year's Eve fall on the last day, which is the 366th entry only in leap years
+    assert counts[59] == leap_day
+    assert counts[datetime.date(year, 12, 31).timetuple().tm_yday - 1] == last_day
+    assert counts[365] == (last_day if leap_day else 0)
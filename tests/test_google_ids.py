@@ -0,0 +1,131 @@
+import dataclasses
+import datetime
+
+from src.models.calendar_model import CalendarModel, CalendarEvent, ChangeOperation, EventRecurrence
+from src.ui.colors import Colors
+
+
+def insert_archived(model: CalendarModel, rows: list[tuple]) -> None:
+    with model.write() as cursor:
+        cursor.executemany(
+            f"""
+            INSERT INTO "{model.database_name}_archive" 
+            (id, date, time, description, color, recurrence, is_default, google_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows
+        )
+
+
+def update_all(model: CalendarModel) -> list:
+    events = list(model.iter_all_events())
+    model.update_events([(event, dataclasses.replace(event, description=event.description + "!")) for event in events])
+    return list(model.iter_all_events())
+
+
+def test_migration_clears_archived_empty_google_ids(create_old_model, database_name):
+    date = datetime.date(2020, 1, 1).toordinal()
+    insert_archived(create_old_model(5), [
+        (1, date, 0, "First", "#ffffff", 1, 0, ""),
+        (2, date, 0, "Second", "#ffffff", 1, 0, "")
+    ])
+
+    model = CalendarModel(database_name)
+    assert model.conn.execute(
+        f"""SELECT COUNT(*) FROM "{database_name}_archive" WHERE google_id = ''"""
+    ).fetchone()[0] == 0
+
+    events = update_all(model)
+    assert [(event.description, event.google_id) for event in events] == [("First!", None), ("Second!", None)]
+    assert model.get_archive_end() is None
+
+
+def test_unarchive_tolerates_empty_google_ids(model):
+    # Databases that were migrated before the archive was cleaned up still have them
+    date = datetime.date(2020, 1, 1).toordinal()
+    insert_archived(model, [
+        (1, date, 0, "First", "#ffffff", 1, 0, ""),
+        (2, date, 0, "Second", "#ffffff", 1, 0, "")
+    ])
+
+    events = update_all(model)
+    assert [(event.description, event.google_id) for event in events] == [("First!", None), ("Second!", None)]
+
+
+def create_event(description: str, date: datetime.date, google_id: str = "",
+                 recurrence: EventRecurrence = EventRecurrence.NEVER) -> CalendarEvent:
+    return CalendarEvent(0, date, datetime.time(10), description, Colors.EVENT_BLUE204, recurrence, google_id=google_id)
+
+
+def get_google_events(model: CalendarModel) -> list[tuple[str, str]]:
+    return sorted((event.google_id or "", event.description) for event in model.iter_all_events())
+
+
+def test_upsert_writes_only_changed_events(model):
+    today = datetime.date.today()
+    events = [create_event("First", today, "g1"), create_event("Second", today, "g2"), create_event("Local", today)]
+
+    # Events without a Google id aren't synced
+    assert model.upsert_google_events(events) == 2
+    seq = model.get_change_seq()
+    assert model.upsert_google_events(events) == 0
+    assert model.get_change_seq() == seq
+
+    events[1] = dataclasses.replace(events[1], description="Renamed")
+    assert model.upsert_google_events(events) == 1
+    assert get_google_events(model) == [("g1", "First"), ("g2", "Renamed")]
+    assert [change.operation for change in model.get_changes(seq)] == [ChangeOperation.UPDATE.value]
+
+
+def test_upsert_expands_moved_recurring_events(model):
+    today = datetime.date.today()
+    model.upsert_google_events([create_event("Weekly", today, "g1", EventRecurrence.WEEKLY)])
+    model.upsert_google_events([create_event("Weekly", today + datetime.timedelta(days=2), "g1",
+                                             EventRecurrence.WEEKLY)])
+
+    start, end = today - datetime.timedelta(days=30), today + datetime.timedelta(days=30)
+    records = sorted(model.iter_database_records(start, end))
+    assert records == sorted(model.iter_expanded_records(start, end))
+    assert records[0].date == (today + datetime.timedelta(days=2)).toordinal()
+
+
+def test_remove_missing_google_events_keeps_past_and_local_events(model):
+    today = datetime.date.today()
+    past = today - datetime.timedelta(days=10)
+    model.add_event(create_event("Local", today + datetime.timedelta(days=1)))
+    model.upsert_google_events([
+        create_event("Kept", today + datetime.timedelta(days=1), "g1"),
+        create_event("Removed", today + datetime.timedelta(days=2), "g2"),
+        create_event("Past", past, "g3"),
+        create_event("Removed weekly", past, "g4", EventRecurrence.WEEKLY)
+    ])
+
+    # Only upcoming events are listed by the sync, the missing ones were deleted in Google
+    assert model.remove_missing_google_events(datetime.datetime.now(), ["g1"]) == 2
+    assert get_google_events(model) == [("", "Local"), ("g1", "Kept"), ("g3", "Past")]
+
+
+def test_claim_google_ids_keeps_ids_of_concurrent_sync(model):
+    today = datetime.date.today()
+    first, second = (create_event(description, today) for description in ("First", "Second"))
+    first.id, second.id = model.add_events([first, second])
+
+    # Another sync linked the second event while this one was uploading it
+    assert model.claim_google_ids([(second, "other")]) == []
+    assert model.claim_google_ids([(first, "g1"), (second, "g2")]) == ["g2"]
+    assert get_google_events(model) == [("g1", "First"), ("other", "Second")]
+
+
+def test_claiming_id_a_concurrent_sync_fetched_drops_the_copy(model):
+    today = datetime.date.today()
+    local = create_event("Local", today)
+    local.id = model.add_event(local)
+
+    # Another sync fetched the uploaded event before this one linked it
+    model.upsert_google_events([create_event("Local", today, "g1")])
+    assert model.claim_google_ids([(local, "g1")]) == []
+    assert [(event.id, event.google_id) for event in model.iter_all_events()] == [(local.id, "g1")]
+
+    # The copy is dropped as well when the local event was linked to another id first
+    model.upsert_google_events([create_event("Local", today, "g2")])
+    assert model.claim_google_ids([(local, "g2")]) == ["g2"]
+    assert [(event.id, event.google_id) for event in model.iter_all_events()] == [(local.id, "g1")]
@@ -0,0 +1,215 @@
+import csv
+import datetime
+import threading
+import uuid
+
+import pygame
+import pytest
+
+from src.controllers import settings_controller
+from src.events.event_loop import EventLoop
+from src.main.account_manager import AccountManager
+from src.main.export_manager import ExportManager
+from src.main.import_manager import ImportManager
+from src.models.calendar_model import CalendarModel, CalendarEvent, EventRecurrence
+from src.ui.colors import Colors, get_hex_color
+from src.views.settings_view import SettingsView
+
+
+def write_ics(path, events: list[tuple[str, str, str, str]]) -> None:
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0"]
+    for uid, start, summary, rule in events:
+        lines += ["BEGIN:VEVENT", f"UID:{uid}", f"DTSTART:{start}", f"SUMMARY:{summary}"]
+        if rule:
+            lines.append(f"RRULE:{rule}")
+        lines.append("END:VEVENT")
+    lines.append("END:VCALENDAR")
+
+    path.write_text("\r\n".join(lines) + "\r\n", encoding="utf-8")
+
+
+def get_rows(model) -> list[tuple]:
+    return sorted(
+        (event.date, event.time, event.description, event.recurrence) for event in model.iter_all_events()
+    )
+
+
+def assert_occurrences(model) -> None:
+    # Recurring events are read from the occurrence table around today
+    start = datetime.date.today() - datetime.timedelta(days=30)
+    end = datetime.date.today() + datetime.timedelta(days=30)
+    assert model.has_occurrences(start, end)
+    assert sorted(model.iter_database_records(start, end)) == sorted(model.iter_expanded_records(start, end))
+
+
+def test_importing_again_updates_instead_of_duplicating(model, database_name, tmp_path):
+    gym = (datetime.date.today() - datetime.timedelta(days=10)).strftime("%Y%m%dT180000")
+    path = tmp_path / "calendar.ics"
+    write_ics(path, [
+        ("a@test", "20240105T090000", "Dentist", ""),
+        ("b@test", gym, "Gym", "FREQ=WEEKLY"),
+        ("b@test", gym, "Gym moved", ""),
+        ("", "20240112T120000", "Lunch", "")
+    ])
+    # The moved occurrence of the gym repeats its UID
+    path.write_text(path.read_text().replace("SUMMARY:Gym moved", f"RECURRENCE-ID:{gym}\r\nSUMMARY:Gym moved"))
+    importer = ImportManager(database_name, EventLoop())
+
+    assert importer.import_file(str(path)) == (3, 1)
+    assert len(get_rows(model)) == 3
+    assert_occurrences(model)
+
+    # Events without a UID can't be recognized and are added again
+    assert importer.import_file(str(path)) == (1, 3)
+    assert len(get_rows(model)) == 4
+
+    write_ics(path, [
+        ("a@test", "20240106T090000", "Dentist", ""),
+        ("b@test", gym, "Gym", "FREQ=MONTHLY")
+    ])
+    assert importer.import_file(str(path)) == (2, 0)
+    events = {event.description: event for event in model.iter_all_events()}
+    assert len(events) == 3
+    assert events["Dentist"].date == datetime.date(2024, 1, 6)
+    assert events["Gym"].recurrence is EventRecurrence.MONTHLY
+    assert_occurrences(model)
+
+
+def test_repeated_uid_updates_the_event(model, database_name, tmp_path):
+    path = tmp_path / "calendar.ics"
+    write_ics(path, [("a@test", "20240105T090000", "Dentist", ""), ("a@test", "20240106T090000", "Dentist", "")])
+
+    assert ImportManager(database_name, EventLoop()).import_file(str(path)) == (2, 0)
+    assert get_rows(model) == [(datetime.date(2024, 1, 6), datetime.time(9), "Dentist", EventRecurrence.NEVER)]
+
+
+def test_importing_again_updates_archived_events(model, database_name, tmp_path):
+    path = tmp_path / "calendar.ics"
+    write_ics(path, [("old@test", "20100105T090000", "Old", "")])
+    importer = ImportManager(database_name, EventLoop())
+
+    importer.import_file(str(path))
+    assert model.archive_events(datetime.date(2020, 1, 1)) == 1
+
+    write_ics(path, [("old@test", "20100105T090000", "Old renamed", "")])
+    assert importer.import_file(str(path)) == (1, 0)
+    assert get_rows(model) == [(datetime.date(2010, 1, 5), datetime.time(9), "Old renamed", EventRecurrence.NEVER)]
+    assert model.get_archive_end() is None
+
+
+def add_round_trip_events(model) -> list[CalendarEvent]:
+    events = [
+        CalendarEvent(0, datetime.date(2024, 3, 10), datetime.time(9, 30), "Standup, daily; notes\\here",
+                      Colors.EVENT_GREEN204, EventRecurrence.WEEKLY, duration=datetime.timedelta(minutes=15)),
+        CalendarEvent(0, datetime.date(2024, 3, 31), datetime.time(23), "Night shift", Colors.EVENT_RED204,
+                      EventRecurrence.MONTHLY, duration=datetime.timedelta(hours=8)),
+        CalendarEvent(0, datetime.date(2023, 2, 28), datetime.time(0), "Anniversary " + "x" * 120,
+                      Colors.EVENT_PURPLE204, EventRecurrence.YEARLY, duration=datetime.timedelta(days=1)),
+        CalendarEvent(0, datetime.date(2025, 1, 1), datetime.time(12, 45), "Čaj s prijateljima",
+                      Colors.EVENT_YELLOW204, EventRecurrence.NEVER)
+    ]
+    model.add_events(events)
+    return events
+
+
+def get_fields(events) -> list[tuple]:
+    return sorted(
+        (event.date, event.time, event.description, event.color, event.recurrence, event.duration) for event in events
+    )
+
+
+def test_ics_round_trip(model, database_name, tmp_path):
+    events = add_round_trip_events(model)
+    path = tmp_path / "calendar.ics"
+    assert ExportManager(database_name, EventLoop()).export_file(str(path)) == len(events)
+
+    imported_name = f"test_{uuid.uuid4().hex}"
+    assert ImportManager(imported_name, EventLoop()).import_file(str(path)) == (len(events), 0)
+    assert get_fields(CalendarModel(imported_name).iter_all_events()) == get_fields(events)
+
+    # The exported UIDs are remembered, so importing the file again changes nothing
+    assert ImportManager(imported_name, EventLoop()).import_file(str(path)) == (0, len(events))
+
+
+def test_csv_export(model, database_name, tmp_path):
+    events = add_round_trip_events(model)
+    path = tmp_path / "calendar.csv"
+    assert ExportManager(database_name, EventLoop()).export_file(str(path)) == len(events)
+
+    with open(path, newline="", encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+
+    assert sorted(
+        (row["date"], row["time"], row["description"], row["color"], row["recurrence"]) for row in rows
+    ) == sorted(
+        (event.date.isoformat(), event.time.strftime("%H:%M"), event.description,
+         "#" + get_hex_color(event.color)[2:].upper(), event.recurrence.name) for event in events
+    )
+
+
+class BlockingEventLoop(EventLoop):
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.events = []
+        self.released = threading.Event()
+
+    def enqueue_threaded_event(self, event) -> None:
+        # The transfer waits on its first progress event until the test lets it go
+        self.events.append(event)
+        self.released.wait(5)
+
+
+def test_cancel_button_stops_export(model, database_name, tmp_path, monkeypatch):
+    model.add_events([
+        CalendarEvent(0, datetime.date(2024, 1, 1) + datetime.timedelta(days=i), datetime.time(9), f"Event {i}",
+                      Colors.EVENT_BLUE204, EventRecurrence.NEVER) for i in range(50)
+    ])
+    path = tmp_path / "calendar.ics"
+    monkeypatch.setattr(settings_controller, "ask_save_path", lambda *args: str(path))
+    monkeypatch.setattr(AccountManager(), "get_current_database_name", lambda: database_name)
+
+    event_loop = BlockingEventLoop()
+    view = SettingsView(pygame.display.get_surface(), 500, 800, 0, 0)
+    controller = settings_controller.SettingsController(view, event_loop)
+
+    controller.on_export_button_clicked()
+    controller.on_cancel_button_clicked()
+    event_loop.released.set()
+    controller.export_manager.thread.join()
+
+    event = event_loop.events[-1]
+    assert event.finished and event.cancelled
+    assert event.exported < event.total == 50
+    assert not path.exists() and not (tmp_path / "calendar.ics.part").exists()
+
+    view.show_export_progress(event)
+    assert view.data_status_label.text == view.language_manager.get_string("export_cancelled").format(
+        exported=event.exported, total=50
+    )
+
+
+# The first of the events starts on Friday, 5 January 2024
+@pytest.mark.parametrize("rule, exdate, recurrence", [
+    ("FREQ=WEEKLY", "", EventRecurrence.WEEKLY),
+    ("FREQ=WEEKLY;INTERVAL=1;WKST=MO;BYDAY=FR", "", EventRecurrence.WEEKLY),
+    ("FREQ=MONTHLY;BYMONTHDAY=5", "", EventRecurrence.MONTHLY),
+    ("FREQ=YEARLY;BYMONTH=1;BYMONTHDAY=5", "", EventRecurrence.YEARLY),
+    ("FREQ=DAILY", "", EventRecurrence.NEVER),
+    ("FREQ=WEEKLY;INTERVAL=2", "", EventRecurrence.NEVER),
+    ("FREQ=WEEKLY;COUNT=10", "", EventRecurrence.NEVER),
+    ("FREQ=MONTHLY;UNTIL=20241231T000000Z", "", EventRecurrence.NEVER),
+    ("FREQ=WEEKLY;BYDAY=MO,FR", "", EventRecurrence.NEVER),
+    ("FREQ=WEEKLY;BYDAY=MO", "", EventRecurrence.NEVER),
+    ("FREQ=MONTHLY;BYDAY=1FR", "", EventRecurrence.NEVER),
+    ("FREQ=YEARLY", "20250105T090000", EventRecurrence.NEVER)
+])
+def test_only_exact_rules_repeat(model, database_name, tmp_path, rule, exdate, recurrence):
+    path = tmp_path / "calendar.ics"
+    write_ics(path, [("rule@test", "20240105T090000", "Repeating", rule)])
+    if exdate:
+        path.write_text(path.read_text().replace("SUMMARY:", f"EXDATE:{exdate}\r\nSUMMARY:"))
+
+    # Events the calendar can't repeat exactly are kept as their first occurrence
+    assert ImportManager(database_name, EventLoop()).import_file(str(path)) == (1, 0)
+    assert get_rows(model) == [(datetime.date(2024, 1, 5), datetime.time(9), "Repeating", recurrence)]
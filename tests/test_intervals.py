@@ -0,0 +1,87 @@
+import datetime
+import random
+
+import pytest
+
+from src.models.calendar_model import CalendarEvent, EventRecurrence
+from src.models.interval_index import IntervalIndex
+from src.ui.colors import Colors
+
+
+# Empty intervals take up their start, the callers give every interval a length before these are used
+def get_overlapping(intervals: list[tuple], start, end) -> list:
+    return sorted(
+        item for interval_start, interval_end, item in intervals if interval_start < end and interval_end > start
+    )
+
+
+def get_busy(intervals: list[tuple], start, end) -> list[tuple]:
+    busy = []
+    for interval_start, interval_end, _ in sorted(intervals):
+        if interval_start >= end or interval_end <= start:
+            continue
+        interval_start, interval_end = max(interval_start, start), min(interval_end, end)
+        if busy and interval_start <= busy[-1][1]:
+            busy[-1] = (busy[-1][0], max(busy[-1][1], interval_end))
+        else:
+            busy.append((interval_start, interval_end))
+    return busy
+
+
+def get_free(intervals: list[tuple], start, end) -> list[tuple]:
+    free = []
+    for busy_start, busy_end in get_busy(intervals, start, end):
+        if busy_start > start:
+            free.append((start, busy_start))
+        start = busy_end
+    return free + [(start, end)] if start < end else free
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_interval_index_matches_brute_force(seed):
+    rng = random.Random(seed)
+    intervals = []
+    for i in range(500):
+        start = rng.randrange(10_000)
+        # Empty and very long intervals are mixed in with short ones
+        intervals.append((start, start + rng.choice([0, rng.randrange(1, 50), rng.randrange(1, 2000)]), i))
+    index = IntervalIndex(intervals)
+    intervals = [(start, max(end, start + 1), item) for start, end, item in intervals]
+
+    for _ in range(200):
+        start = rng.randrange(-100, 10_100)
+        end = start + rng.randrange(1, 500)
+        assert sorted(index.get_overlapping(start, end)) == get_overlapping(intervals, start, end)
+        assert index.get_busy(start, end) == get_busy(intervals, start, end)
+        assert index.get_free(start, end) == get_free(intervals, start, end)
+
+
+def test_model_overlap_queries_match_brute_force(model):
+    rng = random.Random(0)
+    day = datetime.date.today().replace(day=1)
+    events = [
+        CalendarEvent(
+            0, day + datetime.timedelta(days=rng.randrange(-10, 40)),
+            datetime.time(rng.randrange(24), rng.choice([0, 15, 30, 45])), f"Event {i}", Colors.EVENT_BLUE204,
+            rng.choice([EventRecurrence.NEVER] * 4 + [EventRecurrence.WEEKLY, EventRecurrence.MONTHLY]),
+            duration=datetime.timedelta(minutes=rng.choice([15, 60, 180, 60 * 50]))
+        ) for i in range(150)
+    ]
+    model.add_events(events)
+
+    # Every occurrence that can reach the queried days, recurring events are repeated by the model
+    first, last = day - datetime.timedelta(days=5), day + datetime.timedelta(days=40)
+    occurrences = [event for event in model.get_events_in_range(first, last) if not event.is_default]
+    for _ in range(100):
+        start = datetime.datetime.combine(day, datetime.time()) + datetime.timedelta(minutes=15 * rng.randrange(3000))
+        end = start + datetime.timedelta(minutes=15 * rng.randrange(1, 200))
+
+        intervals = [(event.start, event.end, (event.start, event.id)) for event in occurrences]
+        overlapping = model.get_overlapping_events(start, end)
+        assert sorted((event.start, event.id) for event in overlapping) == get_overlapping(intervals, start, end)
+        assert model.get_busy_intervals(start, end) == get_busy(intervals, start, end)
+        assert model.get_free_intervals(start, end) == get_free(intervals, start, end)
+
+    # The edited event doesn't conflict with itself
+    event = occurrences[0]
+    assert event.id not in [e.id for e in model.get_overlapping_events(event.start, event.end, exclude_id=event.id)]
@@ -0,0 +1,76 @@
+import datetime
+import uuid
+
+import pytest
+
+from src.main.account_manager import AccountManager
+from src.main.config import Config
+from src.models.calendar_model import CalendarModel
+from src.models.connection_manager import ConnectionManager
+from src.models.merged_calendar_model import MergedCalendarModel
+from src.models.occurrence_manager import OccurrenceManager
+from tests.test_occurrences import add_recurring_events
+
+
+@pytest.fixture
+def accounts() -> list[str]:
+    accounts = [f"{uuid.uuid4().hex}@test.com" for _ in range(2)]
+    for account in accounts:
+        add_recurring_events(CalendarModel(database_name=f"calendar_{account}"))
+
+    yield accounts
+
+    OccurrenceManager().join()
+    ConnectionManager().close_all()
+
+
+def get_separate_events(accounts: list[str], year: int, month: int) -> list[tuple]:
+    return sorted(
+        (event.date, event.time, event.description, account)
+        for account in accounts
+        for day in CalendarModel(database_name=f"calendar_{account}").get_events_for_month(year, month)
+        for event in day if not event.is_default
+    )
+
+
+def get_merged_events(model: MergedCalendarModel, year: int, month: int) -> list[tuple]:
+    return sorted(
+        (event.date, event.time, event.description, event.account)
+        for day in model.get_events_for_month(year, month) for event in day if not event.is_default
+    )
+
+
+def test_merged_month_matches_separate_calendars(accounts):
+    model = MergedCalendarModel(accounts)
+    statements = []
+    model.conn.set_trace_callback(statements.append)
+
+    today = datetime.date.today()
+    assert get_merged_events(model, today.year, today.month) == get_separate_events(accounts, today.year, today.month)
+    # Months inside the window are read from the occurrences of every account, nothing is expanded on the fly
+    assert all(f'"calendar_{account}_occurrences"' in statements[-1] for account in accounts)
+    assert not any("recurrence > " in statement for statement in statements)
+
+    far = today + datetime.timedelta(days=Config.occurrence_window + 5 * Config.occurrence_window_step)
+    assert get_merged_events(model, far.year, far.month) == get_separate_events(accounts, far.year, far.month)
+    assert any("recurrence > " in statement for statement in statements)
+
+
+def test_changing_accounts_closes_merged_connection(accounts):
+    model = MergedCalendarModel(accounts[:1])
+    model.get_events_for_month(2024, 1)
+    database_path = model.database_path
+
+    model.set_accounts(accounts)
+    assert all(key[1] != database_path for key in ConnectionManager().connections)
+
+    today = datetime.date.today()
+    assert get_merged_events(model, today.year, today.month) == get_separate_events(accounts, today.year, today.month)
+
+
+def test_account_manager_reuses_merged_model():
+    account_manager = AccountManager()
+    model = account_manager.get_merged_calendar_model()
+
+    assert account_manager.get_merged_calendar_model() is model
+    assert model.database_names == account_manager.get_database_names()
@@ -0,0 +1,97 @@
+import datetime
+import os
+import pickle
+import sqlite3
+
+import pytest
+
+from src.models.calendar_model import CalendarModel, CalendarEvent, EventRecurrence
+from src.ui.colors import Colors, get_hex_color
+from src.utils.assets import Assets
+
+TODAY = datetime.date.today()
+
+# Ids used to be allocated from the settings file and could repeat, the second event shares its id with the first
+EVENTS = [
+    (1, TODAY - datetime.timedelta(days=14), datetime.time(9, 30), "Weekly meeting", EventRecurrence.WEEKLY),
+    (1, TODAY + datetime.timedelta(days=3), datetime.time(18), "Dinner with friends", EventRecurrence.NEVER),
+    (5, TODAY - datetime.timedelta(days=800), datetime.time(12), "Old appointment", EventRecurrence.NEVER),
+]
+
+
+def create_legacy_database(database_name: str) -> None:
+    conn = sqlite3.connect(os.path.join(Assets().calendar_database_path, database_name + ".db"))
+    conn.execute(
+        f"""
+        CREATE TABLE "{database_name}" (
+            id INTEGER, year INTEGER, month INTEGER, day INTEGER, hour INTEGER, minute INTEGER, second INTEGER,
+            description TEXT, color TEXT, recurrence BLOB, is_default INTEGER, google_id TEXT
+        )
+        """
+    )
+    conn.executemany(
+        f"""INSERT INTO "{database_name}" VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        [(id_, date.year, date.month, date.day, time.hour, time.minute, time.second, description,
+          get_hex_color(Colors.EVENT_BLUE204), pickle.dumps(recurrence), False, "")
+         for id_, date, time, description, recurrence in EVENTS]
+    )
+    conn.commit()
+    conn.close()
+
+
+def fill_old_database(model: CalendarModel, version: int) -> None:
+    # Events without a Google id stored an empty string until the unique index of version 6
+    with model.write():
+        model.cursor.executemany(
+            f"""
+            INSERT INTO "{model.database_name}" (date, time, description, color, recurrence, is_default, google_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            [(date.toordinal(), time.hour * 3600 + time.minute * 60, description, get_hex_color(Colors.EVENT_BLUE204),
+              recurrence.value, False, "" if version < 6 else None)
+             for _, date, time, description, recurrence in EVENTS]
+        )
+
+        # The model has expanded recurring events into the occurrence table since version 7
+        if version >= 7:
+            model.cursor.execute(f"""SELECT id, date, recurrence FROM "{model.database_name}" """)
+            model.cursor.executemany(
+                model.get_occurrence_sql(),
+                model.get_occurrence_rows(model.cursor.fetchall(), [model.get_occurrence_window()])
+            )
+
+
+def get_descriptions(events: list[CalendarEvent]) -> list[str]:
+    return [event.description for event in events if not event.is_default]
+
+
+@pytest.mark.parametrize("version", range(CalendarModel.SCHEMA_VERSION))
+def test_migration_keeps_events(create_old_model, database_name, version):
+    if version == 0:
+        create_legacy_database(database_name)
+    else:
+        fill_old_database(create_old_model(version), version)
+
+    model = CalendarModel(database_name=database_name)
+    assert model.get_schema_version() == CalendarModel.SCHEMA_VERSION
+
+    assert get_descriptions(model.get_events_for_date(TODAY)) == ["Weekly meeting"]
+    assert get_descriptions(model.get_events_for_date(TODAY + datetime.timedelta(days=3))) == ["Dinner with friends"]
+    assert get_descriptions(model.get_events_for_date(EVENTS[2][1])) == ["Old appointment"]
+    assert get_descriptions(model.search_events("dinn")) == ["Dinner with friends"]
+
+    start, end = TODAY - datetime.timedelta(days=60), TODAY + datetime.timedelta(days=60)
+    assert model.has_occurrences(start, end)
+    assert sorted(model.iter_database_records(start, end)) == sorted(model.iter_expanded_records(start, end))
+
+    empty_ids = model.conn.execute(f"""SELECT COUNT(*) FROM "{database_name}" WHERE google_id = '' """).fetchone()[0]
+    assert empty_ids == 0
+
+    # New ids continue after the migrated ones
+    ids = [row[0] for row in model.conn.execute(f"""SELECT id FROM "{database_name}" """)]
+    assert len(set(ids)) == len(EVENTS)
+    new_id = model.add_event(
+        CalendarEvent(0, TODAY, datetime.time(8), "New event", Colors.EVENT_BLUE204, EventRecurrence.NEVER)
+    )
+    assert new_id > max(ids)
+    assert get_descriptions(model.get_events_for_date(TODAY)) == ["New event", "Weekly meeting"]
@@ -0,0 +1,92 @@
+import datetime
+import sqlite3
+from threading import Thread
+
+import pytest
+
+from src.main.config import Config
+from src.models.calendar_model import CalendarModel, CalendarEvent, EventRecurrence
+from src.models.connection_manager import ConnectionManager
+from src.models.mirror_manager import MirrorManager
+from src.ui.colors import Colors
+
+
+@pytest.fixture(params=["sync", "background"])
+def mirrored_model(request, monkeypatch, database_name: str) -> CalendarModel:
+    monkeypatch.setattr(Config, "calendar_memory_mirror", True)
+    monkeypatch.setattr(MirrorManager(), "flush_mode", request.param)
+
+    yield CalendarModel(database_name=database_name)
+
+    MirrorManager().flush()
+    ConnectionManager().close_all()
+
+
+def create_event(description: str, google_id: str = "") -> CalendarEvent:
+    return CalendarEvent(0, datetime.date.today(), datetime.time(10), description, Colors.EVENT_BLUE204,
+                         EventRecurrence.NEVER, google_id=google_id)
+
+
+def get_rows(conn: sqlite3.Connection, database_name: str) -> list[tuple]:
+    return conn.execute(f"""SELECT id, description, google_id FROM "{database_name}" ORDER BY id""").fetchall()
+
+
+def get_disk_rows(model: CalendarModel) -> list[tuple]:
+    MirrorManager().flush()
+    conn = sqlite3.connect(model.calendar_database_path)
+    try:
+        return get_rows(conn, model.database_name)
+    finally:
+        conn.close()
+
+
+def test_concurrent_writes_get_the_same_ids_on_disk(mirrored_model):
+    def write(name: str) -> None:
+        try:
+            for i in range(20):
+                mirrored_model.upsert_google_events([create_event(f"{name} google {i}", f"{name}-{i}")])
+                mirrored_model.add_events([create_event(f"{name} local {i}")])
+                mirrored_model.import_events([(create_event(f"{name} imported {i}"), f"{name}-{i}@import")])
+        finally:
+            ConnectionManager().close_thread_connections()
+
+    threads = [Thread(target=write, args=(name, )) for name in ("a", "b")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    rows = get_rows(mirrored_model.conn, mirrored_model.database_name)
+    assert len(rows) == 120
+    assert get_disk_rows(mirrored_model) == rows
+
+
+def rename_disk_table(model: CalendarModel, old: str, new: str) -> None:
+    conn = sqlite3.connect(model.calendar_database_path)
+    try:
+        conn.execute(f"""ALTER TABLE "{old}" RENAME TO "{new}" """)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def test_failed_flush_is_kept_and_retried(mirrored_model):
+    name = mirrored_model.database_name
+    mirrored_model.add_events([create_event("Before")])
+    assert len(get_disk_rows(mirrored_model)) == 1
+
+    # The disk refuses the writes while its table is missing
+    rename_disk_table(mirrored_model, name, f"{name}_away")
+    mirrored_model.add_events([create_event("While away")])
+    MirrorManager().flush()
+    assert MirrorManager().pending
+
+    rename_disk_table(mirrored_model, f"{name}_away", name)
+    mirrored_model.add_events([create_event("After")])
+    if MirrorManager().flush_mode == "background":
+        assert MirrorManager().thread.is_alive()
+
+    rows = get_rows(mirrored_model.conn, name)
+    assert [row[1] for row in rows] == ["Before", "While away", "After"]
+    assert get_disk_rows(mirrored_model) == rows
+    assert not MirrorManager().pending
@@ -0,0 +1,68 @@
+import dataclasses
+import datetime
+
+from src.models.calendar_model import CalendarEvent, EventRecurrence
+from src.models.month_cache import MonthCache
+from src.ui.colors import Colors
+
+
+def get_descriptions(model, year: int, month: int) -> list[str]:
+    return [event.description for day in model.get_events_for_month(year, month) for event in day
+            if not event.is_default]
+
+
+def is_cached(database_name: str, year: int, month: int) -> bool:
+    return (database_name, year, month) in MonthCache().months
+
+
+def test_least_recently_used_month_is_evicted(database_name, monkeypatch):
+    cache = MonthCache()
+    monkeypatch.setattr(cache, "max_size", 2)
+
+    generation = cache.get_generation(database_name)
+    cache.put(database_name, 2024, 1, "January", generation)
+    cache.put(database_name, 2024, 2, "February", generation)
+    assert cache.get(database_name, 2024, 1) == "January"
+
+    cache.put(database_name, 2024, 3, "March", generation)
+    assert cache.get(database_name, 2024, 2) is None
+    assert cache.get(database_name, 2024, 1) == "January"
+    assert cache.get(database_name, 2024, 3) == "March"
+
+
+def test_month_loaded_before_a_write_isnt_cached(database_name):
+    cache = MonthCache()
+    generation = cache.get_generation(database_name)
+
+    cache.invalidate(database_name, 2024, 5)
+    cache.put(database_name, 2024, 1, "January", generation)
+    assert cache.get(database_name, 2024, 1) is None
+
+    cache.put(database_name, 2024, 1, "January", cache.get_generation(database_name))
+    assert cache.get(database_name, 2024, 1) == "January"
+
+
+def test_writes_invalidate_the_months_they_touch(model, database_name):
+    january, february = datetime.date(2024, 1, 10), datetime.date(2024, 2, 10)
+    assert get_descriptions(model, 2024, 1) == get_descriptions(model, 2024, 2) == []
+
+    event = CalendarEvent(0, january, datetime.time(9), "Dentist", Colors.EVENT_BLUE204, EventRecurrence.NEVER)
+    event.id = model.add_event(event)
+    assert not is_cached(database_name, 2024, 1) and is_cached(database_name, 2024, 2)
+    assert get_descriptions(model, 2024, 1) == ["Dentist"]
+
+    moved = dataclasses.replace(event, date=february)
+    model.update_events([(event, moved)])
+    assert get_descriptions(model, 2024, 1) == []
+    assert get_descriptions(model, 2024, 2) == ["Dentist"]
+
+    model.remove_events([moved])
+    assert not is_cached(database_name, 2024, 2) and is_cached(database_name, 2024, 1)
+    assert get_descriptions(model, 2024, 2) == []
+
+    # Recurring events can reach any month, so every month of the database is dropped
+    model.add_event(
+        CalendarEvent(0, january, datetime.time(9), "Gym", Colors.EVENT_BLUE204, EventRecurrence.MONTHLY)
+    )
+    assert not is_cached(database_name, 2024, 1) and not is_cached(database_name, 2024, 2)
+    assert get_descriptions(model, 2024, 2) == ["Gym"]
@@ -0,0 +1,78 @@
+import datetime
+import threading
+
+from src.main.config import Config
+from src.models.calendar_model import CalendarEvent, EventRecurrence
+from src.models.occurrence_manager import OccurrenceManager
+from src.ui.colors import Colors
+
+
+def add_recurring_events(model) -> None:
+    today = datetime.date.today()
+    model.add_events([
+        CalendarEvent(0, today - datetime.timedelta(days=offset), datetime.time(9), f"Event {i}", Colors.EVENT_BLUE204,
+                      recurrence)
+        for i, (offset, recurrence) in enumerate([
+            (3, EventRecurrence.WEEKLY), (40, EventRecurrence.MONTHLY), (400, EventRecurrence.YEARLY),
+            (10, EventRecurrence.NEVER)
+        ])
+    ])
+
+
+def get_window_end(model) -> datetime.date:
+    return datetime.date.fromordinal(model.get_occurrence_window()[1])
+
+
+def test_occurrence_table_matches_expansion(model):
+    add_recurring_events(model)
+
+    start = datetime.date.today() - datetime.timedelta(days=60)
+    end = datetime.date.today() + datetime.timedelta(days=60)
+    assert model.has_occurrences(start, end)
+    assert sorted(model.iter_database_records(start, end)) == sorted(model.iter_expanded_records(start, end))
+
+
+def test_reads_past_window_dont_wait_for_writer(model):
+    add_recurring_events(model)
+    month = get_window_end(model) + datetime.timedelta(days=20)
+
+    locked = threading.Event()
+    release = threading.Event()
+
+    def write() -> None:
+        with model.write():
+            locked.set()
+            release.wait(10)
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    locked.wait(10)
+    try:
+        result = []
+        reader = threading.Thread(target=lambda: result.append(model.get_events_for_month(month.year, month.month)))
+        reader.start()
+        reader.join(2)
+        assert not reader.is_alive()
+    finally:
+        release.set()
+        writer.join()
+
+    # The window grows once the writer is done and serves the month from the table
+    OccurrenceManager().join()
+    assert get_window_end(model) >= month + datetime.timedelta(days=Config.occurrence_window_step - 31)
+
+    first = datetime.date(month.year, month.month, 1)
+    last = first + datetime.timedelta(days=len(result[0]) - 1)
+    assert model.has_occurrences(first, last)
+    assert sorted(model.iter_database_records(first, last)) == sorted(model.iter_expanded_records(first, last))
+
+
+def test_far_ranges_dont_extend_window(model):
+    add_recurring_events(model)
+    window = model.get_occurrence_window()
+
+    far = get_window_end(model) + datetime.timedelta(days=3 * Config.occurrence_window_step)
+    assert not model.has_occurrences(far, far + datetime.timedelta(days=30))
+
+    OccurrenceManager().join()
+    assert model.get_occurrence_window() == window
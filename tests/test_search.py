@@ -0,0 +1,103 @@
+import dataclasses
+import datetime
+from queue import Queue
+
+from src.events.event_loop import EventLoop
+from src.main.config import Config
+from src.main.search_manager import SearchManager
+from src.models.calendar_model import CalendarEvent, EventRecurrence
+from src.ui.colors import Colors
+
+
+class ResultsEventLoop(EventLoop):
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.results = Queue()
+
+    def enqueue_threaded_event(self, event) -> None:
+        self.results.put(event)
+
+
+def create_event(description: str) -> CalendarEvent:
+    return CalendarEvent(0, datetime.date(2024, 1, 5), datetime.time(9), description, Colors.EVENT_BLUE204,
+                         EventRecurrence.NEVER)
+
+
+def search(manager: SearchManager, event_loop: ResultsEventLoop, query: str) -> list[str]:
+    manager.search(query)
+    event = event_loop.results.get(timeout=5)
+    assert event.query == query
+    return sorted(event.description for event in event.events if not event.is_default)
+
+
+def test_write_between_searches_isnt_missed_by_narrowing(model, database_name, monkeypatch):
+    monkeypatch.setattr(Config, "search_debounce", 0)
+    model.add_events([create_event("Dentist"), create_event("Dinner")])
+    event_loop = ResultsEventLoop()
+    manager = SearchManager(database_name, event_loop)
+
+    try:
+        assert search(manager, event_loop, "de") == ["Dentist"]
+        # Without a write the longer query is answered from the previous results
+        assert search(manager, event_loop, "den") == ["Dentist"]
+
+        model.add_events([create_event("Dentures")])
+        model.update_events([(event, dataclasses.replace(event, description="Checkup"))
+                             for event in model.search_events("dentist")])
+        assert search(manager, event_loop, "dent") == ["Dentures"]
+    finally:
+        manager.stop()
+
+
+def get_indexed(model) -> list[tuple[int, str]]:
+    return model.conn.execute(
+        f"""SELECT rowid, description FROM "{model.database_name}_search" WHERE rowid > 0 ORDER BY rowid"""
+    ).fetchall()
+
+
+def test_search_index_follows_updates_and_deletes(model):
+    dentist, dinner = (create_event("Dentist appointment"), create_event("Dinner"))
+    dentist.id, dinner.id = model.add_events([dentist, dinner])
+    assert get_indexed(model) == [(dentist.id, "Dentist appointment"), (dinner.id, "Dinner")]
+
+    checkup = dataclasses.replace(dentist, description="Checkup")
+    model.update_events([(dentist, checkup)])
+    assert model.search_events("dentist") == []
+    assert [event.id for event in model.search_events("check")] == [dentist.id]
+
+    model.remove_events([checkup])
+    assert model.search_events("check") == []
+    assert get_indexed(model) == [(dinner.id, "Dinner")]
+
+
+def test_search_ranks_closer_matches_first(model):
+    model.add_events([
+        create_event("Quarterly review of the marketing plan and budget with the whole team"),
+        create_event("Budget"),
+        create_event("Marketing budget")
+    ])
+
+    assert [event.description for event in model.search_events("budget")] == [
+        "Budget", "Marketing budget", "Quarterly review of the marketing plan and budget with the whole team"
+    ]
+    assert [event.description for event in model.search_events("marketing budget")] == [
+        "Marketing budget", "Quarterly review of the marketing plan and budget with the whole team"
+    ]
+
+
+def test_holidays_are_indexed_apart_from_events(model):
+    event = create_event("Labor union meeting")
+    event.id, = model.add_events([event])
+
+    results = model.search_events("labor")
+    assert sorted((event.description, event.is_default) for event in results) == [
+        ("Labor Day", True), ("Labor union meeting", False)
+    ]
+    assert model.conn.execute(
+        f"""SELECT MAX(rowid) FROM "{model.database_name}_search" WHERE description = 'Labor Day'"""
+    ).fetchone()[0] < 0
+
+    # Deleting an event only removes its own entry, the holidays stay indexed
+    model.remove_events([event])
+    assert [(event.description, event.is_default) for event in model.search_events("labor")] == [("Labor Day", True)]
@@ -0,0 +1,51 @@
+import datetime
+
+from src.models.calendar_model import CalendarEvent, EventRecurrence
+from src.ui.colors import Colors
+
+AFTER = datetime.datetime(2025, 2, 10, 12)
+
+# Listed in the order of their next start after Monday, 10 February 2025 at noon
+UPCOMING = [
+    (datetime.date(2025, 2, 10), datetime.time(12, 30), "Afternoon", EventRecurrence.NEVER),
+    (datetime.date(2025, 1, 6), datetime.time(18), "Gym", EventRecurrence.WEEKLY),
+    (datetime.date(2025, 2, 11), datetime.time(8), "Tomorrow", EventRecurrence.NEVER),
+    (datetime.date(2025, 1, 7), datetime.time(9), "Standup", EventRecurrence.WEEKLY),
+    (datetime.date(2025, 3, 15), datetime.time(0), "Ides", EventRecurrence.NEVER),
+    # February has no 31st and 2025 no 29 February, the next ones are in March and in 2028
+    (datetime.date(2025, 1, 31), datetime.time(10), "Rent", EventRecurrence.MONTHLY),
+    (datetime.date(2026, 1, 1), datetime.time(0), "New Year", EventRecurrence.NEVER),
+    (datetime.date(2024, 2, 29), datetime.time(9), "Leap day", EventRecurrence.YEARLY)
+]
+PAST = [
+    (datetime.date(2025, 2, 10), datetime.time(11), "Morning", EventRecurrence.NEVER),
+    (datetime.date(2025, 2, 10), datetime.time(12), "Noon", EventRecurrence.NEVER)
+]
+
+
+def add_events(model) -> None:
+    # Inserted in reverse, so the ids don't already give the order
+    model.add_events([
+        CalendarEvent(0, date, time, description, Colors.EVENT_BLUE204, recurrence)
+        for date, time, description, recurrence in reversed(UPCOMING + PAST)
+    ])
+
+
+def test_upcoming_events_are_ordered_by_next_start(model):
+    add_events(model)
+
+    events = list(model.iter_upcoming(AFTER))
+    assert [event.description for event in events] == [description for _, _, description, _ in UPCOMING]
+    # Recurring events are yielded as they are stored
+    assert [(event.date, event.time) for event in events] == [(date, time) for date, time, _, _ in UPCOMING]
+
+
+def test_upcoming_events_stop_at_the_limit(model):
+    add_events(model)
+
+    assert [event.description for event in model.iter_upcoming(AFTER, limit=3)] == ["Afternoon", "Gym", "Tomorrow"]
+    # Only the recurring events are left later on
+    assert [event.description for event in model.iter_upcoming(datetime.datetime(2030, 1, 1), limit=3)] == [
+        "Standup", "Gym", "Rent"
+    ]
+    assert model.get_upcoming_events(AFTER) == list(model.iter_upcoming(AFTER))